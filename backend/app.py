@@ -1,12 +1,25 @@
-from flask import Flask, request, jsonify, session, send_from_directory
+from flask import Flask, request, jsonify, session, send_from_directory, g, stream_with_context
 from flask_cors import CORS
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
+from werkzeug.http import is_resource_modified
+from sqlalchemy.exc import IntegrityError
 import os
 import json
+import hashlib
+import itertools
 from datetime import datetime, timedelta
 import uuid
-from models import db, User, Profile, Skill, JobPreference, Experience, Education, Job, JobApplication
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from models import db, User, Profile, Skill, JobPreference, Experience, Education, Job, JobApplication, JobText, JobSkill, SkillTerm, SkillAlias, Location, JobLocation, UserLocation, MatchScore, MatchScoreSeeker, MatchScoreJob
+from migrations import run_data_migrations, run_migrations
+from utils.job_search import JobSearch
+from utils.pagination import InvalidCursor, keyset_page, page_by_score
+from utils.gazetteer import Gazetteer, UnknownLocation
+from utils.compression import compress, compress_chunks, negotiate_encoding
+from utils.db_tuning import READ_PRIMARY, REPLICA_BIND, engine_options, read_primary, tune_engine
 
 app = Flask(__name__)
 app.config.from_object('config.Config')
@@ -14,12 +27,150 @@ app.config.from_object('config.Config')
 # Configure CORS to allow credentials
 CORS(app, supports_credentials=True, resources={r"/api/*": {"origins": "http://localhost:5173"}})
 
+# Pool and timeout settings of the configured database, and its read replica if any
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'], app.config)
+if app.config['DATABASE_REPLICA_URL']:
+    app.config['SQLALCHEMY_BINDS'] = {
+        REPLICA_BIND: {
+            'url': app.config['DATABASE_REPLICA_URL'],
+            **engine_options(app.config['DATABASE_REPLICA_URL'], app.config, read_only=True)
+        }
+    }
+
 # Initialize database
 db.init_app(app)
 
+# Full-text index for the job search box
+job_search = JobSearch()
+
 # Create tables
 with app.app_context():
+    # Before the first connection, so every connection gets the per-connection settings
+    for engine in db.engines.values():
+        tune_engine(engine, app.config)
+    
     db.create_all()
+    
+    # create_all skips new indexes and columns of tables that already exist
+    run_migrations(db.engine)
+    
+    job_search.setup(db.engine)
+
+# Newest jobs first, the keyset of paginated job listings
+RECENT_JOB_KEYS = [(Job.created_at, True), (Job.id, True)]
+
+def page_args(limit_param='limit', cursor_param='cursor'):
+    """(limit, cursor) of a paginated listing, or None when the client asked for the whole list"""
+    if limit_param not in request.args and cursor_param not in request.args:
+        return None
+    limit = request.args.get(limit_param, app.config['JOBS_PAGE_SIZE'], type=int)
+    return min(max(limit, 1), app.config['JOBS_MAX_PAGE_SIZE']), request.args.get(cursor_param) or None
+
+def json_response(payload, status=200):
+    """Response of an already encoded JSON payload"""
+    return app.response_class(payload, status=status, mimetype='application/json')
+
+def row_versions(*subqueries):
+    """Values of scalar subqueries (counts, latest timestamps) read in one round trip, from the primary"""
+    return tuple(db.session.execute(
+        db.select(*[subquery.scalar_subquery() for subquery in subqueries]).execution_options(**READ_PRIMARY)
+    ).one())
+
+def row_version(model):
+    """Last write time of a row of a model with created_at and updated_at"""
+    return db.func.coalesce(model.updated_at, model.created_at)
+
+def version_etag(*versions):
+    """Opaque entity tag of the row versions a response is built from"""
+    return hashlib.sha1(repr(versions).encode('utf-8')).hexdigest()
+
+def not_modified(etag, last_modified=None, weak=False):
+    """
+    304 response if the client's copy (If-None-Match, If-Modified-Since) is current, else None
+    
+    The validators are added to the full response otherwise. Collections
+    pass no last_modified: deleting a row changes their count, and so
+    their ETag, but not their latest timestamp.
+    """
+    g.validators = (etag, weak, last_modified)
+    if is_resource_modified(request.environ, etag, last_modified=last_modified):
+        return None
+    return app.response_class(status=304)
+
+# Registered before add_validators: Flask runs after_request functions in
+# reverse order, so the ETag set there is weakened here
+@app.after_request
+def compress_response(response):
+    """gzip/deflate large JSON responses for clients accepting it"""
+    if (
+        response.status_code != 200 or response.mimetype != 'application/json' or response.is_streamed
+        or 'Content-Encoding' in response.headers
+    ):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+    if encoding is None or response.content_length < app.config['RESPONSE_COMPRESSION_MIN_BYTES']:
+        return response
+    
+    response.set_data(compress(response.get_data(), encoding, app.config['RESPONSE_COMPRESSION_LEVEL']))
+    response.headers['Content-Encoding'] = encoding
+    
+    # The compressed bytes differ, so only a weak ETag still holds
+    etag, weak = response.get_etag()
+    if etag is not None and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+@app.after_request
+def add_validators(response):
+    validators = g.pop('validators', None)
+    if validators is not None and response.status_code in (200, 304):
+        etag, weak, last_modified = validators
+        response.set_etag(etag, weak)
+        if last_modified is not None:
+            response.last_modified = last_modified
+        # Copies are per user and must be revalidated before use
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def stream_json(chunks, cache_key=None):
+    """
+    Chunked response of JSON produced piece by piece, compressed as it goes if the client accepts it
+    
+    The first chunk is sent before the rest is produced. The payload is
+    also stored under a result cache key once complete, unless it grew too
+    large to be cached.
+    """
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+    
+    def encode():
+        cached, size = [], 0
+        for chunk in chunks:
+            data = chunk.encode('utf-8')
+            if cached is not None and cache_key is not None:
+                cached.append(data)
+                size += len(data)
+                if result_cache.max_payload is not None and size > result_cache.max_payload:
+                    cached = None
+            yield data
+        if cached is not None and cache_key is not None:
+            result_cache.set(cache_key, b''.join(cached))
+    
+    body = encode()
+    headers = {'Vary': 'Accept-Encoding'}
+    if encoding is not None:
+        body = compress_chunks(body, encoding, app.config['RESPONSE_COMPRESSION_LEVEL'])
+        headers['Content-Encoding'] = encoding
+    return app.response_class(stream_with_context(body), mimetype='application/json', headers=headers)
+
+@app.errorhandler(InvalidCursor)
+def invalid_cursor(e):
+    return jsonify({'error': str(e)}), 400
+
+@app.errorhandler(UnknownLocation)
+def unknown_location(e):
+    return jsonify({'error': str(e)}), 400
 
 # Routes
 @app.route('/api/auth/register', methods=['POST'])
@@ -98,6 +249,32 @@ def auth_status():
     
     return jsonify({'isAuthenticated': False}), 200
 
+def profile_etag(user):
+    """ETag of a user's own profile from the versions of every table it is built from"""
+    user_id = user.id
+    versions = [db.select(db.func.max(row_version(Profile))).where(Profile.user_id == user_id)]
+    
+    if user.user_type == 'jobSeeker':
+        for model in (Experience, Education):
+            versions += [
+                db.select(db.func.count(model.id)).where(model.user_id == user_id),
+                db.select(db.func.max(row_version(model))).where(model.user_id == user_id)
+            ]
+        versions += [
+            # Skills are replaced rather than edited
+            db.select(db.func.count(Skill.id)).where(Skill.user_id == user_id),
+            db.select(db.func.max(Skill.id)).where(Skill.user_id == user_id),
+            db.select(db.func.max(row_version(JobPreference))).where(JobPreference.user_id == user_id)
+        ]
+    elif user.user_type == 'employer':
+        versions += [
+            db.select(db.func.count(Job.id)).where(Job.employer_id == user_id),
+            db.select(db.func.max(row_version(Job))).where(Job.employer_id == user_id),
+            db.select(db.func.count(JobApplication.id)).join(Job, Job.id == JobApplication.job_id).where(Job.employer_id == user_id)
+        ]
+    
+    return version_etag(user_id, user.user_type, user.updated_at, request.query_string, *row_versions(*versions))
+
 # Update the get_profile route to handle employer profiles
 @app.route('/api/profile', methods=['GET'])
 def get_profile():
@@ -106,6 +283,11 @@ def get_profile():
 
     user_id = session['user_id']
     user = User.query.get(user_id)
+    
+    # Polling clients are answered from the row versions alone
+    response = not_modified(profile_etag(user), weak=True)
+    if response is not None:
+        return response
     profile = Profile.query.filter_by(user_id=user_id).first()
 
     if not profile:
@@ -201,9 +383,17 @@ def get_profile():
 
     # Handle employer profile
     elif user.user_type == 'employer':
-        # Get job postings
+        # Get job postings, a page at a time if asked for
+        page = page_args('jobPostingsLimit', 'jobPostingsCursor')
+        if page is None:
+            jobs = Job.query.filter_by(employer_id=user_id).all()
+        else:
+            rows, next_cursor = keyset_page(Job.query.filter_by(employer_id=user_id), 'recent', RECENT_JOB_KEYS, *page)
+            jobs = [row[0] for row in rows]
+            profile_data['jobPostingsNextCursor'] = next_cursor
+        
         job_postings = []
-        for job in Job.query.filter_by(employer_id=user_id).all():
+        for job in jobs:
             job_postings.append(job.to_dict())
         
         # Count total applications
@@ -266,6 +456,13 @@ def update_profile():
         
         # Update skills
         if 'skills' in request.form:
+            # Scores cached for the old skill list are no longer needed
+            previous_skills = [skill.name for skill in Skill.query.filter_by(user_id=user_id).all()]
+            score_cache.invalidate_skills(skills_hash(previous_skills))
+            
+            # The seeker's row of match_scores has to be recomputed
+            mark_match_scores_pending(seeker_id=user_id)
+            
             # Delete existing skills
             Skill.query.filter_by(user_id=user_id).delete()
             
@@ -305,6 +502,9 @@ def update_profile():
             job_preference.remote_preference = request.form.get('remotePreference')
         
         job_preference.updated_at = datetime.utcnow()
+        
+        # Resolve the locations used by the nearby-jobs prefilter
+        save_user_locations(user_id, profile.location, job_preference.locations)
 
     # Handle employer profile update
     elif user.user_type == 'employer':
@@ -337,6 +537,12 @@ def update_profile():
         profile.facebook_url = request.form.get('facebookUrl', profile.facebook_url)
 
     db.session.commit()
+    
+    # Re-vectorize the seeker's skills for candidate matching and recompute their match scores
+    if user.user_type == 'jobSeeker' and 'skills' in request.form:
+        intern_skills(skills)
+        sync_seeker_index(user_id, skills)
+        schedule_match_scores(seeker_id=user_id)
 
     return jsonify({'message': 'Profile updated successfully'}), 200
 
@@ -378,8 +584,23 @@ def create_job():
     )
     
     db.session.add(new_job)
+    db.session.flush()
+    
+    # Normalize the description once for matching; the job's column of match_scores is computed after the commit
+    job_text = save_job_text(new_job)
+    job_skills = save_job_skills(new_job, job_text)
+    save_job_location(new_job)
+    mark_match_scores_pending(job_id=new_job.id)
     db.session.commit()
     
+    # Add the job to the matching index and score it against every seeker
+    write = record_job_write('create', new_job.id)
+    sync_job_index(write, job_text, new_job.is_active)
+    sync_facet_index(write, new_job)
+    sync_suggest_index(write, new_job, job_skills)
+    result_cache.bump()
+    schedule_match_scores(job_id=new_job.id)
+    
     return jsonify({'message': 'Job posted successfully', 'jobId': new_job.id}), 201
 
 @app.route('/api/jobs/employer', methods=['GET'])
@@ -394,22 +615,1295 @@ def get_employer_jobs():
     if user.user_type != 'employer':
         return jsonify({'error': 'Only employers can access this endpoint'}), 403
     
+    # Polling clients are answered from the row versions alone
+    response = not_modified(version_etag(user_id, request.query_string, *row_versions(
+        db.select(db.func.count(Job.id)).where(Job.employer_id == user_id),
+        db.select(db.func.max(row_version(Job))).where(Job.employer_id == user_id),
+        db.select(db.func.count(JobApplication.id)).join(Job, Job.id == JobApplication.job_id).where(Job.employer_id == user_id)
+    )), weak=True)
+    if response is not None:
+        return response
+    
+    # A page of the employer's jobs, newest first
+    page = page_args()
+    if page is not None:
+        rows, next_cursor = keyset_page(Job.query.filter_by(employer_id=user_id), 'recent', RECENT_JOB_KEYS, *page)
+        return json_response(encode_object({
+            'jobs': job_fragments.encode_list([row[0] for row in rows]),
+            'nextCursor': app.json.dumps(next_cursor)
+        }))
+    
     # Get all jobs posted by the employer
     jobs = Job.query.filter_by(employer_id=user_id).all()
     
-    # Convert jobs to dict
-    jobs_data = [job.to_dict() for job in jobs]
-    
-    return jsonify(jobs_data), 200
+    # Splice the jobs' cached JSON
+    return json_response(job_fragments.encode_list(jobs))
 
 # Import the matching utilities
-from utils.matching import load_model, calculate_match_score, calculate_seeker_to_jobs_scores
+from utils.matching import (
+    preprocess_text,
+    calculate_seeker_to_jobs_scores,
+    calculate_job_to_seekers_scores,
+    find_top_job_matches,
+    find_similar_items
+)
+from utils.job_index import JobIndex
+from utils.seeker_index import SeekerIndex
+from utils.embeddings import EmbeddingStore
+from utils.score_cache import ScoreCache, skills_hash
+from utils.result_cache import ResultCache, canonical_params
+from utils.job_serializer import JobFragmentCache, encode_object
+from utils.parallel_scoring import ShardedScorer
+from utils.skill_dictionary import DEFAULT_SKILLS, SkillDictionary, SkillSetIndex, learnable_skill, normalize_skill
+from utils.facet_index import FacetIndex
+from utils.suggest_index import SUGGEST_KINDS, SuggestIndex
+from utils.geo import distance_km, geohash_cover
+
+# Long-lived TF-IDF index over active jobs, shared by all requests in this process
+job_index = JobIndex(
+    refit_ratio=app.config['MATCH_INDEX_REFIT_RATIO'],
+    new_term_refit_max_jobs=app.config['MATCH_INDEX_NEW_TERM_REFIT_MAX_JOBS']
+)
+
+# Seeker skill matrices for scoring one job against all seekers
+seeker_index = SeekerIndex()
+
+# Process pool for scoring very large batches, used above PARALLEL_SCORING_MIN_JOBS
+parallel_scorer = ShardedScorer(
+    processes=app.config['PARALLEL_SCORING_PROCESSES'],
+    min_jobs=app.config['PARALLEL_SCORING_MIN_JOBS']
+)
+
+# Recently computed match scores, keyed by (skills hash, job id, job updated_at)
+score_cache = ScoreCache(
+    max_entries=app.config['SCORE_CACHE_MAX_ENTRIES'],
+    ttl=app.config['SCORE_CACHE_TTL']
+)
+
+# Encoded JSON of recently listed jobs, keyed by (id, updated_at)
+job_fragments = JobFragmentCache(max_entries=app.config['JOB_FRAGMENT_CACHE_MAX_ENTRIES'])
+
+# Serialized job search responses, invalidated by a generation bumped on every job write
+try:
+    result_cache = ResultCache.from_url(
+        app.config['RESULT_CACHE_URL'],
+        max_bytes=app.config['RESULT_CACHE_MAX_BYTES'],
+        ttl=app.config['RESULT_CACHE_TTL']
+    )
+except Exception as e:
+    print(f"Error connecting to the result cache, using an in-process cache: {e}")
+    result_cache = ResultCache.from_url(max_bytes=app.config['RESULT_CACHE_MAX_BYTES'], ttl=app.config['RESULT_CACHE_TTL'])
+
+# Canonical skill dictionary (loaded lazily) and the skill ids of every job and seeker
+skill_dictionary = None
+job_skill_sets = SkillSetIndex()
+seeker_skill_sets = SkillSetIndex()
+
+# Titles, companies and skills of the active jobs, for search box suggestions
+suggest_index = SuggestIndex()
+
+# Offline places with coordinates that free-text locations are resolved to, and their ids in the locations table
+gazetteer = Gazetteer.load(app.config['GAZETTEER_PATH'])
+location_ids = {}
+
+# Job type, location, level and remote facets of the active jobs, for search filter counts;
+# locations are counted under the place they resolve to, so "NYC" and "New York, NY" share one
+facet_index = FacetIndex(labels={'location': gazetteer.place_name})
+
+# Word2Vec vectors, memory-mapped read-only so all workers share one copy
+try:
+    embedding_store = EmbeddingStore.load(
+        nprobe=app.config['ANN_NPROBE'],
+        min_train_size=app.config['ANN_MIN_TRAIN_SIZE']
+    )
+except Exception as e:
+    print(f"Error loading Word2Vec model: {e}")
+    embedding_store = None
+
+def job_corpus_signature():
+    """Cheap fingerprint of the jobs table that changes on any insert, update or delete"""
+    # From the primary: a lagging replica would mark an index current, or behind, wrongly
+    return tuple(db.session.query(
+        db.func.count(Job.id),
+        db.func.max(Job.id),
+        db.func.max(Job.updated_at)
+    ).execution_options(**READ_PRIMARY).one())
+
+def record_job_write(kind, job_id, updated_at=None):
+    """
+    A job write ('create', 'update' or 'delete') this process just committed
+
+    Returned as (kind, job id, the job's updated_at, jobs table signature
+    right after the commit), for advance_job_signature(). For a delete,
+    pass the updated_at the job had.
+    """
+    return kind, job_id, updated_at, job_corpus_signature()
 
-# Load the Word2Vec model
-word2vec_model = load_model()
+def advance_job_signature(previous, write):
+    """
+    Signature of an index at ``previous`` once this process's ``write`` is applied to it
+
+    That is the table's current signature only if this one write explains
+    the whole change from ``previous``. If other processes wrote jobs in the
+    meantime, ``previous`` is returned so the index stays stale and the next
+    read rebuilds it instead of missing their writes.
+    """
+    kind, job_id, updated_at, current = write
+    if previous is None:
+        return None
+    
+    count, max_id, max_updated = previous
+    new_count, new_max_id, new_max_updated = current
+    if kind == 'create':
+        # New jobs have no updated_at
+        expected = (
+            new_count == count + 1 and new_max_id == max(max_id or 0, job_id)
+            and new_max_updated == max_updated
+        )
+    elif kind == 'update':
+        latest = updated_at if max_updated is None or (updated_at is not None and updated_at > max_updated) else max_updated
+        expected = new_count == count and new_max_id == max_id and new_max_updated == latest
+    else:
+        # The deleted job may have held the largest id or updated_at
+        expected = (
+            new_count == count - 1
+            and (new_max_id == max_id if job_id != max_id else (new_max_id or 0) < job_id)
+            and (new_max_updated == max_updated if updated_at is None or updated_at != max_updated
+                 else new_max_updated is None or new_max_updated <= max_updated)
+        )
+    return current if expected else previous
+
+def get_job_index():
+    """Return the job index, rebuilding it if the jobs table changed outside this process"""
+    signature = job_corpus_signature()
+    
+    if job_index.signature != signature or job_index.is_stale(app.config['MATCH_INDEX_MAX_AGE']):
+        # Rows of the state the primary signature describes
+        read_primary(db.session)
+        job_index.build(load_job_texts(), signature)
+    
+    schedule_stale_match_scores()
+    return job_index
+
+def save_job_text(job):
+    """Store the normalized description of a job in the caller's transaction and return it"""
+    text = preprocess_text(job.description)
+    db.session.merge(JobText(job_id=job.id, text=text, updated_at=datetime.utcnow()))
+    return text
+
+def load_job_texts():
+    """(job_id, normalized text) of every active job, normalizing any job without a stored text"""
+    rows = db.session.query(Job.id, JobText.text).outerjoin(JobText, JobText.job_id == Job.id).filter(
+        Job.is_active == True
+    ).all()
+    
+    missing = [job_id for job_id, text in rows if text is None]
+    if not missing:
+        return rows
+    
+    descriptions = dict(db.session.query(Job.id, Job.description).filter(Job.id.in_(missing)).all())
+    return [(job_id, text if text is not None else preprocess_text(descriptions[job_id])) for job_id, text in rows]
+
+def backfill_job_texts():
+    """Normalize and store the text of jobs posted before job_texts existed"""
+    jobs = db.session.query(Job.id, Job.description).outerjoin(JobText, JobText.job_id == Job.id).filter(
+        JobText.job_id == None
+    ).all()
+    if not jobs:
+        return
+    
+    try:
+        now = datetime.utcnow()
+        db.session.execute(JobText.__table__.insert(), [
+            {'job_id': job_id, 'text': preprocess_text(description), 'updated_at': now}
+            for job_id, description in jobs
+        ])
+        db.session.commit()
+    except Exception as e:
+        # Another worker may have backfilled the same jobs first
+        db.session.rollback()
+        print(f"Error backfilling job texts: {e}")
+
+def sync_job_index(write, text=None, is_active=False):
+    """Apply a committed job write (from record_job_write) to the index without refitting it, from the job's normalized text"""
+    job_id = write[1]
+    
+    # Nothing to update until the index has been built once
+    if job_index.signature is None:
+        return
+    
+    if is_active:
+        job_index.upsert(job_id, text)
+    else:
+        job_index.remove(job_id)
+    schedule_stale_match_scores()
+    
+    # Skills are re-extracted from the new text on the next prefilter
+    job_skill_sets.remove(job_id)
+    
+    # Keep the job embeddings in step if they were built from the same state
+    if embedding_store is not None and embedding_store.jobs.signature == job_index.signature:
+        vector = embedding_store.document_vector(text) if is_active else None
+        embedding_store.jobs.upsert(job_id, vector)
+    
+    refresh_job_index_signature(write)
+
+def refresh_job_index_signature(write):
+    """Mark this process's own job write as already applied to the index, unless other processes wrote jobs too"""
+    if job_index.signature is None:
+        return
+    
+    previous_signature = job_index.signature
+    job_index.signature = advance_job_signature(previous_signature, write)
+    
+    if embedding_store is not None and embedding_store.jobs.signature == previous_signature:
+        embedding_store.jobs.signature = job_index.signature
+
+def get_facet_index():
+    """Return the facet index, rebuilding it if the jobs table changed outside this process"""
+    signature = job_corpus_signature()
+    
+    if facet_index.signature != signature or facet_index.is_stale(app.config['MATCH_INDEX_MAX_AGE']):
+        # Rows of the state the primary signature describes
+        read_primary(db.session)
+        facet_index.build(
+            db.session.query(Job.id, Job.type, Job.location, Job.experience_level, Job.is_remote).filter(
+                Job.is_active == True
+            ).all(),
+            signature
+        )
+    
+    return facet_index
+
+def sync_facet_index(write, job=None):
+    """Apply a committed job write (from record_job_write, with None for a deleted job) to the facet index"""
+    job_id = write[1]
+    
+    # Nothing to update until the index has been built once
+    if facet_index.signature is None:
+        return
+    
+    if job is not None and job.is_active:
+        facet_index.upsert(job_id, job.type, job.location, job.experience_level, job.is_remote)
+    else:
+        facet_index.remove(job_id)
+    
+    facet_index.signature = advance_job_signature(facet_index.signature, write)
+
+def get_suggest_index():
+    """Return the suggestion index, rebuilding it if jobs or skills changed outside this process"""
+    # Suggestions are answered from memory; the database is only checked now and then
+    if suggest_index.signature is not None and time.time() - suggest_index.checked_at < app.config['SUGGEST_REFRESH_INTERVAL']:
+        return suggest_index
+    
+    signature = (job_corpus_signature(), skill_dictionary_signature())
+    if suggest_index.signature != signature:
+        # Rows of the state the primary signature describes
+        read_primary(db.session)
+        skills = {}
+        for job_id, name in db.session.query(JobSkill.job_id, SkillTerm.name).join(
+            SkillTerm, SkillTerm.id == JobSkill.term_id
+        ).join(Job, Job.id == JobSkill.job_id).filter(Job.is_active == True):
+            skills.setdefault(job_id, []).append(name)
+        
+        suggest_index.build(
+            [
+                (job_id, title, company, skills.get(job_id, ()))
+                for job_id, title, company in db.session.query(Job.id, Job.title, Job.company).filter(Job.is_active == True)
+            ],
+            signature
+        )
+    suggest_index.checked_at = time.time()
+    
+    return suggest_index
+
+def sync_suggest_index(write, job=None, job_skills=None):
+    """Apply a committed job write (from record_job_write, with None for a deleted job) to the suggestion index, with its {term_id: weight} skills if re-extracted"""
+    job_id = write[1]
+    
+    # Nothing to update until the index has been built once
+    if suggest_index.signature is None:
+        return
+    
+    if job is not None and job.is_active:
+        skills = None
+        if job_skills is not None:
+            names = get_skill_dictionary().names
+            skills = [names[term_id] for term_id in job_skills if term_id in names]
+        elif job_id not in suggest_index.job_terms:
+            skills = [name for (name,) in db.session.query(SkillTerm.name).join(
+                JobSkill, JobSkill.term_id == SkillTerm.id
+            ).filter(JobSkill.job_id == job_id)]
+        suggest_index.upsert(job_id, job.title, job.company, skills)
+    else:
+        suggest_index.remove(job_id)
+    
+    job_signature = advance_job_signature(suggest_index.signature[0], write)
+    if job_signature == write[3]:
+        suggest_index.signature = (job_signature, suggest_index.signature[1])
+    else:
+        # Other workers wrote jobs too, have the next suggestion compare with the database
+        suggest_index.checked_at = 0.0
+
+def search_facets(search, filters, near=None):
+    """Facet counts of the active jobs matching a search, filters and radius"""
+    query = None
+    if search:
+        query, _ = job_search.apply(db.session.query(Job.id).filter(Job.is_active == True), Job, search)
+    if near is not None:
+        query = (query or db.session.query(Job.id).filter(Job.is_active == True)).filter(Job.id.in_(jobs_within(*near)))
+    
+    job_ids = None if query is None else [job_id for (job_id,) in query.all()]
+    return get_facet_index().counts(filters, job_ids)
+
+def seed_locations():
+    """Add the gazetteer's places to the locations table and load their ids"""
+    try:
+        existing = {name for (name,) in db.session.query(Location.name).all()}
+        missing = [place for place in gazetteer.places if place.name not in existing]
+        if missing:
+            db.session.execute(Location.__table__.insert(), [
+                {'name': place.name, 'latitude': place.latitude, 'longitude': place.longitude, 'geohash': place.geohash}
+                for place in missing
+            ])
+            db.session.commit()
+    except Exception as e:
+        # Another worker may be seeding at the same time
+        db.session.rollback()
+        print(f"Error seeding locations: {e}")
+    
+    location_ids.update(db.session.query(Location.name, Location.id).all())
+
+def resolve_location_id(text):
+    """Id of the known place a free-text location refers to, or None"""
+    place = gazetteer.resolve(text)
+    return location_ids.get(place.name) if place is not None else None
+
+def json_list(text):
+    """Items of a JSON string array column, [] if it is empty or malformed"""
+    try:
+        items = json.loads(text) if text else []
+    except ValueError:
+        return []
+    return [str(item) for item in items] if isinstance(items, list) else []
+
+def save_job_location(job):
+    """Resolve a job's location into job_locations in the caller's transaction"""
+    JobLocation.query.filter_by(job_id=job.id).delete()
+    location_id = resolve_location_id(job.location)
+    if location_id is not None:
+        db.session.add(JobLocation(job_id=job.id, location_id=location_id))
+
+def save_user_locations(user_id, location, preferred_locations):
+    """Resolve a seeker's profile and preferred locations into user_locations in the caller's transaction"""
+    UserLocation.query.filter_by(user_id=user_id).delete()
+    resolved = {resolve_location_id(text) for text in [location] + json_list(preferred_locations)} - {None}
+    if resolved:
+        db.session.execute(UserLocation.__table__.insert(), [
+            {'user_id': user_id, 'location_id': location_id} for location_id in sorted(resolved)
+        ])
+
+def backfill_locations():
+    """Resolve the locations of jobs and seekers written before the locations tables existed"""
+    # Remote or unknown places are looked at again by `flask backfill`
+    jobs = db.session.query(Job).filter(~Job.id.in_(db.session.query(JobLocation.job_id))).all()
+    seekers = db.session.query(Profile.user_id, Profile.location, JobPreference.locations).join(
+        User, User.id == Profile.user_id
+    ).outerjoin(JobPreference, JobPreference.user_id == Profile.user_id).filter(
+        User.user_type == 'jobSeeker',
+        ~Profile.user_id.in_(db.session.query(UserLocation.user_id))
+    ).all()
+    
+    try:
+        for job in jobs:
+            save_job_location(job)
+        for user_id, location, preferred_locations in seekers:
+            save_user_locations(user_id, location, preferred_locations)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error backfilling locations: {e}")
+
+def locations_within(latitude, longitude, radius_km):
+    """Ids of the known places within radius_km of a point"""
+    # A few geohash prefix range scans, then the exact distance
+    cells = [db.and_(Location.geohash >= prefix, Location.geohash < prefix + '{') for prefix in geohash_cover(latitude, longitude, radius_km)]
+    rows = db.session.query(Location.id, Location.latitude, Location.longitude).filter(db.or_(*cells)).all()
+    return [location_id for location_id, lat, lng in rows if distance_km(latitude, longitude, lat, lng) <= radius_km]
+
+def jobs_within(latitude, longitude, radius_km):
+    """Subquery of the ids of jobs located within radius_km of a point"""
+    return db.session.query(JobLocation.job_id).filter(JobLocation.location_id.in_(locations_within(latitude, longitude, radius_km)))
+
+def geo_args():
+    """(latitude, longitude, radius km) of a radius search near a place or point, or None"""
+    near = request.args.get('near')
+    latitude = request.args.get('lat', type=float)
+    longitude = request.args.get('lng', type=float)
+    radius_km = request.args.get('radiusKm', app.config['GEO_DEFAULT_RADIUS_KM'], type=float)
+    
+    if near:
+        place = gazetteer.resolve(near)
+        if place is None:
+            raise UnknownLocation(f'Unknown location: {near}')
+        return place.latitude, place.longitude, radius_km
+    if latitude is not None and longitude is not None:
+        return latitude, longitude, radius_km
+    return None
+
+def location_matcher(locations):
+    """Whether a job's location text matches a location filter, by substring or by resolved place"""
+    needles = [location.lower() for location in locations]
+    resolved = {resolve_location_id(location) for location in locations} - {None}
+    return lambda value: value is not None and (
+        any(needle in value.lower() for needle in needles) or resolve_location_id(value) in resolved
+    )
+
+def nearby_job_ids(user_id, radius_km):
+    """Active jobs within radius_km of any of a seeker's locations, and remote jobs; None if no location is known"""
+    places = db.session.query(Location.latitude, Location.longitude).join(
+        UserLocation, UserLocation.location_id == Location.id
+    ).filter(UserLocation.user_id == user_id).all()
+    if not places:
+        return None
+    
+    nearby = set()
+    for latitude, longitude in places:
+        nearby.update(locations_within(latitude, longitude, radius_km))
+    
+    return [job_id for (job_id,) in db.session.query(Job.id).filter(
+        Job.is_active == True,
+        db.or_(Job.is_remote == True, Job.id.in_(db.session.query(JobLocation.job_id).filter(JobLocation.location_id.in_(nearby))))
+    ).all()]
+
+def nearby_seeker_ids(job, radius_km):
+    """Seekers with a location within radius_km of a job; None for remote jobs or unknown places"""
+    place = db.session.query(Location.latitude, Location.longitude).join(
+        JobLocation, JobLocation.location_id == Location.id
+    ).filter(JobLocation.job_id == job.id).first()
+    if job.is_remote or place is None:
+        return None
+    
+    return [user_id for (user_id,) in db.session.query(UserLocation.user_id).filter(
+        UserLocation.location_id.in_(locations_within(place.latitude, place.longitude, radius_km))
+    ).distinct().all()]
+
+def seeker_skills_signature():
+    """Cheap fingerprint of the skills table that changes whenever a seeker's skills are rewritten"""
+    return tuple(db.session.query(
+        db.func.count(Skill.id),
+        db.func.max(Skill.id),
+        db.func.max(Skill.created_at)
+    ).execution_options(**READ_PRIMARY).one())
+
+def get_seeker_index():
+    """Return the seeker index, rebuilding it if skills changed outside this process"""
+    signature = seeker_skills_signature()
+    
+    if seeker_index.signature != signature or seeker_index.is_stale(app.config['MATCH_INDEX_MAX_AGE']):
+        # Rows of the state the primary signature describes
+        read_primary(db.session)
+        rows = db.session.query(Skill.user_id, Skill.name).join(User, User.id == Skill.user_id).filter(
+            User.user_type == 'jobSeeker'
+        ).order_by(Skill.user_id, Skill.id).all()
+        
+        skills_by_seeker = {}
+        for seeker_id, name in rows:
+            skills_by_seeker.setdefault(seeker_id, []).append(name)
+        
+        seeker_index.build(skills_by_seeker.items(), signature)
+    
+    return seeker_index
+
+def sync_seeker_index(user_id, skills):
+    """Apply a committed skills rewrite to the seeker index"""
+    if seeker_index.signature is None:
+        return
+    
+    seeker_index.upsert(user_id, skills)
+    
+    # Keep the seeker embeddings in step if they were built from the same state
+    previous_signature = seeker_index.signature
+    seeker_index.signature = seeker_skills_signature()
+    
+    if embedding_store is not None and embedding_store.seekers.signature == previous_signature:
+        vector = embedding_store.document_vector(' '.join(skills)) if skills else None
+        embedding_store.seekers.upsert(user_id, vector)
+        embedding_store.seekers.signature = seeker_index.signature
+
+def skill_dictionary_signature():
+    """Cheap fingerprint of the skill dictionary tables, which only ever grow"""
+    return tuple(
+        db.session.query(db.func.count(SkillTerm.id), db.func.max(SkillTerm.id)).execution_options(**READ_PRIMARY).one()
+    ) + tuple(
+        db.session.query(db.func.count(SkillAlias.id), db.func.max(SkillAlias.id)).execution_options(**READ_PRIMARY).one()
+    )
+
+def get_skill_dictionary():
+    """Return the skill dictionary, reloading it when terms or aliases were added"""
+    global skill_dictionary
+    signature = skill_dictionary_signature()
+    
+    if skill_dictionary is None or skill_dictionary.signature != signature:
+        # Rows of the state the primary signature describes
+        read_primary(db.session)
+        skill_dictionary = SkillDictionary(
+            db.session.query(SkillTerm.id, SkillTerm.name).all(),
+            db.session.query(SkillAlias.alias, SkillAlias.term_id).all(),
+            signature
+        )
+    
+    return skill_dictionary
+
+def intern_skills(names):
+    """Queue the skill names missing from the dictionary to be added as new terms, if learning is enabled"""
+    # Otherwise seeker skills only match the curated terms and their aliases
+    if not app.config['SKILL_DICTIONARY_LEARN']:
+        return
+    
+    dictionary = get_skill_dictionary()
+    new_names = sorted({learnable_skill(name) for name in names if dictionary.lookup(name) is None} - {None})
+    if new_names:
+        schedule_skill_terms(new_names)
+
+# Background tagging of the jobs mentioning newly learned skills
+skill_term_executor = None
+
+def schedule_skill_terms(names):
+    global skill_term_executor
+    if skill_term_executor is None:
+        skill_term_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='skill-terms')
+    skill_term_executor.submit(run_skill_terms_task, names)
+
+def run_skill_terms_task(names):
+    with app.app_context():
+        try:
+            add_skill_terms(names)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error adding skills {names} to the dictionary: {e}")
+
+def add_skill_terms(names):
+    """Add normalized skill names as new canonical terms, and tag the jobs mentioning them"""
+    dictionary = get_skill_dictionary()
+    
+    added = []
+    for name in names:
+        # Queued again before an earlier task added it
+        if dictionary.lookup(name) is not None:
+            continue
+        try:
+            term = SkillTerm(name=name, created_at=datetime.utcnow())
+            db.session.add(term)
+            db.session.commit()
+            added.append((term.id, name))
+        except Exception as e:
+            # Another worker may have added the same skill first
+            db.session.rollback()
+            print(f"Error adding skill {name} to the dictionary: {e}")
+    
+    # Jobs were only tagged with the terms known when they were written
+    if added:
+        tag_job_skills(SkillDictionary(added))
+        # Skill sets read while the jobs were being tagged miss the new terms
+        job_skill_sets.key = None
+
+def seed_skill_dictionary():
+    """Add the default skills and aliases, and every skill seekers already listed, to the dictionary"""
+    try:
+        existing = {name for (name,) in db.session.query(SkillTerm.name).all()}
+        for name in DEFAULT_SKILLS:
+            if name not in existing:
+                db.session.add(SkillTerm(name=name, created_at=datetime.utcnow()))
+        db.session.flush()
+        
+        term_ids = dict(db.session.query(SkillTerm.name, SkillTerm.id).all())
+        existing_aliases = {alias for (alias,) in db.session.query(SkillAlias.alias).all()}
+        for name, aliases in DEFAULT_SKILLS.items():
+            for alias in {normalize_skill(alias) for alias in aliases} - existing_aliases:
+                db.session.add(SkillAlias(alias=alias, term_id=term_ids[name]))
+        db.session.commit()
+    except Exception as e:
+        # Another worker may be seeding at the same time
+        db.session.rollback()
+        print(f"Error seeding the skill dictionary: {e}")
+
+def requirements_text(requirements):
+    """Normalized text of a job's JSON requirements list"""
+    try:
+        items = json.loads(requirements) if requirements else []
+    except ValueError:
+        return ''
+    return ' '.join(preprocess_text(str(item)) for item in items)
+
+def save_job_skills(job, job_text):
+    """Extract a job's dictionary skills into job_skills in the caller's transaction, returns {term_id: weight}"""
+    weights = get_skill_dictionary().extract_weighted(job_text, requirements_text(job.requirements))
+    
+    JobSkill.query.filter_by(job_id=job.id).delete()
+    if weights:
+        db.session.execute(JobSkill.__table__.insert(), [
+            {'job_id': job.id, 'term_id': term_id, 'weight': weight}
+            for term_id, weight in weights.items()
+        ])
+    return weights
+
+def tag_job_skills(dictionary, job_ids=None):
+    """Add the skills of ``dictionary`` found in stored jobs (all of them by default) to job_skills"""
+    if job_ids is None:
+        job_ids = [job_id for (job_id,) in db.session.query(JobText.job_id).all()]
+    
+    batch_size = app.config['SKILL_EXTRACTION_BATCH']
+    for start in range(0, len(job_ids), batch_size):
+        rows = db.session.query(JobText.job_id, JobText.text, Job.requirements).join(Job, Job.id == JobText.job_id).filter(
+            JobText.job_id.in_(job_ids[start:start + batch_size])
+        ).all()
+        
+        extracted = dictionary.extract_weighted_all(
+            [text for _, text, _ in rows],
+            [requirements_text(requirements) for _, _, requirements in rows]
+        )
+        values = [
+            {'job_id': job_id, 'term_id': term_id, 'weight': weight}
+            for (job_id, _, _), weights in zip(rows, extracted)
+            for term_id, weight in weights.items()
+        ]
+        if not values:
+            continue
+        
+        try:
+            db.session.execute(JobSkill.__table__.insert(), values)
+            db.session.commit()
+        except Exception as e:
+            # A job of the batch was re-extracted by a concurrent write
+            db.session.rollback()
+            print(f"Error tagging job skills: {e}")
+
+def backfill_job_skills():
+    """Extract the skills of jobs posted before job_skills existed"""
+    # Jobs that mention no known skill are looked at again by `flask backfill`
+    untagged = db.session.query(JobText.job_id).filter(~JobText.job_id.in_(db.session.query(JobSkill.job_id)))
+    job_ids = [job_id for (job_id,) in untagged.all()]
+    if job_ids:
+        tag_job_skills(get_skill_dictionary(), job_ids)
+
+def get_job_skill_sets():
+    """Skill ids stored in job_skills for every indexed job"""
+    dictionary = get_skill_dictionary()
+    index = get_job_index()
+    key = (dictionary.signature, index.generation, index.version)
+    
+    if job_skill_sets.key == key:
+        return job_skill_sets
+    
+    # A new dictionary or vocabulary means re-extracting every job, otherwise only the changed ones
+    if job_skill_sets.key is None or job_skill_sets.key[:2] != key[:2]:
+        job_skill_sets.build({})
+    
+    for job_id in [job_id for job_id in job_skill_sets.sets if job_id not in index.texts]:
+        job_skill_sets.remove(job_id)
+    
+    missing = [job_id for job_id in index.texts if job_id not in job_skill_sets.sets]
+    if missing:
+        query = db.session.query(JobSkill.job_id, JobSkill.term_id)
+        if len(missing) < len(index.texts):
+            query = query.filter(JobSkill.job_id.in_(missing))
+        
+        found = {job_id: [] for job_id in missing}
+        for job_id, term_id in query.all():
+            if job_id in found:
+                found[job_id].append(term_id)
+        for job_id, term_ids in found.items():
+            job_skill_sets.set(job_id, term_ids)
+    
+    job_skill_sets.key = key
+    return job_skill_sets
+
+def get_seeker_skill_sets():
+    """Canonical skill ids of every seeker with skills"""
+    dictionary = get_skill_dictionary()
+    index = get_seeker_index()
+    key = (dictionary.signature, index.signature)
+    
+    if seeker_skill_sets.key != key:
+        seeker_skill_sets.build(
+            {seeker_id: dictionary.ids(skills) for seeker_id, skills in index.skills.items()},
+            key
+        )
+    
+    return seeker_skill_sets
+
+def skill_prefilter_args():
+    """Minimum shared canonical skills and Jaccard similarity for recommendation candidates (0 disables)"""
+    return (
+        request.args.get('minSkillOverlap', app.config['SKILL_PREFILTER_MIN_OVERLAP'], type=int),
+        request.args.get('minSkillJaccard', app.config['SKILL_PREFILTER_MIN_JACCARD'], type=float)
+    )
+
+# Data introduced after the original schema, filled in for existing rows once per
+# database by the first worker to start on it (new rows get it when written)
+BACKFILLS = [
+    (101, 'Normalized job texts', backfill_job_texts),
+    (102, 'Skills of existing jobs', backfill_job_skills),
+    (103, 'Locations of existing jobs and seekers', backfill_locations),
+]
+
+with app.app_context():
+    seed_skill_dictionary()
+    seed_locations()
+    run_data_migrations(db.engine, BACKFILLS)
+
+@app.cli.command('backfill')
+def backfill_command():
+    """Fill in job texts, skills and locations missing from existing rows, and learn seekers' skills"""
+    for _, name, backfill in BACKFILLS:
+        print(f"Backfilling {name.lower()}")
+        backfill()
+    intern_skills(name for (name,) in db.session.query(Skill.name).distinct().all())
+
+def get_cached_match_scores(skills, jobs):
+    """Match scores of a skill list against jobs, computing only the cache misses"""
+    if not skills:
+        return [0.0] * len(jobs)
+    
+    # Scores from before a TF-IDF refit are no longer comparable
+    index = get_job_index()
+    if score_cache.generation != index.generation:
+        score_cache.reset(index.generation)
+    
+    key = skills_hash(skills)
+    scores = {}
+    missing = []
+    for job in jobs:
+        score = score_cache.get((key, job.id, job.updated_at))
+        if score is None:
+            missing.append(job)
+        else:
+            scores[job.id] = score
+    
+    if missing:
+        for job, score in zip(missing, calculate_seeker_to_jobs_scores(index, skills, missing, parallel_scorer)):
+            score_cache.set((key, job.id, job.updated_at), score)
+            scores[job.id] = score
+    
+    return [scores[job.id] for job in jobs]
+
+def get_embedding_store():
+    """Return the embedding store with job and seeker embeddings matching the current indexes"""
+    if embedding_store is None:
+        return None
+    
+    # Reuse a saved index built from the same database state (e.g. by another worker)
+    index = get_job_index()
+    path = os.path.join(app.config['ANN_INDEX_DIR'], 'jobs.npz')
+    if embedding_store.jobs.signature != index.signature and not embedding_store.jobs.load(path, index.signature):
+        job_ids = list(index.texts)
+        vectors = embedding_store.document_vectors([index.texts[job_id] for job_id in job_ids])
+        embedding_store.jobs.build(job_ids, vectors, index.signature)
+        embedding_store.jobs.save(path)
+    
+    index = get_seeker_index()
+    path = os.path.join(app.config['ANN_INDEX_DIR'], 'seekers.npz')
+    if embedding_store.seekers.signature != index.signature and not embedding_store.seekers.load(path, index.signature):
+        seeker_ids = list(index.skills)
+        vectors = embedding_store.document_vectors([' '.join(index.skills[seeker_id]) for seeker_id in seeker_ids])
+        embedding_store.seekers.build(seeker_ids, vectors, index.signature)
+        embedding_store.seekers.save(path)
+    
+    return embedding_store
+
+# Background recomputation of the materialized match_scores table
+match_score_executor = None
+queued_match_scores = set()
+queued_match_scores_lock = threading.Lock()
+match_scores_generation = None  # job index generation the stored scores were last checked against
+
+def match_score_marker(kind):
+    """(model, key column) of the markers of seekers' rows ('seeker') or jobs' columns ('job')"""
+    if kind == 'seeker':
+        return MatchScoreSeeker, MatchScoreSeeker.seeker_id
+    return MatchScoreJob, MatchScoreJob.job_id
+
+def mark_match_scores_pending(seeker_id=None, job_id=None):
+    """Flag a seeker's row or a job's column as stale, in the caller's transaction"""
+    if seeker_id is not None:
+        db.session.merge(MatchScoreSeeker(seeker_id=seeker_id, status='pending', updated_at=datetime.utcnow()))
+    if job_id is not None:
+        db.session.merge(MatchScoreJob(job_id=job_id, status='pending', updated_at=datetime.utcnow()))
+
+def schedule_match_scores(seeker_id=None, job_id=None):
+    """Recompute a seeker's row or a job's column of match_scores, in the background by default"""
+    schedule_match_scores_task(('seeker', seeker_id) if seeker_id is not None else ('job', job_id))
+
+def schedule_stale_match_scores():
+    """Rescore the job columns of match_scores once this process has refitted the job index"""
+    global match_scores_generation
+    if match_scores_generation == job_index.generation:
+        return
+    match_scores_generation = job_index.generation
+    schedule_match_scores_task(('model', None))
+
+def schedule_match_scores_task(task):
+    if not app.config['MATCH_SCORES_BACKGROUND']:
+        run_match_scores_task(task, queued=False)
+        return
+    
+    # A task already waiting in the queue will pick up the latest state
+    with queued_match_scores_lock:
+        if task in queued_match_scores:
+            return
+        queued_match_scores.add(task)
+    
+    global match_score_executor
+    if match_score_executor is None:
+        match_score_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='match-scores')
+    match_score_executor.submit(run_match_scores_task, task)
+
+def run_match_scores_task(task, queued=True):
+    if queued:
+        with queued_match_scores_lock:
+            queued_match_scores.discard(task)
+    
+    kind, entity_id = task
+    with app.app_context():
+        try:
+            if kind == 'seeker':
+                recompute_seeker_scores(entity_id)
+            elif kind == 'job':
+                recompute_job_scores(entity_id)
+            else:
+                rescore_stale_match_scores()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error recomputing match scores for {kind} {entity_id}: {e}")
+
+def insert_match_scores(rows):
+    """Bulk insert (seeker_id, job_id, score) rows, skipping zero scores"""
+    rows = [
+        {'seeker_id': seeker_id, 'job_id': job_id, 'score': score}
+        for seeker_id, job_id, score in rows if score > 0
+    ]
+    if rows:
+        db.session.execute(MatchScore.__table__.insert(), rows)
+
+def match_scores_version(kind, entity_id):
+    """updated_at of a seeker's row or job's column marker, None without one"""
+    model, key = match_score_marker(kind)
+    return db.session.query(model.updated_at).filter(key == entity_id).scalar()
+
+def mark_match_scores_ready(kind, entity_id, version, **values):
+    """
+    Flag a seeker's row or job's column up to date, in the caller's transaction
+    
+    ``version`` is match_scores_version() from before the scores were
+    computed, ``values`` other marker columns to set. Returns False,
+    changing nothing, if the marker was flagged pending again since: the
+    scores are stale and a newer task writes them.
+    """
+    model, key = match_score_marker(kind)
+    values.update(status='ready', updated_at=datetime.utcnow())
+    if version is None:
+        if db.session.query(key).filter(key == entity_id).first() is not None:
+            return False
+        db.session.add(model(**{key.key: entity_id}, **values))
+        return True
+    
+    return model.query.filter(key == entity_id, model.updated_at == version).update(
+        values, synchronize_session=False
+    ) == 1
+
+def lost_match_scores_task(updated_at):
+    """Whether a marker pending since updated_at has most likely lost its task (its process exited)"""
+    return updated_at is None or datetime.utcnow() - updated_at > timedelta(seconds=app.config['MATCH_SCORES_PENDING_TIMEOUT'])
+
+def match_scores_ready(kind, entity_id):
+    """Whether a seeker's row or job's column is up to date, scheduling it if no task is on it"""
+    model, _ = match_score_marker(kind)
+    marker = db.session.get(model, entity_id)
+    if marker is not None and marker.status == 'ready':
+        return True
+    
+    if marker is None or lost_match_scores_task(marker.updated_at):
+        schedule_match_scores(**{f'{kind}_id': entity_id})
+    return False
+
+def pending_match_scores(kind, candidates):
+    """
+    Ids among ``candidates`` (ids or an id subquery) whose row ('seeker') or column ('job') is pending
+    
+    Those pending for longer than MATCH_SCORES_PENDING_TIMEOUT are
+    scheduled again, so a lost task does not keep them pending for good.
+    """
+    model, key = match_score_marker(kind)
+    pending = set()
+    for entity_id, updated_at in db.session.query(key, model.updated_at).filter(
+        model.status == 'pending', key.in_(candidates)
+    ).all():
+        pending.add(entity_id)
+        if lost_match_scores_task(updated_at):
+            schedule_match_scores(**{f'{kind}_id': entity_id})
+    return pending
+
+def recompute_seeker_scores(seeker_id):
+    """Rewrite one seeker's row of match_scores against every active job"""
+    version = match_scores_version('seeker', seeker_id)
+    skills = [name for (name,) in db.session.query(Skill.name).filter_by(user_id=seeker_id).order_by(Skill.id).all()]
+    index = get_job_index()
+    
+    MatchScore.query.filter_by(seeker_id=seeker_id).delete()
+    if skills:
+        jobs = db.session.query(Job.id, Job.description).filter(Job.is_active == True).all()
+        scores = calculate_seeker_to_jobs_scores(index, skills, jobs, parallel_scorer)
+        insert_match_scores((seeker_id, job.id, score) for job, score in zip(jobs, scores))
+    
+    if not mark_match_scores_ready('seeker', seeker_id, version):
+        db.session.rollback()
+        return
+    db.session.commit()
+
+def recompute_job_scores(job_id):
+    """Rewrite one job's column of match_scores against every seeker with skills"""
+    version = match_scores_version('job', job_id)
+    job = Job.query.get(job_id)
+    if not job:
+        return
+    index = get_job_index()
+    
+    MatchScore.query.filter_by(job_id=job_id).delete()
+    if job.is_active:
+        seeker_scores = calculate_job_to_seekers_scores(index, get_seeker_index(), job.description, job.id)
+        insert_match_scores((seeker_id, job_id, score) for seeker_id, score in seeker_scores)
+    
+    if not mark_match_scores_ready('job', job_id, version, model=index.fingerprint):
+        db.session.rollback()
+        return
+    db.session.commit()
+
+def rescore_stale_match_scores():
+    """
+    Recompute the job columns of match_scores scored with another fit of the job index
+    
+    A refit changes the vocabulary and IDF weights every score depends on.
+    The columns are flagged pending first, so reads score those jobs live
+    until they are rewritten, a batch of columns per transaction.
+    """
+    index = get_job_index()
+    if index.fingerprint is None:
+        return
+    
+    stale = [
+        MatchScoreJob.status == 'ready',
+        db.or_(MatchScoreJob.model == None, MatchScoreJob.model != index.fingerprint)
+    ]
+    job_ids = [job_id for (job_id,) in db.session.query(MatchScoreJob.job_id).filter(*stale).order_by(MatchScoreJob.job_id).all()]
+    if not job_ids:
+        return
+    
+    marked_at = datetime.utcnow()
+    MatchScoreJob.query.filter(MatchScoreJob.job_id.in_(job_ids), *stale).update(
+        {'status': 'pending', 'updated_at': marked_at}, synchronize_session=False
+    )
+    db.session.commit()
+    
+    seekers = get_seeker_index()
+    batch_size = app.config['MATCH_SCORES_REBUILD_BATCH']
+    for start in range(0, len(job_ids), batch_size):
+        batch = job_ids[start:start + batch_size]
+        MatchScore.query.filter(MatchScore.job_id.in_(batch)).delete(synchronize_session=False)
+        for job_id in batch:
+            # Inactive jobs are not indexed and keep an empty column
+            job_text = index.job_text(job_id)
+            if job_text is not None:
+                seeker_scores = calculate_job_to_seekers_scores(index, seekers, job_text, job_id)
+                insert_match_scores((seeker_id, job_id, score) for seeker_id, score in seeker_scores)
+        
+        # Columns flagged pending again since are rewritten by their own task
+        MatchScoreJob.query.filter(
+            MatchScoreJob.job_id.in_(batch),
+            MatchScoreJob.updated_at == marked_at
+        ).update({'status': 'ready', 'updated_at': datetime.utcnow(), 'model': index.fingerprint}, synchronize_session=False)
+        db.session.commit()
+
+def rebuild_match_scores():
+    """
+    Recompute the whole match_scores table from freshly fitted indexes
+    
+    Every row and column is flagged pending first, so reads fall back to
+    live scoring until the rebuild has caught up with them.
+    """
+    started_at = datetime.utcnow()
+    seeker_ids = [seeker_id for (seeker_id,) in db.session.query(Skill.user_id).join(User, User.id == Skill.user_id).filter(
+        User.user_type == 'jobSeeker'
+    ).distinct().all()]
+    job_ids = [job_id for (job_id,) in db.session.query(Job.id).filter(Job.is_active == True).order_by(Job.id).all()]
+    
+    MatchScore.query.delete()
+    MatchScoreSeeker.query.delete()
+    MatchScoreJob.query.delete()
+    if seeker_ids:
+        db.session.execute(MatchScoreSeeker.__table__.insert(), [
+            {'seeker_id': seeker_id, 'status': 'pending', 'updated_at': started_at} for seeker_id in seeker_ids
+        ])
+    if job_ids:
+        db.session.execute(MatchScoreJob.__table__.insert(), [
+            {'job_id': job_id, 'status': 'pending', 'updated_at': started_at} for job_id in job_ids
+        ])
+    db.session.commit()
+    
+    # Refit the vocabulary and IDF on the current corpus (a fresh index already is)
+    index = get_job_index()
+    if index.changes:
+        index.refit()
+    seekers = get_seeker_index()
+    
+    batch_size = app.config['MATCH_SCORES_REBUILD_BATCH']
+    for start in range(0, len(job_ids), batch_size):
+        batch = job_ids[start:start + batch_size]
+        for job_id in batch:
+            job_text = index.job_text(job_id)
+            if job_text is None:
+                continue
+            seeker_scores = calculate_job_to_seekers_scores(index, seekers, job_text, job_id)
+            insert_match_scores((seeker_id, job_id, score) for seeker_id, score in seeker_scores)
+        
+        MatchScoreJob.query.filter(
+            MatchScoreJob.job_id.in_(batch),
+            MatchScoreJob.updated_at == started_at
+        ).update({'status': 'ready', 'updated_at': datetime.utcnow(), 'model': index.fingerprint}, synchronize_session=False)
+        db.session.commit()
+    
+    MatchScoreSeeker.query.filter(MatchScoreSeeker.updated_at == started_at).update(
+        {'status': 'ready', 'updated_at': datetime.utcnow()}, synchronize_session=False
+    )
+    db.session.commit()
+    
+    # Seekers and jobs edited while the rebuild ran may have been overwritten with older data
+    for (seeker_id,) in db.session.query(MatchScoreSeeker.seeker_id).filter(MatchScoreSeeker.status == 'pending').all():
+        recompute_seeker_scores(seeker_id)
+    for (job_id,) in db.session.query(MatchScoreJob.job_id).filter(MatchScoreJob.status == 'pending').all():
+        recompute_job_scores(job_id)
+    
+    return len(seeker_ids), len(job_ids)
+
+@app.cli.command('rebuild-match-scores')
+def rebuild_match_scores_command():
+    """Recompute the match_scores table (run nightly, e.g. from cron)"""
+    seekers, jobs = rebuild_match_scores()
+    print(f"Rebuilt match scores for {seekers} seekers and {jobs} jobs")
+
+def get_materialized_match_scores(user_id, skills, jobs):
+    """
+    Match scores of a seeker against jobs read from match_scores
+    
+    Jobs whose column is being recomputed (and inactive jobs, which have no
+    stored scores) are scored live. Returns None while the seeker's own row
+    is not up to date.
+    """
+    if not skills or not match_scores_ready('seeker', user_id):
+        return None
+    
+    job_ids = [job.id for job in jobs]
+    pending = pending_match_scores('job', job_ids)
+    stored = dict(db.session.query(MatchScore.job_id, MatchScore.score).filter(
+        MatchScore.seeker_id == user_id, MatchScore.job_id.in_(job_ids)
+    ).all())
+    
+    live_jobs = [job for job in jobs if job.id in pending or not job.is_active]
+    scores = dict(zip([job.id for job in live_jobs], get_cached_match_scores(skills, live_jobs)))
+    
+    # Jobs without a stored score matched nothing
+    return [scores[job.id] if job.id in scores else stored.get(job.id, 0.0) for job in jobs]
+
+def get_materialized_job_matches(user_id, skills, k, min_score=None, job_ids=None):
+    """
+    Top k (job_id, score) tuples of a seeker, read from match_scores
+    
+    ``job_ids`` optionally restricts the candidates. Candidate jobs whose
+    column is being recomputed are scored live and merged in. Returns None
+    while the seeker's own row is being recomputed, so the caller can score
+    live instead.
+    """
+    if not match_scores_ready('seeker', user_id):
+        return None
+    
+    active_ids = db.session.query(Job.id).filter(Job.is_active == True)
+    pending = pending_match_scores('job', job_ids if job_ids is not None else active_ids)
+    
+    query = db.session.query(MatchScore.job_id, MatchScore.score).join(Job, Job.id == MatchScore.job_id).filter(
+        MatchScore.seeker_id == user_id,
+        Job.is_active == True
+    )
+    if pending:
+        query = query.filter(~MatchScore.job_id.in_(pending))
+    if min_score is not None:
+        query = query.filter(MatchScore.score >= min_score)
+    query = query.order_by(MatchScore.score.desc(), MatchScore.job_id)
+    
+    if job_ids is None:
+        matches = [(job_id, score) for job_id, score in query.limit(k).all()]
+    else:
+        # Stream the seeker's row in score order until k candidates are found
+        allowed = set(job_ids)
+        matches = []
+        for job_id, score in query.yield_per(1000):
+            if job_id in allowed:
+                matches.append((job_id, score))
+                if len(matches) == k:
+                    break
+    
+    # Fill up with jobs that matched nothing, as live scoring would
+    if len(matches) < k and (min_score is None or min_score <= 0):
+        scored = db.session.query(MatchScore.job_id).filter(MatchScore.seeker_id == user_id)
+        unmatched = db.session.query(Job.id).filter(Job.is_active == True, ~Job.id.in_(scored)).order_by(Job.id)
+        if pending:
+            unmatched = unmatched.filter(~Job.id.in_(pending))
+        if job_ids is None:
+            unmatched = unmatched.limit(k - len(matches)).all()
+        else:
+            unmatched = [(job_id,) for (job_id,) in unmatched.all() if job_id in allowed][:k - len(matches)]
+        matches.extend((job_id, 0.0) for (job_id,) in unmatched)
+    
+    if pending:
+        live = find_top_job_matches(get_job_index(), skills, k, min_score, job_ids=sorted(pending))
+        matches = sorted(matches + live, key=lambda match: (-match[1], match[0]))[:k]
+    
+    return matches
+
+def get_materialized_candidate_matches(job_id, k, min_score, seeker_ids=None):
+    """
+    Top k (seeker_id, score) tuples above min_score for a job, read from match_scores
+    
+    ``seeker_ids`` optionally restricts the candidates. Returns None while the job's column or a candidate seeker's
+    row is being recomputed, so the caller can score live instead.
+    """
+    if not match_scores_ready('job', job_id):
+        return None
+    
+    if pending_match_scores('seeker', seeker_ids if seeker_ids is not None else db.session.query(MatchScoreSeeker.seeker_id)):
+        return None
+    
+    query = db.session.query(MatchScore.seeker_id, MatchScore.score).filter(
+        MatchScore.job_id == job_id,
+        MatchScore.score > min_score
+    ).order_by(MatchScore.score.desc(), MatchScore.seeker_id)
+    
+    if seeker_ids is None:
+        return [(seeker_id, score) for seeker_id, score in query.limit(k).all()]
+    
+    # Stream the job's column in score order until k candidates are found
+    allowed = set(seeker_ids)
+    matches = []
+    for seeker_id, score in query.yield_per(1000):
+        if seeker_id in allowed:
+            matches.append((seeker_id, score))
+            if len(matches) == k:
+                break
+    return matches
+
+def get_materialized_match_page(user_id, query, limit, cursor=None, min_score=None):
+    """
+    One page of a Job query ordered by the seeker's match score, read through match_scores
+    
+    Returns ([(job, score)], next cursor), or None while the seeker's row or
+    the column of a job matching the query is being recomputed.
+    """
+    if not match_scores_ready('seeker', user_id):
+        return None
+    
+    if pending_match_scores('job', query.with_entities(Job.id).order_by(None)):
+        return None
+    
+    # Jobs without a row matched nothing
+    score = db.func.coalesce(MatchScore.score, 0.0)
+    query = query.outerjoin(MatchScore, db.and_(MatchScore.job_id == Job.id, MatchScore.seeker_id == user_id))
+    if min_score is not None:
+        query = query.filter(score >= min_score)
+    
+    rows, next_cursor = keyset_page(query, 'score', [(score, True), (Job.id, False)], limit, cursor)
+    return [(row[0], row[1]) for row in rows], next_cursor
+
+def search_jobs_page(query, rank, limit, cursor=None):
+    """
+    One page of a job search as {'jobs', 'nextCursor'} of encoded JSON
+    
+    Seekers with skills get their best matches first, and the cursor
+    carries the last match score so later pages are not re-ranked from
+    scratch. Other users get the most relevant jobs first when searching,
+    the newest otherwise.
+    """
+    skills = []
+    user_id = session.get('user_id')
+    if user_id is not None and User.query.get(user_id).user_type == 'jobSeeker':
+        skills = [skill.name for skill in Skill.query.filter_by(user_id=user_id).all()]
+    
+    if not skills:
+        if rank is not None:
+            rows, next_cursor = keyset_page(query, 'relevance', [rank, (Job.id, False)], limit, cursor)
+        else:
+            rows, next_cursor = keyset_page(query, 'recent', RECENT_JOB_KEYS, limit, cursor)
+        matches = [(row[0], None) for row in rows]
+    else:
+        min_match_score = request.args.get('minMatchScore', type=float)
+        
+        # Indexed read of the precomputed scores
+        page = get_materialized_match_page(user_id, query, limit, cursor, min_match_score)
+        
+        if page is None:
+            # Scores are cached per job, so later pages only pick from them again
+            jobs = {job.id: job for job in query.all()}
+            if not jobs:
+                scores = []
+            elif min_match_score is not None:
+                scores = find_top_job_matches(get_job_index(), skills, len(jobs), min_match_score, list(jobs))
+            else:
+                scores = list(zip(jobs, get_cached_match_scores(skills, list(jobs.values()))))
+            
+            scored, next_cursor = page_by_score(scores, limit, cursor)
+            page = [(jobs[job_id], score) for job_id, score in scored], next_cursor
+        
+        matches, next_cursor = page
+    
+    return {
+        'jobs': job_fragments.encode_list([job for job, _ in matches], [score for _, score in matches]),
+        'nextCursor': app.json.dumps(next_cursor)
+    }
+
+# Query parameters a job search response depends on, apart from the user
+SEARCH_PARAMS = (
+    'search', 'jobType', 'location', 'experienceLevel', 'remote', 'facets',
+    'limit', 'cursor', 'near', 'lat', 'lng', 'radiusKm'
+)
+
+def search_cache_variant():
+    """Shared-cache variant of the current user's job searches, None if they get personal match scores"""
+    user_id = session.get('user_id')
+    if user_id is None:
+        return 'anonymous'
+    
+    user = User.query.get(user_id)
+    if user.user_type == 'jobSeeker' and Skill.query.filter_by(user_id=user_id).first() is not None:
+        return None
+    return 'member'
+
+def cached_json(payload, cache_key):
+    """Response of an encoded JSON payload, also stored under a result cache key"""
+    payload = payload.encode('utf-8')
+    result_cache.set(cache_key, payload)
+    return json_response(payload)
 
 @app.route('/api/jobs', methods=['GET'])
 def search_jobs():
+    # Browsing without match scores is served from the result cache
+    cache_key = None
+    variant = search_cache_variant()
+    if variant is not None:
+        # Job writes of other workers only reach an in-process cache through the jobs table
+        if not result_cache.shared:
+            result_cache.check(job_corpus_signature())
+        payload, cache_key = result_cache.get('jobs', variant + '\x1d' + canonical_params(request.args, SEARCH_PARAMS))
+        if payload is not None:
+            return json_response(payload)
+    
     # Get query parameters
     search = request.args.get('search', '')
     job_type = request.args.getlist('jobType')
@@ -420,13 +1914,10 @@ def search_jobs():
     # Build query
     query = Job.query.filter_by(is_active=True)
     
-    # Apply filters
+    # Apply filters, full-text matches come most relevant first
+    rank = None
     if search:
-        query = query.filter(
-            (Job.title.ilike(f'%{search}%')) |
-            (Job.company.ilike(f'%{search}%')) |
-            (Job.description.ilike(f'%{search}%'))
-        )
+        query, rank = job_search.apply(query, Job, search)
     
     if job_type:
         query = query.filter(Job.type.in_(job_type))
@@ -435,19 +1926,57 @@ def search_jobs():
         location_filters = []
         for loc in location:
             location_filters.append(Job.location.ilike(f'%{loc}%'))
+        
+        # "NYC" also finds jobs in "New York, NY"
+        resolved = {resolve_location_id(loc) for loc in location} - {None}
+        if resolved:
+            location_filters.append(Job.id.in_(db.session.query(JobLocation.job_id).filter(JobLocation.location_id.in_(resolved))))
         query = query.filter(db.or_(*location_filters))
     
+    # Jobs within a radius of a place or point
+    near = geo_args()
+    if near is not None:
+        query = query.filter(Job.id.in_(jobs_within(*near)))
+    
     if experience_level:
         query = query.filter(Job.experience_level.in_(experience_level))
     
     if remote:
         query = query.filter(Job.is_remote == True)
     
+    # Cursor-paginated results, with the filter counts if asked for
+    include_facets = request.args.get('facets', '').lower() == 'true'
+    page = page_args()
+    if page is None and include_facets:
+        page = (app.config['JOBS_PAGE_SIZE'], None)
+    if page is not None:
+        result = search_jobs_page(query, rank, *page)
+        if include_facets:
+            result['facets'] = app.json.dumps(search_facets(search, {
+                'jobType': job_type,
+                'location': location_matcher(location) if location else None,
+                'experienceLevel': experience_level,
+                'remote': remote
+            }, near))
+        return cached_json(encode_object(result), cache_key)
+    
+    if rank is not None:
+        expression, descending = rank
+        query = query.order_by(expression.desc() if descending else expression, Job.id)
+    
+    # Without match scores to sort by, jobs are sent as they are read from a server-side cursor,
+    # with a null matchScore like the paginated responses
+    batch_size = app.config['JOBS_STREAM_BATCH']
+    if variant is not None:
+        return stream_json(job_fragments.encode_chunks(
+            query.yield_per(batch_size), itertools.repeat(None), batch_size
+        ), cache_key)
+    
     # Get results
     jobs = query.all()
     
-    # Convert to dict
-    jobs_data = [job.to_dict() for job in jobs]
+    # For anonymous users, employers and seekers without skills, scores are None
+    match_scores = [None] * len(jobs)
     
     # If user is logged in, calculate match scores
     if 'user_id' in session:
@@ -459,31 +1988,92 @@ def search_jobs():
             skills = [skill.name for skill in Skill.query.filter_by(user_id=user_id).all()]
             
             if skills:  # Only calculate scores if user has skills
-                # Get job descriptions
-                job_descriptions = [job.description for job in jobs]
+                min_match_score = request.args.get('minMatchScore', type=float)
                 
-                # Calculate match scores for all jobs at once
-                match_scores = calculate_seeker_to_jobs_scores(word2vec_model, skills, job_descriptions)
+                # Precomputed scores from match_scores, if the seeker's row is up to date
+                match_scores = get_materialized_match_scores(user_id, skills, jobs)
                 
-                # Add scores to job data
-                for job_data, score in zip(jobs_data, match_scores):
-                    job_data['matchScore'] = score
+                if match_scores is not None:
+                    if min_match_score is not None:
+                        scored = [(job, score) for job, score in zip(jobs, match_scores) if score >= min_match_score]
+                        jobs = [job for job, _ in scored]
+                        match_scores = [score for _, score in scored]
+                elif min_match_score is not None:
+                    # Only jobs that can reach the threshold get fully scored
+                    matches = dict(find_top_job_matches(
+                        get_job_index(), skills, len(jobs), min_match_score, [job.id for job in jobs]
+                    ))
+                    jobs = [job for job in jobs if job.id in matches]
+                    match_scores = [matches[job.id] for job in jobs]
+                else:
+                    # Calculate match scores for all jobs at once, reusing cached ones
+                    match_scores = get_cached_match_scores(skills, jobs)
                 
                 # Sort by match score (highest first)
-                jobs_data.sort(key=lambda x: x.get('matchScore', 0), reverse=True)
-            else:
-                # If no skills, set all scores to None
-                for job_data in jobs_data:
-                    job_data['matchScore'] = None
-        else:
-            # For employers or non-logged in users, set scores to None
-            for job_data in jobs_data:
-                job_data['matchScore'] = None
+                scored = sorted(zip(jobs, match_scores), key=lambda pair: pair[1], reverse=True)
+                jobs = [job for job, _ in scored]
+                match_scores = [score for _, score in scored]
+    
+    return stream_json(job_fragments.encode_chunks(jobs, match_scores, batch_size), cache_key)
+
+@app.route('/api/jobs/suggest', methods=['GET'])
+def suggest_jobs():
+    """Job titles, companies and skills starting with what was typed into the search box"""
+    limit = request.args.get('limit', app.config['SUGGEST_LIMIT'], type=int)
+    kinds = [kind for kind in request.args.getlist('type') if kind in SUGGEST_KINDS]
+    
+    suggestions = get_suggest_index().suggest(
+        request.args.get('q', ''),
+        min(max(limit, 1), app.config['SUGGEST_MAX_LIMIT']),
+        kinds
+    )
+    return jsonify(suggestions), 200
+
+def job_detail_validators(job_id, viewer_id):
+    """
+    (ETag, Last-Modified) of a job's detail as seen by a user, None when it cannot be validated
+    
+    A seeker's match score is versioned by their skills and the stored
+    match_scores rows; scores computed live (row pending, inactive job)
+    depend on the in-memory index and are not validated. Seekers get no
+    Last-Modified as removing a skill moves no timestamp.
+    """
+    employer_id = db.select(Job.employer_id).where(Job.id == job_id).scalar_subquery()
+    (job_version, is_active, applications, last_applied, profile_version, viewer_type, skills, last_skill,
+     seeker_status, seeker_version, job_status, job_scores_version) = row_versions(
+        db.select(row_version(Job)).where(Job.id == job_id),
+        db.select(Job.is_active).where(Job.id == job_id),
+        db.select(db.func.count(JobApplication.id)).where(JobApplication.job_id == job_id),
+        db.select(db.func.max(JobApplication.created_at)).where(JobApplication.job_id == job_id),
+        db.select(db.func.max(row_version(Profile))).where(Profile.user_id == employer_id),
+        db.select(User.user_type).where(User.id == viewer_id),
+        db.select(db.func.count(Skill.id)).where(Skill.user_id == viewer_id),
+        db.select(db.func.max(Skill.id)).where(Skill.user_id == viewer_id),
+        db.select(MatchScoreSeeker.status).where(MatchScoreSeeker.seeker_id == viewer_id),
+        db.select(MatchScoreSeeker.updated_at).where(MatchScoreSeeker.seeker_id == viewer_id),
+        db.select(MatchScoreJob.status).where(MatchScoreJob.job_id == job_id),
+        db.select(MatchScoreJob.updated_at).where(MatchScoreJob.job_id == job_id)
+    )
+    if job_version is None:
+        return None
     
-    return jsonify(jobs_data), 200
+    versions = (job_id, job_version, applications, last_applied, profile_version)
+    if viewer_type != 'jobSeeker' or not job_index:
+        return version_etag(*versions), max(filter(None, (job_version, last_applied, profile_version)))
+    
+    if skills and (not is_active or seeker_status != 'ready' or job_status == 'pending'):
+        return None
+    return version_etag(*versions, viewer_id, skills, last_skill, seeker_version, job_scores_version), None
 
 @app.route('/api/jobs/<int:job_id>', methods=['GET'])
 def get_job(job_id):
+    # Polling clients are answered from the row versions alone
+    validators = job_detail_validators(job_id, session.get('user_id'))
+    if validators is not None:
+        response = not_modified(*validators)
+        if response is not None:
+            return response
+    
     job = Job.query.get(job_id)
     
     if not job:
@@ -503,8 +2093,8 @@ def get_job(job_id):
         'companyWebsite': employer_profile.company_website
     })
     
-    # If user is logged in, calculate match score with the Word2Vec model
-    if 'user_id' in session and word2vec_model:
+    # If user is logged in, calculate match score against the job index
+    if 'user_id' in session:
         user_id = session['user_id']
         user = User.query.get(user_id)
         
@@ -512,9 +2102,11 @@ def get_job(job_id):
             # Get user's skills
             skills = [skill.name for skill in Skill.query.filter_by(user_id=user_id).all()]
             
-            # Calculate match score
-            match_score = calculate_match_score(word2vec_model, skills, job.description)
-            job_data['matchScore'] = match_score
+            # Read the precomputed match score, or calculate it reusing a cached one
+            match_scores = get_materialized_match_scores(user_id, skills, [job])
+            if match_scores is None:
+                match_scores = get_cached_match_scores(skills, [job])
+            job_data['matchScore'] = match_scores[0]
     
     return jsonify(job_data), 200
 
@@ -536,6 +2128,12 @@ def update_job(job_id):
     
     data = request.json
     
+    # Remember what the matching index depends on
+    previous_description = job.description
+    previous_requirements = job.requirements
+    previous_location = job.location
+    was_active = job.is_active
+    
     # Update job fields
     job.title = data.get('title', job.title)
     job.company = data.get('company', job.company)
@@ -555,8 +2153,39 @@ def update_job(job_id):
     job.is_draft = data.get('isDraft', job.is_draft)
     job.updated_at = datetime.utcnow()
     
+    # Re-vectorize and re-score only if the description or visibility changed
+    rescore = job.description != previous_description or job.is_active != was_active
+    if rescore:
+        mark_match_scores_pending(job_id=job.id)
+    
+    # Normalize a changed description once for matching, and re-extract skills if the text changed
+    skills_changed = job.description != previous_description or job.requirements != previous_requirements
+    job_text = None
+    if job.description != previous_description:
+        job_text = save_job_text(job)
+    elif rescore or skills_changed:
+        stored = db.session.get(JobText, job.id)
+        job_text = stored.text if stored else save_job_text(job)
+    
+    job_skills = save_job_skills(job, job_text) if skills_changed else None
+    if job.location != previous_location:
+        save_job_location(job)
+    
     db.session.commit()
     
+    write = record_job_write('update', job.id, job.updated_at)
+    if rescore:
+        score_cache.invalidate_job(job.id)
+        sync_job_index(write, job_text, job.is_active)
+        schedule_match_scores(job_id=job.id)
+    else:
+        refresh_job_index_signature(write)
+        if job_skills is not None and job.id in job_skill_sets.sets:
+            job_skill_sets.set(job.id, job_skills)
+    sync_facet_index(write, job)
+    sync_suggest_index(write, job, job_skills)
+    result_cache.bump()
+    
     return jsonify({'message': 'Job updated successfully'}), 200
 
 @app.route('/api/jobs/<int:job_id>', methods=['DELETE'])
@@ -575,13 +2204,27 @@ def delete_job(job_id):
     if job.employer_id != user_id:
         return jsonify({'error': 'You can only delete your own job postings'}), 403
     
-    # Delete job applications first
+    # Delete job applications and match scores first
     JobApplication.query.filter_by(job_id=job_id).delete()
+    MatchScore.query.filter_by(job_id=job_id).delete()
+    MatchScoreJob.query.filter_by(job_id=job_id).delete()
+    JobText.query.filter_by(job_id=job_id).delete()
+    JobSkill.query.filter_by(job_id=job_id).delete()
+    JobLocation.query.filter_by(job_id=job_id).delete()
     
     # Delete job
+    updated_at = job.updated_at
     db.session.delete(job)
     db.session.commit()
     
+    # Drop the job from the matching index and its cached scores
+    write = record_job_write('delete', job_id, updated_at)
+    score_cache.invalidate_job(job_id)
+    sync_job_index(write)
+    sync_facet_index(write)
+    sync_suggest_index(write)
+    result_cache.bump()
+    
     return jsonify({'message': 'Job deleted successfully'}), 200
 
 @app.route('/api/recommendations/jobs', methods=['GET'])
@@ -602,40 +2245,54 @@ def get_job_recommendations():
     if not skills:
         return jsonify({'error': 'Please add skills to your profile to get recommendations'}), 400
     
-    # Get all active jobs
-    jobs = Job.query.filter_by(is_active=True).all()
-    
-    if not jobs:
-        return jsonify([]), 200
-    
-    # If Word2Vec model is not loaded
-    if not word2vec_model:
-        # Fallback to random recommendations
-        import random
-        recommended_jobs = random.sample(jobs, min(5, len(jobs)))
-        job_data = [job.to_dict() for job in recommended_jobs]
-        for data in job_data:
-            data['matchScore'] = random.randint(70, 95)
-        return jsonify(job_data), 200
-    
-    # Calculate match scores for all jobs
-    job_scores = []
-    for job in jobs:
-        score = calculate_match_score(word2vec_model, skills, job.description)
-        job_scores.append((job, score))
-    
-    # Sort by match score (highest first)
-    job_scores.sort(key=lambda x: x[1], reverse=True)
+    # Number of recommendations (default 10) and optional minimum match score
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+    min_score = request.args.get('minScore', type=float)
+    
+    # Optionally only jobs sharing enough canonical skills with the seeker are scored
+    candidate_ids = None
+    min_overlap, min_jaccard = skill_prefilter_args()
+    if min_overlap > 0 or min_jaccard > 0:
+        candidate_ids = get_job_skill_sets().candidates(get_skill_dictionary().ids(skills), min_overlap, min_jaccard)
+    
+    # Optionally only jobs near the seeker's locations (and remote ones)
+    within_km = request.args.get('withinKm', app.config['GEO_PREFILTER_RADIUS_KM'], type=float)
+    if within_km > 0:
+        nearby = nearby_job_ids(user_id, within_km)
+        if nearby is not None:
+            candidate_ids = nearby if candidate_ids is None else sorted(set(candidate_ids) & set(nearby))
+    
+    if request.args.get('strategy') == 'semantic' and get_embedding_store():
+        # Nearest jobs to the seeker's skills in embedding space
+        top_recommendations = find_similar_items(
+            embedding_store.jobs, embedding_store.document_vector(' '.join(skills)), limit, min_score, ids=candidate_ids
+        )
+    else:
+        # Indexed read of the precomputed scores
+        top_recommendations = get_materialized_job_matches(user_id, skills, limit, min_score, candidate_ids)
+        
+        if top_recommendations is None:
+            # Top-k retrieval, only jobs that can reach the top get fully scored
+            top_recommendations = find_top_job_matches(
+                get_job_index(), skills, limit, min_score, job_ids=candidate_ids, scorer=parallel_scorer
+            )
     
-    # Get top recommendations (limit to 10)
-    top_recommendations = job_scores[:10]
+    # Load the recommended jobs in one query
+    jobs = {job.id: job for job in Job.query.filter(Job.id.in_([job_id for job_id, _ in top_recommendations])).all()}
     
     # Prepare response data
     recommendations_data = []
-    for job, score in top_recommendations:
+    for job_id, score in top_recommendations:
+        job = jobs.get(job_id)
+        if not job or not job.is_active:
+            continue
         job_data = job.to_dict()
         job_data['matchScore'] = score
         recommendations_data.append(job_data)
+        
+        # Warm the cache for the job detail view
+        if request.args.get('strategy') != 'semantic':
+            score_cache.set((skills_hash(skills), job.id, job.updated_at), score)
     
     return jsonify(recommendations_data), 200
 
@@ -656,57 +2313,69 @@ def get_candidate_recommendations(job_id):
     if job.employer_id != user_id:
         return jsonify({'error': 'You can only view candidates for your own job postings'}), 403
     
-    # Get all job seekers
-    job_seekers = User.query.filter_by(user_type='jobSeeker').all()
-    
-    if not job_seekers:
-        return jsonify([]), 200
-    
-    # If Word2Vec model is not loaded
-    if not word2vec_model:
-        # Fallback to random recommendations
-        import random
-        recommended_seekers = random.sample(job_seekers, min(5, len(job_seekers)))
-        seeker_data = []
-        for seeker in recommended_seekers:
-            profile = Profile.query.filter_by(user_id=seeker.id).first()
-            seeker_data.append({
-                'id': seeker.id,
-                'fullName': seeker.full_name,
-                'title': profile.title,
-                'location': profile.location,
-                'skills': [skill.name for skill in Skill.query.filter_by(user_id=seeker.id).all()],
-                'matchScore': random.randint(70, 95)
-            })
-        return jsonify(seeker_data), 200
-    
-    # Calculate match scores for all job seekers
-    seeker_scores = []
-    for seeker in job_seekers:
-        # Get skills for this seeker
-        skills = [skill.name for skill in Skill.query.filter_by(user_id=seeker.id).all()]
+    # Optionally only seekers sharing enough canonical skills with the job are scored
+    candidate_ids = None
+    min_overlap, min_jaccard = skill_prefilter_args()
+    if min_overlap > 0 or min_jaccard > 0:
+        job_skill_ids = get_job_skill_sets().sets.get(job.id)
+        if job_skill_ids is None:
+            # Inactive jobs are not indexed
+            job_skill_ids = get_skill_dictionary().extract(
+                f"{preprocess_text(job.description)} {requirements_text(job.requirements)}"
+            )
+        candidate_ids = get_seeker_skill_sets().candidates(job_skill_ids, min_overlap, min_jaccard)
+    
+    # Optionally only seekers near the job's location
+    within_km = request.args.get('withinKm', app.config['GEO_PREFILTER_RADIUS_KM'], type=float)
+    if within_km > 0:
+        nearby = nearby_seeker_ids(job, within_km)
+        if nearby is not None:
+            candidate_ids = nearby if candidate_ids is None else sorted(set(candidate_ids) & set(nearby))
+    
+    if request.args.get('strategy') == 'semantic' and get_embedding_store():
+        # Nearest seekers to the job description in embedding space
+        job_vector = embedding_store.jobs.get(job.id)
+        if job_vector is None:
+            job_vector = embedding_store.document_vector(job.description)
+        top_recommendations = [
+            (seeker_id, score)
+            for seeker_id, score in find_similar_items(embedding_store.seekers, job_vector, 10, ids=candidate_ids)
+            if score > 50
+        ]
+    else:
+        # Indexed read of the precomputed scores, seekers with decent match (limit to 10)
+        top_recommendations = get_materialized_candidate_matches(job.id, 10, 50, candidate_ids)
         
-        if skills:  # Only include seekers with skills
-            score = calculate_match_score(word2vec_model, skills, job.description)
-            if score > 50:  # Only include seekers with decent match
-                seeker_scores.append((seeker, score))
-    
-    # Sort by match score (highest first)
-    seeker_scores.sort(key=lambda x: x[1], reverse=True)
+        if top_recommendations is None:
+            # Score the job against every seeker with skills in one sparse product
+            seeker_scores = calculate_job_to_seekers_scores(
+                get_job_index(), get_seeker_index(), job.description, job.id, candidate_ids
+            )
+            
+            # Only include seekers with decent match, top recommendations (limit to 10)
+            top_recommendations = [(seeker_id, score) for seeker_id, score in seeker_scores if score > 50][:10]
     
-    # Get top recommendations (limit to 10)
-    top_recommendations = seeker_scores[:10]
+    # Load the recommended seekers and their profiles in bulk
+    seeker_ids = [seeker_id for seeker_id, _ in top_recommendations]
+    seekers = {seeker.id: seeker for seeker in User.query.filter(User.id.in_(seeker_ids)).all()}
+    profiles = {profile.user_id: profile for profile in Profile.query.filter(Profile.user_id.in_(seeker_ids)).all()}
+    skills_by_seeker = {}
+    for skill in Skill.query.filter(Skill.user_id.in_(seeker_ids)).order_by(Skill.id).all():
+        skills_by_seeker.setdefault(skill.user_id, []).append(skill.name)
     
     # Prepare response data
     recommendations_data = []
-    for seeker, score in top_recommendations:
-        profile = Profile.query.filter_by(user_id=seeker.id).first()
+    for seeker_id, score in top_recommendations:
+        seeker = seekers.get(seeker_id)
+        if not seeker:
+            continue
+        profile = profiles.get(seeker_id)
         recommendations_data.append({
             'id': seeker.id,
             'fullName': seeker.full_name,
-            'title': profile.title,
-            'location': profile.location,
-            'skills': [skill.name for skill in Skill.query.filter_by(user_id=seeker.id).all()],
+            'title': profile.title if profile else None,
+            'location': profile.location if profile else None,
+            'skills': skills_by_seeker.get(seeker_id, []),
             'matchScore': score
         })
     
@@ -754,7 +2423,15 @@ def apply_for_job(job_id):
     )
     
     db.session.add(new_application)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent submit of the same application won the unique index
+        db.session.rollback()
+        return jsonify({'error': 'You have already applied for this job'}), 400
+    
+    # Cached job listings show the applications count
+    result_cache.bump()
     
     return jsonify({'message': 'Application submitted successfully'}), 201
 
@@ -770,14 +2447,27 @@ def get_user_applications():
     if user.user_type != 'jobSeeker':
         return jsonify({'error': 'Only job seekers can access this endpoint'}), 403
     
-    # Get all applications submitted by the user
-    applications = JobApplication.query.filter_by(applicant_id=user_id).all()
+    # Polling clients are answered from the versions of the applications, their jobs and employers
+    applied_jobs = db.select(JobApplication.job_id).where(JobApplication.applicant_id == user_id)
+    response = not_modified(version_etag(user_id, *row_versions(
+        db.select(db.func.count(JobApplication.id)).where(JobApplication.applicant_id == user_id),
+        db.select(db.func.max(row_version(JobApplication))).where(JobApplication.applicant_id == user_id),
+        db.select(db.func.max(row_version(Job))).where(Job.id.in_(applied_jobs)),
+        db.select(db.func.max(row_version(Profile))).join(Job, Job.employer_id == Profile.user_id).where(Job.id.in_(applied_jobs))
+    )), weak=True)
+    if response is not None:
+        return response
+    
+    # Get all applications submitted by the user, with their jobs and employers in the same query
+    applications = JobApplication.query.filter_by(applicant_id=user_id).options(
+        db.joinedload(JobApplication.job).joinedload(Job.employer).joinedload(User.profile)
+    ).all()
     
     # Prepare response data
     applications_data = []
     for application in applications:
-        job = Job.query.get(application.job_id)
-        employer = User.query.get(job.employer_id)
+        job = application.job
+        employer = job.employer
         
         application_data = application.to_dict()
         application_data.update({
@@ -808,13 +2498,15 @@ def get_job_applications(job_id):
     if job.employer_id != user_id:
         return jsonify({'error': 'You can only view applications for your own job postings'}), 403
     
-    # Get all applications for this job
-    applications = JobApplication.query.filter_by(job_id=job_id).all()
+    # Get all applications for this job, with their applicants in the same query
+    applications = JobApplication.query.filter_by(job_id=job_id).options(
+        db.joinedload(JobApplication.applicant).joinedload(User.profile)
+    ).all()
     
     # Prepare response data
     applications_data = []
     for application in applications:
-        applicant = User.query.get(application.applicant_id)
+        applicant = application.applicant
         
         application_data = application.to_dict()
         application_data.update({
@@ -863,6 +2555,23 @@ def update_application_status(application_id):
     
     return jsonify({'message': 'Application status updated successfully'}), 200
 
+@app.route('/api/stats/cache', methods=['GET'])
+def get_cache_stats():
+    """Hit/miss/eviction counters for sizing the in-process caches"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    # Operators only, the counters hint at what other users search
+    user = User.query.get(session['user_id'])
+    if user is None or user.email.lower() not in app.config['STATS_USER_EMAILS']:
+        return jsonify({'error': 'Only operators can access this endpoint'}), 403
+    
+    return jsonify({
+        'matchScores': score_cache.stats(),
+        'jobSearches': result_cache.stats(),
+        'jobFragments': job_fragments.stats()
+    }), 200
+
 @app.route('/uploads/<path:filename>')
 def download_file(filename):
     """Serve uploaded files"""
@@ -9,6 +9,17 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///careerconnect.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Database engine tuning, chosen by the URL scheme (see utils/db_tuning.py)
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')  # Postgres read replica for GET requests, optional
+    DB_POOL_SIZE = 10  # Postgres connections kept open per worker process
+    DB_MAX_OVERFLOW = 10  # Extra connections opened under load, closed when returned
+    DB_POOL_TIMEOUT = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE = 30 * 60  # seconds, reconnect before server/proxy idle timeouts
+    DB_STATEMENT_TIMEOUT_MS = 30000  # Postgres statement timeout, lifted for migrations
+    SQLITE_BUSY_TIMEOUT_MS = 5000  # Wait this long for another connection's write lock
+    SQLITE_MMAP_SIZE = 256 * 1024 * 1024  # bytes of the database file read through mmap
+    SQLITE_CACHE_SIZE_KB = 64 * 1024  # Page cache per connection
+    
     # Session configuration
     PERMANENT_SESSION_LIFETIME = timedelta(days=7)
     SESSION_COOKIE_NAME = 'careerconnect_session'
@@ -21,6 +32,67 @@ class Config:
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
     MAX_CONTENT_LENGTH = 5 * 1024 * 1024  # 5MB max upload
     
+    # Cursor pagination of job listings (when a limit or cursor is given)
+    JOBS_PAGE_SIZE = 20
+    JOBS_MAX_PAGE_SIZE = 100
+    
+    # Location normalization and radius search
+    GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'gazetteer.csv')
+    GEO_DEFAULT_RADIUS_KM = 50  # Radius of a search near a place when none is given
+    GEO_PREFILTER_RADIUS_KM = 0  # Recommendation candidates within this distance of the seeker/job, 0 disables
+    
+    # Matching index configuration
+    MATCH_INDEX_REFIT_RATIO = 0.2  # Refit TF-IDF once 20% of the job corpus has changed
+    MATCH_INDEX_NEW_TERM_REFIT_MAX_JOBS = 2000  # Also refit on every job bringing new words up to this many jobs
+    MATCH_INDEX_MAX_AGE = 15 * 60  # Resync the index from the database at least this often (seconds)
+    
+    # Search box suggestions
+    SUGGEST_REFRESH_INTERVAL = 30  # Check for other workers' job writes at most this often (seconds)
+    SUGGEST_LIMIT = 10
+    SUGGEST_MAX_LIMIT = 25
+    
+    # Response compression and streaming of unpaginated job listings
+    RESPONSE_COMPRESSION_LEVEL = 6  # zlib level of gzip/deflate responses, 1 fastest to 9 smallest
+    RESPONSE_COMPRESSION_MIN_BYTES = 1024  # Smaller responses are sent as is
+    JOBS_STREAM_BATCH = 500  # Jobs read from the database cursor and sent per chunk
+    
+    # Encoded job payloads spliced into listings
+    JOB_FRAGMENT_CACHE_MAX_ENTRIES = 50000
+    
+    # Serialized job search responses of anonymous and non-matching users
+    # e.g. redis://localhost:6379/0 to share between workers, in-process if unset; a Redis URL
+    # needs the optional redis package (pip install redis), which is not in requirements.txt
+    RESULT_CACHE_URL = os.environ.get('RESULT_CACHE_URL')
+    RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024  # In-process cache size
+    RESULT_CACHE_TTL = 60  # seconds, also bounds how stale another worker's in-process cache can be
+    
+    # Match score cache configuration
+    SCORE_CACHE_MAX_ENTRIES = 100000
+    SCORE_CACHE_TTL = 10 * 60  # seconds
+    
+    # Users allowed to read the cache counters of /api/stats/cache, comma-separated emails (nobody if unset)
+    STATS_USER_EMAILS = [email.strip().lower() for email in os.environ.get('STATS_USER_EMAILS', '').split(',') if email.strip()]
+    
+    # Approximate nearest neighbour (IVF) configuration for embeddings
+    ANN_NPROBE = 8  # Lists scanned per query, higher is slower but more accurate
+    ANN_MIN_TRAIN_SIZE = 1024  # Search exhaustively below this many vectors
+    ANN_INDEX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'ann')
+    
+    # Multi-process scoring of large match batches
+    PARALLEL_SCORING_MIN_JOBS = 50000  # Shard scoring across processes from this many jobs per call
+    PARALLEL_SCORING_PROCESSES = 0  # Worker processes per web worker, 0 uses every core
+    
+    # Skill-overlap prefilter for recommendation candidates (overridable per request)
+    SKILL_PREFILTER_MIN_OVERLAP = 0  # Shared canonical skills required, 0 disables
+    SKILL_PREFILTER_MIN_JACCARD = 0.0  # Jaccard similarity of the skill sets required, 0 disables
+    SKILL_EXTRACTION_BATCH = 1000  # Jobs tagged per transaction when new skills enter the dictionary
+    SKILL_DICTIONARY_LEARN = False  # Add seekers' unknown skills as new terms (tagging jobs in the background), curated terms only if False
+    
+    # Materialized match_scores table configuration
+    MATCH_SCORES_BACKGROUND = True  # Recompute rows/columns in a background thread, inline if False
+    MATCH_SCORES_REBUILD_BATCH = 200  # Job columns written per transaction by the nightly rebuild
+    MATCH_SCORES_PENDING_TIMEOUT = 10 * 60  # seconds before a read reschedules a row/column still pending (its task was lost)
+    
     # Ensure upload directory exists
     os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
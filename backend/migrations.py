@@ -0,0 +1,152 @@
+"""
+Versioned schema changes for databases created by earlier releases
+
+db.create_all() creates missing tables with their indexes but never
+alters a table that already exists. Each migration here brings such tables
+up to date and is recorded in schema_migrations, so it runs once per
+database. Migrations must be idempotent: a fresh database already has what
+create_all made, and workers starting at the same time may both run one.
+"""
+from datetime import datetime
+
+import sqlalchemy as sa
+
+from models import SchemaMigration, Profile, Skill, JobPreference, Experience, Education, Job, JobApplication
+from utils.db_tuning import without_statement_timeout
+
+# Tables of the curated index set, whose indexes are declared in models.py
+INDEXED_MODELS = (Profile, Skill, JobPreference, Experience, Education, Job, JobApplication)
+
+def curated_indexes():
+    return [index for model in INDEXED_MODELS for index in model.__table__.indexes]
+
+def create_indexes(connection, *models):
+    for model in models:
+        for index in model.__table__.indexes:
+            index.create(connection, checkfirst=True)
+
+def job_listing_indexes(connection):
+    create_indexes(connection, Job)
+
+def production_indexes(connection):
+    # Replaced by the unique index below
+    connection.execute(sa.text('DROP INDEX IF EXISTS ix_job_applications_job_applicant'))
+
+    # Duplicate applications (from concurrent submits) would fail the unique index
+    archive_duplicate_applications(connection)
+
+    create_indexes(connection, *INDEXED_MODELS)
+
+def archive_duplicate_applications(connection):
+    """
+    Move all but the first application of each job and applicant to job_application_duplicates
+
+    The moved rows keep every column, plus when they were archived, and
+    each one is logged with the application kept in its place.
+    """
+    applications = JobApplication.__table__
+    first_ids = sa.select(
+        applications.c.job_id, applications.c.applicant_id, sa.func.min(applications.c.id).label('id')
+    ).group_by(applications.c.job_id, applications.c.applicant_id).having(sa.func.count() > 1).subquery()
+    duplicates = connection.execute(
+        sa.select(applications, first_ids.c.id.label('kept_id')).join(first_ids, sa.and_(
+            applications.c.job_id == first_ids.c.job_id,
+            applications.c.applicant_id == first_ids.c.applicant_id,
+            applications.c.id != first_ids.c.id
+        )).order_by(applications.c.id)
+    ).mappings().all()
+    if not duplicates:
+        return
+
+    archive = duplicate_applications_table()
+    archive.create(connection, checkfirst=True)
+    archived_at = datetime.utcnow()
+    connection.execute(archive.insert(), [
+        {**{column.name: row[column.name] for column in applications.columns}, 'archived_at': archived_at}
+        for row in duplicates
+    ])
+    connection.execute(applications.delete().where(applications.c.id.in_([row['id'] for row in duplicates])))
+
+    for row in duplicates:
+        print(
+            f"Archived duplicate application {row['id']} of user {row['applicant_id']} to job {row['job_id']} "
+            f"to job_application_duplicates, keeping application {row['kept_id']}"
+        )
+
+def duplicate_applications_table():
+    """Job applications removed by archive_duplicate_applications(), with the time they were archived"""
+    return sa.Table(
+        'job_application_duplicates', sa.MetaData(),
+        *[sa.Column(column.name, column.type) for column in JobApplication.__table__.columns],
+        sa.Column('archived_at', sa.DateTime)
+    )
+
+def match_score_models(connection):
+    columns = {column['name'] for column in sa.inspect(connection).get_columns('match_score_jobs')}
+    if 'model' not in columns:
+        # Columns scored before are treated as scored with another fit
+        connection.execute(sa.text('ALTER TABLE match_score_jobs ADD COLUMN model VARCHAR(40)'))
+
+# (version, name, function of a connection), applied in order
+MIGRATIONS = [
+    (1, 'Job search and listing indexes', job_listing_indexes),
+    (2, 'Production index set', production_indexes),
+    (3, 'Job index fit of match score columns', match_score_models),
+]
+
+def applied_versions(engine):
+    with engine.connect() as connection:
+        return {version for (version,) in connection.execute(sa.select(SchemaMigration.version))}
+
+def run_migrations(engine):
+    """Apply the migrations this database has not had yet, returns their versions"""
+    SchemaMigration.__table__.create(engine, checkfirst=True)
+    applied = applied_versions(engine)
+
+    done = []
+    for version, name, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        try:
+            with engine.begin() as connection:
+                # Index builds and backfills on large tables outlast the request statement timeout
+                without_statement_timeout(connection)
+                migrate(connection)
+                connection.execute(SchemaMigration.__table__.insert(), {
+                    'version': version, 'name': name, 'applied_at': datetime.utcnow()
+                })
+            done.append(version)
+        except Exception as e:
+            # Another worker may have applied it first; later migrations may depend on this one
+            print(f"Error applying migration {version} ({name}): {e}")
+            if version not in applied_versions(engine):
+                break
+    return done
+
+def run_data_migrations(engine, migrations):
+    """
+    Apply the data migrations this database has not had yet, returns their versions
+
+    Data migrations, (version, name, function of no arguments), fill in
+    rows through the application's session (normalizer, skill dictionary,
+    gazetteer) and commit their own batches; a version is recorded once its
+    function has returned. Their versions are kept apart from MIGRATIONS'.
+    """
+    SchemaMigration.__table__.create(engine, checkfirst=True)
+    applied = applied_versions(engine)
+
+    done = []
+    for version, name, migrate in migrations:
+        if version in applied:
+            continue
+        migrate()
+        try:
+            with engine.begin() as connection:
+                connection.execute(SchemaMigration.__table__.insert(), {
+                    'version': version, 'name': name, 'applied_at': datetime.utcnow()
+                })
+            done.append(version)
+        except Exception as e:
+            # Another worker ran it at the same time
+            print(f"Error recording data migration {version} ({name}): {e}")
+    return done
@@ -1,8 +1,9 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 import json
+from utils.db_tuning import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class User(db.Model):
   __tablename__ = 'users'
@@ -28,7 +29,7 @@ class Profile(db.Model):
   __tablename__ = 'profiles'
   
   id = db.Column(db.Integer, primary_key=True)
-  user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+  user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
   
   # Job seeker fields
   title = db.Column(db.String(255))
@@ -61,15 +62,47 @@ class Skill(db.Model):
   __tablename__ = 'skills'
   
   id = db.Column(db.Integer, primary_key=True)
-  user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+  user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
   name = db.Column(db.String(100), nullable=False)
   created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+class SkillTerm(db.Model):
+  __tablename__ = 'skill_terms'
+  
+  # Canonical skill dictionary, names are stored normalized (preprocess_text)
+  id = db.Column(db.Integer, primary_key=True)
+  name = db.Column(db.String(100), unique=True, nullable=False)
+  created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class SkillAlias(db.Model):
+  __tablename__ = 'skill_aliases'
+  
+  id = db.Column(db.Integer, primary_key=True)
+  alias = db.Column(db.String(100), unique=True, nullable=False)  # normalized, e.g. 'js'
+  term_id = db.Column(db.Integer, db.ForeignKey('skill_terms.id'), nullable=False)
+
+class Location(db.Model):
+  __tablename__ = 'locations'
+  
+  # Canonical places of the bundled gazetteer that free-text locations resolve to
+  id = db.Column(db.Integer, primary_key=True)
+  name = db.Column(db.String(255), unique=True, nullable=False)  # e.g. 'New York, NY, US'
+  latitude = db.Column(db.Float, nullable=False)
+  longitude = db.Column(db.Float, nullable=False)
+  geohash = db.Column(db.String(12), nullable=False, index=True)  # radius queries scan geohash prefixes
+
+class UserLocation(db.Model):
+  __tablename__ = 'user_locations'
+  
+  # Resolved profile location and preferred locations of a job seeker
+  user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+  location_id = db.Column(db.Integer, db.ForeignKey('locations.id'), primary_key=True, index=True)
+
 class JobPreference(db.Model):
   __tablename__ = 'job_preferences'
   
   id = db.Column(db.Integer, primary_key=True)
-  user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+  user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
   job_types = db.Column(db.Text)  # JSON string array
   locations = db.Column(db.Text)  # JSON string array
   industries = db.Column(db.Text)  # JSON string array
@@ -93,6 +126,11 @@ class Experience(db.Model):
   description = db.Column(db.Text)
   created_at = db.Column(db.DateTime, default=datetime.utcnow)
   updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
+  
+  # A user's experience, most recent first
+  __table_args__ = (
+    db.Index('ix_experiences_user_start', 'user_id', 'start_date'),
+  )
 
 class Education(db.Model):
   __tablename__ = 'education'
@@ -107,6 +145,11 @@ class Education(db.Model):
   current = db.Column(db.Boolean, default=False)
   created_at = db.Column(db.DateTime, default=datetime.utcnow)
   updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
+  
+  # A user's education, most recent first
+  __table_args__ = (
+    db.Index('ix_education_user_start', 'user_id', 'start_date'),
+  )
 
 class Job(db.Model):
   __tablename__ = 'jobs'
@@ -135,6 +178,14 @@ class Job(db.Model):
   # Relationships
   applications = db.relationship('JobApplication', backref='job')
   
+  # Equality filters of the job search, on top of the full-text index, and keysets of paginated listings
+  __table_args__ = (
+    db.Index('ix_jobs_active_type', 'is_active', 'type'),
+    db.Index('ix_jobs_active_level', 'is_active', 'experience_level'),
+    db.Index('ix_jobs_active_created', 'is_active', 'created_at', 'id'),
+    db.Index('ix_jobs_employer_created', 'employer_id', 'created_at', 'id'),
+  )
+  
   def to_dict(self):
     return {
       'id': self.id,
@@ -155,9 +206,36 @@ class Job(db.Model):
       'isActive': self.is_active,
       'isDraft': self.is_draft,
       'postedDate': self.created_at.isoformat(),
-      'applicationsCount': len(self.applications)
+      'applicationsCount': self.applications_count
     }
 
+class JobText(db.Model):
+  __tablename__ = 'job_texts'
+  
+  # Normalized (preprocess_text) job description, written with the job
+  job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), primary_key=True)
+  text = db.Column(db.Text, nullable=False)
+  updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class JobSkill(db.Model):
+  __tablename__ = 'job_skills'
+  
+  # Dictionary skills extracted from a job when it is written
+  job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), primary_key=True)
+  term_id = db.Column(db.Integer, db.ForeignKey('skill_terms.id'), primary_key=True)
+  weight = db.Column(db.Float, nullable=False)  # 1.0 in the requirements, 0.5 in the description only
+  
+  __table_args__ = (
+    db.Index('ix_job_skills_term_job', 'term_id', 'job_id'),
+  )
+
+class JobLocation(db.Model):
+  __tablename__ = 'job_locations'
+  
+  # Resolved location of a job, absent for remote or unknown places
+  job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), primary_key=True)
+  location_id = db.Column(db.Integer, db.ForeignKey('locations.id'), nullable=False, index=True)
+
 class JobApplication(db.Model):
   __tablename__ = 'job_applications'
   
@@ -173,6 +251,12 @@ class JobApplication(db.Model):
   created_at = db.Column(db.DateTime, default=datetime.utcnow)
   updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
   
+  # One application per job and applicant, also serving the per-job counts; a seeker's applications
+  __table_args__ = (
+    db.Index('uq_job_applications_job_applicant', 'job_id', 'applicant_id', unique=True),
+    db.Index('ix_job_applications_applicant_created', 'applicant_id', 'created_at'),
+  )
+  
   def to_dict(self):
     return {
       'id': self.id,
@@ -188,3 +272,45 @@ class JobApplication(db.Model):
       'updatedAt': self.updated_at.isoformat() if self.updated_at else None
     }
 
+# Loaded with the job in the same query, so listing jobs does not load their applications
+Job.applications_count = db.column_property(
+  db.select(db.func.count(JobApplication.id)).where(JobApplication.job_id == Job.id).correlate_except(JobApplication).scalar_subquery()
+)
+
+class SchemaMigration(db.Model):
+  __tablename__ = 'schema_migrations'
+  
+  # Versions of migrations.py applied to this database
+  version = db.Column(db.Integer, primary_key=True)
+  name = db.Column(db.String(255), nullable=False)
+  applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class MatchScore(db.Model):
+  __tablename__ = 'match_scores'
+  
+  # Precomputed seeker x job match scores, only scores above zero are stored
+  seeker_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+  job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), primary_key=True)
+  score = db.Column(db.Float, nullable=False)
+  
+  __table_args__ = (
+    db.Index('ix_match_scores_seeker_score', 'seeker_id', 'score'),
+    db.Index('ix_match_scores_job_score', 'job_id', 'score'),
+  )
+
+class MatchScoreSeeker(db.Model):
+  __tablename__ = 'match_score_seekers'
+  
+  # Whether a seeker's row of match_scores is up to date
+  seeker_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+  status = db.Column(db.String(20), nullable=False, index=True)  # pending, ready
+  updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class MatchScoreJob(db.Model):
+  __tablename__ = 'match_score_jobs'
+  
+  # Whether a job's column of match_scores is up to date
+  job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), primary_key=True)
+  status = db.Column(db.String(20), nullable=False, index=True)  # pending, ready
+  updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+  model = db.Column(db.String(40))  # JobIndex.fingerprint of the fit the column was scored with
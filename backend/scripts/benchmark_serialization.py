@@ -0,0 +1,96 @@
+"""
+Compare job listing serialization: Job.to_dict() + jsonify vs spliced fragments
+
+Run from the backend directory:
+
+    python scripts/benchmark_serialization.py --jobs 500 --repeat 20
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+
+from models import Job
+from utils.job_serializer import JobFragmentCache
+
+WORDS = 'python react sql docker kubernetes team build scalable services customers data cloud'.split()
+
+def make_jobs(count):
+    """Detached jobs shaped like real postings"""
+    now = datetime.utcnow()
+    jobs = []
+    for job_id in range(1, count + 1):
+        job = Job(
+            id=job_id,
+            employer_id=1,
+            title=f'Software Engineer {job_id}',
+            company='Acme',
+            location='New York, NY',
+            type='Full-time',
+            salary='$100k - $150k',
+            description=' '.join(random.choices(WORDS, k=200)),
+            requirements=json.dumps([' '.join(random.choices(WORDS, k=6)) for _ in range(6)]),
+            responsibilities=json.dumps([' '.join(random.choices(WORDS, k=8)) for _ in range(5)]),
+            benefits=json.dumps(['Health insurance', '401k', 'Remote days']),
+            is_remote=job_id % 3 == 0,
+            experience_level='Mid',
+            application_deadline=now + timedelta(days=30),
+            application_email='jobs@acme.test',
+            application_url='',
+            is_active=True,
+            is_draft=False,
+            created_at=now - timedelta(minutes=job_id),
+            updated_at=None
+        )
+        job.applications_count = job_id % 7
+        jobs.append(job)
+    return jobs
+
+def timed(label, repeat, function):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    print(f'{label:<32} {elapsed:8.2f} ms')
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    jobs = make_jobs(args.jobs)
+    scores = [random.uniform(0, 100) for _ in jobs]
+
+    def to_dict_path():
+        jobs_data = [job.to_dict() for job in jobs]
+        for job_data, score in zip(jobs_data, scores):
+            job_data['matchScore'] = score
+        return jsonify(jobs_data).get_data()
+
+    def fragment_path(cache):
+        return app.response_class(cache.encode_list(jobs, scores), mimetype='application/json').get_data()
+
+    with app.app_context():
+        # Both paths must produce the same document
+        assert json.loads(to_dict_path()) == json.loads(fragment_path(JobFragmentCache()))
+
+        print(f'{args.jobs} jobs, mean of {args.repeat} runs')
+        baseline = timed('to_dict + jsonify', args.repeat, to_dict_path)
+        cold = timed('fragments, cold cache', args.repeat, lambda: fragment_path(JobFragmentCache()))
+        warm_cache = JobFragmentCache()
+        fragment_path(warm_cache)
+        warm = timed('fragments, warm cache', args.repeat, lambda: fragment_path(warm_cache))
+        print(f'speedup: {baseline / cold:.1f}x cold, {baseline / warm:.1f}x warm')
+
+if __name__ == '__main__':
+    main()
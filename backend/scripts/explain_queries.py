@@ -0,0 +1,149 @@
+"""
+Report the query plans of each endpoint's hot queries, with and without the curated indexes
+
+Run from the backend directory against a migrated database (DATABASE_URL
+or the configured default):
+
+    python scripts/explain_queries.py [--endpoint /api/jobs]
+
+"Before" plans are taken without the indexes of migrations.INDEXED_MODELS:
+on SQLite from a scratch copy of the database, on Postgres inside a
+transaction that is rolled back (which briefly locks the tables, so do not
+run it against a busy primary).
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import sqlalchemy as sa
+from flask import Flask
+
+from migrations import curated_indexes
+from models import db, User, Profile, Skill, JobPreference, Experience, Education, Job, JobApplication, MatchScore
+
+def endpoint_queries(employer_id, seeker_id, job_id):
+    """{endpoint: [(label, statement)]} mirroring the queries app.py issues"""
+    return {
+        'GET /api/jobs': [
+            ('newest active jobs', sa.select(Job).where(Job.is_active == True).order_by(Job.created_at.desc(), Job.id.desc()).limit(21)),
+            ('job type filter', sa.select(Job).where(Job.is_active == True, Job.type.in_(['Full-time']))),
+            ('experience level filter', sa.select(Job).where(Job.is_active == True, Job.experience_level.in_(['Mid']))),
+        ],
+        'GET /api/jobs/<id>': [
+            ('job with applications count', sa.select(Job).where(Job.id == job_id)),
+            ('employer profile', sa.select(Profile).where(Profile.user_id == employer_id)),
+        ],
+        'GET /api/jobs/employer': [
+            ("employer's jobs, newest first", sa.select(Job).where(Job.employer_id == employer_id).order_by(Job.created_at.desc(), Job.id.desc())),
+        ],
+        'GET /api/profile': [
+            ('profile', sa.select(Profile).where(Profile.user_id == seeker_id)),
+            ('skills', sa.select(Skill).where(Skill.user_id == seeker_id)),
+            ('job preferences', sa.select(JobPreference).where(JobPreference.user_id == seeker_id)),
+            ('experience', sa.select(Experience).where(Experience.user_id == seeker_id).order_by(Experience.start_date.desc())),
+            ('education', sa.select(Education).where(Education.user_id == seeker_id).order_by(Education.start_date.desc())),
+            ("employer's applications", sa.select(sa.func.count(JobApplication.id)).join(Job, Job.id == JobApplication.job_id).where(Job.employer_id == employer_id)),
+        ],
+        'POST /api/jobs/<id>/apply': [
+            ('already applied check', sa.select(JobApplication).where(JobApplication.job_id == job_id, JobApplication.applicant_id == seeker_id).limit(1)),
+        ],
+        'GET /api/applications': [
+            ("seeker's applications", sa.select(JobApplication).where(JobApplication.applicant_id == seeker_id)),
+        ],
+        'GET /api/jobs/<id>/applications': [
+            ("job's applications", sa.select(JobApplication).where(JobApplication.job_id == job_id)),
+        ],
+        'GET /api/recommendations/jobs': [
+            ("seeker's best stored matches", sa.select(MatchScore).where(MatchScore.seeker_id == seeker_id).order_by(MatchScore.score.desc()).limit(10)),
+        ],
+    }
+
+def explain(connection, statement):
+    """Plan lines of a statement on this connection's database"""
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={'render_postcompile': True})
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+
+    if connection.dialect.name == 'sqlite':
+        rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', params).all()
+        return [row[-1] for row in rows]
+    return [row[0] for row in connection.exec_driver_sql(f'EXPLAIN {compiled}', params).all()]
+
+def drop_curated_indexes(connection):
+    for index in curated_indexes():
+        index.drop(connection, checkfirst=True)
+
+def explain_all(connection, queries):
+    return {
+        endpoint: [explain(connection, statement) for _, statement in statements]
+        for endpoint, statements in queries.items()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--endpoint', help='Only report endpoints containing this text')
+    args = parser.parse_args()
+
+    # Same instance folder as app.py, where relative SQLite paths point
+    app = Flask(__name__, instance_path=os.path.join(BACKEND_DIR, 'instance'))
+    app.config.from_object('config.Config')
+    db.init_app(app)
+
+    with app.app_context():
+        engine = db.engine
+
+        # Ids that exist, so plans reflect real statistics where the planner keeps any
+        with engine.connect() as connection:
+            employer_id = connection.scalar(sa.select(sa.func.min(User.id)).where(User.user_type == 'employer')) or 1
+            seeker_id = connection.scalar(sa.select(sa.func.min(User.id)).where(User.user_type == 'jobSeeker')) or 1
+            job_id = connection.scalar(sa.select(sa.func.min(Job.id))) or 1
+
+        queries = endpoint_queries(employer_id, seeker_id, job_id)
+        if args.endpoint:
+            queries = {endpoint: statements for endpoint, statements in queries.items() if args.endpoint in endpoint}
+
+        with engine.connect() as connection:
+            after = explain_all(connection, queries)
+
+        if engine.dialect.name == 'sqlite':
+            scratch = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+            scratch.close()
+            try:
+                # Move committed pages out of the write-ahead log, which the copy would leave behind
+                with engine.connect() as connection:
+                    connection.exec_driver_sql('PRAGMA wal_checkpoint(TRUNCATE)')
+                shutil.copyfile(engine.url.database, scratch.name)
+                scratch_engine = sa.create_engine(f'sqlite:///{scratch.name}')
+                with scratch_engine.begin() as connection:
+                    drop_curated_indexes(connection)
+                with scratch_engine.connect() as connection:
+                    before = explain_all(connection, queries)
+                scratch_engine.dispose()
+            finally:
+                os.unlink(scratch.name)
+        else:
+            with engine.connect() as connection:
+                transaction = connection.begin()
+                try:
+                    drop_curated_indexes(connection)
+                    before = explain_all(connection, queries)
+                finally:
+                    transaction.rollback()
+
+    for endpoint, statements in queries.items():
+        print(f'== {endpoint}')
+        for (label, _), before_plan, after_plan in zip(statements, before[endpoint], after[endpoint]):
+            print(f'-- {label}')
+            print('   before: ' + '\n           '.join(before_plan))
+            print('   after:  ' + '\n           '.join(after_plan))
+        print()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import itertools
+import json
+import os
+import sys
+import tempfile
+
+import pytest
+from flask.testing import FlaskClient
+
+# app.py creates its tables at import, so point it at a scratch database first
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'careerconnect-test.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as careerconnect
+
+class BufferedClient(FlaskClient):
+    """Test client reading streamed bodies before returning, so each request's context is closed in turn"""
+
+    def open(self, *args, **kwargs):
+        kwargs.setdefault('buffered', True)
+        return super().open(*args, **kwargs)
+
+_emails = itertools.count()
+
+@pytest.fixture(scope='session')
+def app():
+    careerconnect.app.config['TESTING'] = True
+    careerconnect.app.test_client_class = BufferedClient
+    return careerconnect.app
+
+@pytest.fixture
+def login(app):
+    """Register and log in a new user, returns their test client"""
+    def login(user_type, **profile):
+        client = app.test_client()
+        email = f'user{next(_emails)}@example.com'
+        response = client.post('/api/auth/register', json={
+            'email': email, 'password': 'password', 'fullName': 'Test User', 'userType': user_type
+        })
+        assert response.status_code == 201, response.data
+        assert client.post('/api/auth/login', json={'email': email, 'password': 'password'}).status_code == 200
+        if profile:
+            if 'skills' in profile:
+                profile['skills'] = json.dumps(profile['skills'])
+            assert client.post('/api/profile', data=profile).status_code == 200
+        return client
+    return login
+
+@pytest.fixture
+def new_employer(login):
+    """Log in a new employer with a complete profile"""
+    return lambda: login('employer', companyName='Acme', industry='Software', companyLocation='Boston', companyDescription='We build')
+
+@pytest.fixture
+def new_seeker(login):
+    """Log in a new job seeker with a complete profile"""
+    return lambda skills=('Python', 'SQL'): login(
+        'jobSeeker', title='Developer', phone='555', location='Boston', bio='Hi', skills=list(skills)
+    )
+
+@pytest.fixture
+def employer(new_employer):
+    return new_employer()
+
+@pytest.fixture
+def seeker(new_seeker):
+    return new_seeker()
+
+@pytest.fixture
+def post_job():
+    """Post a job with an employer's client, returns its id"""
+    def post_job(client, **fields):
+        job = {'title': 'Python Developer', 'description': 'Python developer writing SQL and Django', 'type': 'Full-time'}
+        job.update(fields)
+        response = client.post('/api/jobs', json=job)
+        assert response.status_code == 201, response.data
+        return response.json['jobId']
+    return post_job
+
+@pytest.fixture
+def wait_for_match_scores():
+    """Wait until the background match score tasks, and those they scheduled, have run"""
+    def wait():
+        while careerconnect.match_score_executor is not None:
+            careerconnect.match_score_executor.submit(lambda: None).result()
+            if not careerconnect.queued_match_scores:
+                return
+    return wait
@@ -0,0 +1,68 @@
+import numpy as np
+
+from utils.ann import IVFIndex
+
+def clustered_vectors(count, dimensions=32, clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dimensions))
+    vectors = centers[rng.integers(clusters, size=count)] + 0.3 * rng.normal(size=(count, dimensions))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+def exact(vectors, ids, query, k):
+    similarities = vectors @ query
+    return [ids[i] for i in np.argsort(-similarities, kind='stable')[:k]]
+
+def test_search_recall():
+    vectors = clustered_vectors(4000)
+    ids = list(range(1000, 5000))
+    index = IVFIndex(vectors.shape[1], nprobe=8, min_train_size=1024)
+    index.build(ids, vectors)
+    assert index.nlist > 8
+
+    queries = clustered_vectors(50, seed=1)
+    found = sum(
+        len(set(item_id for item_id, _ in index.search(query, 10)) & set(exact(vectors, ids, query, 10)))
+        for query in queries
+    )
+    assert found / (10 * len(queries)) >= 0.9
+
+    # Probing every list is an exact search
+    query = queries[0]
+    assert [item_id for item_id, _ in index.search(query, 10, nprobe=index.nlist)] == exact(vectors, ids, query, 10)
+
+def test_upsert_and_remove():
+    vectors = clustered_vectors(1500)
+    index = IVFIndex(vectors.shape[1], min_train_size=1024)
+    # The index takes over the array it is built from and moves rows on removal
+    index.build(list(range(1500)), vectors.copy())
+
+    index.remove(7)
+    assert index.get(7) is None
+    assert 7 not in [item_id for item_id, _ in index.search(vectors[7], 5, nprobe=index.nlist)]
+
+    index.upsert(9999, vectors[7])
+    assert index.search(vectors[7], 1)[0][0] == 9999
+
+    index.upsert(3, vectors[8])
+    assert {item_id for item_id, _ in index.search(vectors[8], 2, nprobe=index.nlist)} == {3, 8}
+
+def test_search_within_ids_is_exact():
+    vectors = clustered_vectors(2000)
+    index = IVFIndex(vectors.shape[1], nprobe=1, min_train_size=1024)
+    index.build(list(range(2000)), vectors)
+
+    allowed = list(range(0, 2000, 7))
+    results = index.search(vectors[0], 5, ids=allowed)
+    assert [item_id for item_id, _ in results] == exact(vectors[allowed], allowed, vectors[0], 5)
+
+def test_save_and_load(tmp_path):
+    vectors = clustered_vectors(1200)
+    index = IVFIndex(vectors.shape[1], min_train_size=1024)
+    index.build(list(range(1200)), vectors)
+    path = str(tmp_path / 'jobs.npz')
+    index.save(path, signature='(1, 2)')
+
+    loaded, metadata = IVFIndex.load(path, min_train_size=1024)
+    assert metadata == {'signature': '(1, 2)'}
+    assert loaded.nlist == index.nlist
+    assert loaded.search(vectors[5], 10) == index.search(vectors[5], 10)
@@ -0,0 +1,18 @@
+def applications_count(client, job_id):
+    return client.get(f'/api/jobs/{job_id}').json['applicationsCount']
+
+def test_applications_count_follows_applications(employer, post_job, new_seeker, app):
+    job_id = post_job(employer, title='Counted Farrier')
+    anonymous = app.test_client()
+    assert applications_count(anonymous, job_id) == 0
+
+    seekers = [new_seeker() for _ in range(3)]
+    for seeker in seekers:
+        assert seeker.post(f'/api/jobs/{job_id}/apply', data={'coverLetter': 'Hello'}).status_code == 201
+    assert seekers[0].post(f'/api/jobs/{job_id}/apply', data={'coverLetter': 'Again'}).status_code == 400
+
+    assert applications_count(anonymous, job_id) == 3
+    listed = {job['id']: job for job in anonymous.get('/api/jobs', query_string={'search': 'counted farrier'}).json}
+    assert listed[job_id]['applicationsCount'] == 3
+    employer_jobs = {job['id']: job for job in employer.get('/api/jobs/employer').json}
+    assert employer_jobs[job_id]['applicationsCount'] == 3
@@ -0,0 +1,16 @@
+def test_cache_stats_need_login(app):
+    assert app.test_client().get('/api/stats/cache').status_code == 401
+
+def test_cache_stats_are_for_operators_only(app, employer, monkeypatch):
+    assert employer.get('/api/stats/cache').status_code == 403
+
+    client = app.test_client()
+    client.post('/api/auth/register', json={
+        'email': 'Ops@example.com', 'password': 'password', 'fullName': 'Ops', 'userType': 'employer'
+    })
+    assert client.post('/api/auth/login', json={'email': 'Ops@example.com', 'password': 'password'}).status_code == 200
+    monkeypatch.setitem(app.config, 'STATS_USER_EMAILS', ['ops@example.com'])
+
+    response = client.get('/api/stats/cache')
+    assert response.status_code == 200
+    assert set(response.json) == {'matchScores', 'jobSearches', 'jobFragments'}
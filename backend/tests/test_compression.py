@@ -0,0 +1,19 @@
+def test_compressed_job_has_weak_etag(employer, post_job, app):
+    job_id = post_job(employer, description='Python developer writing SQL. ' * 100)
+    client = app.test_client()
+
+    plain = client.get(f'/api/jobs/{job_id}', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in plain.headers
+    assert not plain.headers['ETag'].startswith('W/')
+
+    compressed = client.get(f'/api/jobs/{job_id}', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert compressed.headers['ETag'] == 'W/' + plain.headers['ETag']
+
+def test_weak_etag_revalidates(employer, post_job, app):
+    job_id = post_job(employer, description='Python developer writing SQL. ' * 100)
+    client = app.test_client()
+
+    etag = client.get(f'/api/jobs/{job_id}', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+    response = client.get(f'/api/jobs/{job_id}', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert response.status_code == 304
@@ -0,0 +1,46 @@
+def revalidate(client, url):
+    """Status of a request for ``url`` with the ETag of a fresh copy, and that ETag"""
+    etag = client.get(url).headers['ETag']
+    return client.get(url, headers={'If-None-Match': etag}).status_code, etag
+
+def test_job_etag_changes_with_the_job(employer, post_job, app):
+    job_id = post_job(employer)
+    client = app.test_client()
+    url = f'/api/jobs/{job_id}'
+
+    status, etag = revalidate(client, url)
+    assert status == 304
+
+    assert employer.put(url, json={'title': 'Renamed Developer'}).status_code == 200
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json['title'] == 'Renamed Developer'
+
+def test_profile_etag_changes_with_the_profile(new_seeker):
+    seeker = new_seeker()
+
+    status, etag = revalidate(seeker, '/api/profile')
+    assert status == 304
+
+    assert seeker.post('/api/profile', data={'bio': 'Changed'}).status_code == 200
+    assert seeker.get('/api/profile', headers={'If-None-Match': etag}).status_code == 200
+
+def test_list_etags_change_with_applications(employer, post_job, new_seeker):
+    job_id = post_job(employer)
+    seeker = new_seeker()
+
+    status, applications_etag = revalidate(seeker, '/api/applications')
+    assert status == 304
+    status, jobs_etag = revalidate(employer, '/api/jobs/employer')
+    assert status == 304
+
+    assert seeker.post(f'/api/jobs/{job_id}/apply', data={'coverLetter': 'Hello'}).status_code == 201
+    assert seeker.get('/api/applications', headers={'If-None-Match': applications_etag}).status_code == 200
+    assert employer.get('/api/jobs/employer', headers={'If-None-Match': jobs_etag}).status_code == 200
+
+def test_etags_are_per_user(employer, post_job, new_seeker):
+    job_id = post_job(employer)
+    url = f'/api/jobs/{job_id}'
+
+    etag = employer.get(url).headers['ETag']
+    assert new_seeker().get(url, headers={'If-None-Match': etag}).status_code == 200
@@ -0,0 +1,43 @@
+import json
+
+import numpy as np
+
+from utils.embeddings import EmbeddingStore
+
+VOCABULARY = ['python', 'sql', 'django', 'marketing']
+
+def unit_rows(rows):
+    rows = np.asarray(rows, dtype=np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+def exported_model(tmp_path):
+    """Model path whose exported sidecar files exist, without the gensim model itself"""
+    model_path = str(tmp_path / 'model')
+    np.save(model_path + '.vectors.npy', unit_rows([[1, 0, 0], [0, 1, 0], [1, 1, 0], [0, 0, 1]]))
+    with open(model_path + '.vocab.json', 'w') as f:
+        json.dump(VOCABULARY, f)
+    return model_path
+
+def test_vectors_are_memory_mapped_read_only(tmp_path):
+    store = EmbeddingStore.load(exported_model(tmp_path))
+
+    assert isinstance(store.vectors, np.memmap)
+    assert not store.vectors.flags.writeable
+    assert store.dimensions == 3
+
+def test_document_vector_is_the_normalized_mean_of_known_words(tmp_path):
+    store = EmbeddingStore.load(exported_model(tmp_path))
+
+    vector = store.document_vector('Python and SQL, unknown words')
+    expected = unit_rows([[1, 1, 0]])[0]
+    assert np.allclose(vector, expected)
+    assert store.document_vector('nothing known here') is None
+
+def test_document_vectors_match_document_vector(tmp_path):
+    store = EmbeddingStore.load(exported_model(tmp_path))
+    texts = ['python django', 'no known words', 'Marketing SQL', 'sql']
+
+    vectors = store.document_vectors(texts)
+    for text, vector in zip(texts, vectors):
+        single = store.document_vector(text)
+        assert np.allclose(vector, 0 if single is None else single, atol=1e-6)
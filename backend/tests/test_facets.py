@@ -0,0 +1,36 @@
+import app as careerconnect
+from utils.facet_index import FacetIndex
+
+def test_locations_are_counted_under_the_resolved_place():
+    index = FacetIndex(labels={'location': careerconnect.gazetteer.place_name})
+    index.build([
+        (1, 'Full-time', 'NYC', 'Senior', False),
+        (2, 'Full-time', 'New York, NY', 'Senior', False),
+        (3, 'Part-time', 'new york', 'Junior', False),
+        (4, 'Full-time', 'Atlantis', 'Junior', False),
+        (5, 'Full-time', '', 'Junior', True),
+    ])
+    counts = index.counts({})
+
+    assert counts['location'] == [{'value': 'New York, NY, US', 'count': 3}, {'value': 'Atlantis', 'count': 1}]
+    assert counts['jobType'] == [{'value': 'Full-time', 'count': 4}, {'value': 'Part-time', 'count': 1}]
+
+def test_location_filters_apply_to_the_job_text():
+    index = FacetIndex(labels={'location': careerconnect.gazetteer.place_name})
+    index.build([
+        (1, 'Full-time', 'NYC', 'Senior', False),
+        (2, 'Part-time', 'New York, NY', 'Senior', False),
+    ])
+    counts = index.counts({'location': ['nyc']})
+
+    assert counts['jobType'] == [{'value': 'Full-time', 'count': 1}]
+    assert counts['location'] == [{'value': 'New York, NY, US', 'count': 2}]
+
+def test_search_facets_merge_spellings_of_a_place(new_employer, post_job, app):
+    employer = new_employer()
+    for location in ('Manhattan', 'New York City'):
+        post_job(employer, title='Facet Cartographer', description='Maps facets', location=location)
+
+    response = app.test_client().get('/api/jobs', query_string={'search': 'cartographer', 'facets': 'true'})
+    assert response.status_code == 200
+    assert {'value': 'New York, NY, US', 'count': 2} in response.json['facets']['location']
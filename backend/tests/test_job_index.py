@@ -0,0 +1,46 @@
+from utils.job_index import JobIndex
+from utils.matching import find_top_job_matches, preprocess_text
+
+def build(jobs, **options):
+    index = JobIndex(**options)
+    index.build([(job_id, preprocess_text(description)) for job_id, description in jobs], 'test')
+    return index
+
+def test_job_posted_after_fit_outranks_weaker_match():
+    index = build([(1, 'Java Spring engineer with SQL'), (2, 'Marketing manager for our brand')])
+    index.upsert(3, preprocess_text('Python developer writing SQL and Django'))
+
+    matches = find_top_job_matches(index, ['Python', 'SQL'], 3)
+    assert [job_id for job_id, _ in matches] == [3, 1, 2]
+
+def test_job_posted_after_fit_keeps_its_unknown_words():
+    index = build([(1, 'Python developer writing SQL and Django'), (2, 'Marketing manager for our brand')])
+    index.upsert(3, preprocess_text('Java Spring engineer with SQL'))
+
+    # Without java, spring and engineer its row was all SQL and scored 80.7
+    matches = dict(find_top_job_matches(index, ['Python', 'SQL'], 3))
+    assert matches[1] > matches[3]
+    assert matches[3] < 50
+
+def test_new_words_refit_small_corpus():
+    index = build([(job_id, f'Java engineer with SQL, team {job_id}') for job_id in range(10)])
+    generation = index.generation
+
+    index.upsert(10, preprocess_text('Java engineer with SQL'))
+    assert index.generation == generation
+
+    index.upsert(11, preprocess_text('Python developer'))
+    assert index.generation == generation + 1
+    assert 'python' in index.vectorizer.vocabulary_
+
+def test_new_words_wait_for_refit_ratio_in_large_corpus():
+    index = build([(job_id, f'engineer number{job_id}') for job_id in range(50)], new_term_refit_max_jobs=10)
+    generation = index.generation
+
+    for job_id in range(50, 62):
+        index.upsert(job_id, preprocess_text(f'Python developer number{job_id}'))
+    assert index.generation == generation
+
+    # 20% of the corpus changed
+    index.upsert(62, preprocess_text('Python developer'))
+    assert index.generation == generation + 1
@@ -0,0 +1,17 @@
+def test_punctuation_search_matches_nothing(employer, post_job, app):
+    job_id = post_job(employer, title='C++ Developer')
+    client = app.test_client()
+
+    assert job_id in [job['id'] for job in client.get('/api/jobs', query_string={'search': 'developer'}).json]
+    assert client.get('/api/jobs', query_string={'search': '"++'}).json == []
+
+def test_streamed_and_paginated_jobs_have_the_same_keys(employer, post_job, login, app):
+    post_job(employer, title='Keyed Glassblower')
+    search = {'search': 'glassblower'}
+
+    for client in (app.test_client(), employer, login('jobSeeker')):
+        streamed = client.get('/api/jobs', query_string=search).json
+        paginated = client.get('/api/jobs', query_string={**search, 'limit': 10}).json['jobs']
+
+        assert streamed[0]['matchScore'] is None
+        assert set(streamed[0]) == set(paginated[0])
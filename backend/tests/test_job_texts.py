@@ -0,0 +1,30 @@
+import re
+
+import app as careerconnect
+from models import JobText, db
+from utils.matching import preprocess_text
+
+def regex_preprocess(text):
+    """preprocess_text as it was: lowercase, non-alphanumerics to spaces, collapse whitespace"""
+    return ' '.join(re.sub(r'[^a-zA-Z0-9\s]', ' ', text.lower()).split())
+
+def test_preprocess_text_matches_the_regex_version():
+    for text in [
+        'Senior C++/Python Developer (Remote!)',
+        '  Tabs\tand\nnewlines  ',
+        'Café résumé naïve – über',
+        'ÀÉÎ and the Kelvin sign K',
+        '',
+    ]:
+        assert preprocess_text(text) == regex_preprocess(text)
+
+def test_job_text_is_stored_with_the_job(employer, post_job, app):
+    job_id = post_job(employer, description='Rust & Go, on-call!')
+    with app.app_context():
+        assert db.session.get(JobText, job_id).text == 'rust go on call'
+
+    response = employer.put(f'/api/jobs/{job_id}', json={'description': 'Kotlin/Android'})
+    assert response.status_code == 200
+    with app.app_context():
+        assert db.session.get(JobText, job_id).text == 'kotlin android'
+        assert dict(careerconnect.load_job_texts())[job_id] == 'kotlin android'
@@ -0,0 +1,26 @@
+def search(client, **params):
+    return {job['title'] for job in client.get('/api/jobs', query_string=params).json}
+
+def test_radius_search_near_a_place(employer, post_job, app):
+    post_job(employer, title='Radius Welder Manhattan', location='Manhattan')
+    post_job(employer, title='Radius Welder Newark', location='Newark, NJ')
+    post_job(employer, title='Radius Welder Boston', location='Boston')
+    post_job(employer, title='Radius Welder Anywhere', location='Remote', isRemote=True)
+    client = app.test_client()
+
+    assert search(client, search='radius welder', near='NYC', radiusKm=30) == {
+        'Radius Welder Manhattan', 'Radius Welder Newark'
+    }
+    assert search(client, search='radius welder', near='NYC', radiusKm=5) == {'Radius Welder Manhattan'}
+    assert 'Radius Welder Boston' in search(client, search='radius welder', lat=42.36, lng=-71.06, radiusKm=10)
+
+def test_location_filter_matches_aliases(employer, post_job, app):
+    post_job(employer, title='Alias Glazier', location='New York City')
+    client = app.test_client()
+
+    assert search(client, search='alias glazier', location='NYC') == {'Alias Glazier'}
+    assert search(client, search='alias glazier', location='Boston') == set()
+
+def test_unknown_place_is_rejected(app):
+    response = app.test_client().get('/api/jobs', query_string={'near': 'Atlantis'})
+    assert response.status_code == 400
@@ -0,0 +1,27 @@
+import app as careerconnect
+from models import Job, MatchScore, MatchScoreJob
+from utils.matching import calculate_seeker_to_jobs_scores
+
+def test_refit_rescores_stored_columns(app, employer, seeker, post_job, wait_for_match_scores):
+    seeker_id = seeker.get('/api/auth/status').json['user']['id']
+    job_id = post_job(employer, title='Java Engineer', description='Java Spring engineer with SQL')
+    wait_for_match_scores()
+
+    with app.app_context():
+        generation = careerconnect.get_job_index().generation
+
+    # Words no job had before refit the index
+    post_job(employer, title='Zig Engineer', description='Zig engineer writing Python and SQL tooling')
+    wait_for_match_scores()
+
+    with app.app_context():
+        index = careerconnect.get_job_index()
+        assert index.generation > generation
+
+        models = {model for (model,) in careerconnect.db.session.query(MatchScoreJob.model).filter(MatchScoreJob.status == 'ready')}
+        assert models == {index.fingerprint}
+
+        job = careerconnect.db.session.get(Job, job_id)
+        live, = calculate_seeker_to_jobs_scores(index, ['Python', 'SQL'], [job])
+        stored = careerconnect.db.session.get(MatchScore, (seeker_id, job_id))
+        assert stored.score == live
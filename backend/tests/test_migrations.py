@@ -0,0 +1,84 @@
+import sqlalchemy as sa
+
+from migrations import MIGRATIONS, duplicate_applications_table, run_migrations
+from models import JobApplication, SchemaMigration, db
+
+applications = JobApplication.__table__
+
+def old_database(tmp_path):
+    """Database of a release before the migrations: no unique application index nor score model column"""
+    engine = sa.create_engine(f'sqlite:///{tmp_path / "old.db"}')
+    db.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(sa.text('DROP INDEX uq_job_applications_job_applicant'))
+        connection.execute(sa.text('CREATE INDEX ix_job_applications_job_applicant ON job_applications (job_id, applicant_id)'))
+        connection.execute(sa.text('ALTER TABLE match_score_jobs DROP COLUMN model'))
+    return engine
+
+def application_ids(engine):
+    with engine.connect() as connection:
+        return [row.id for row in connection.execute(sa.select(applications.c.id).order_by(applications.c.id))]
+
+def index_names(engine):
+    return {index['name'] for index in sa.inspect(engine).get_indexes('job_applications')}
+
+def test_duplicate_applications_are_archived(tmp_path, capsys):
+    engine = old_database(tmp_path)
+    with engine.begin() as connection:
+        connection.execute(applications.insert(), [
+            {'id': 1, 'job_id': 10, 'applicant_id': 100, 'cover_letter': 'first'},
+            {'id': 2, 'job_id': 10, 'applicant_id': 100, 'cover_letter': 'double click'},
+            {'id': 3, 'job_id': 11, 'applicant_id': 100, 'cover_letter': None},
+            {'id': 4, 'job_id': 10, 'applicant_id': 101, 'cover_letter': None},
+            {'id': 5, 'job_id': 10, 'applicant_id': 100, 'cover_letter': 'triple click'},
+        ])
+
+    assert run_migrations(engine) == [version for version, _, _ in MIGRATIONS]
+
+    assert application_ids(engine) == [1, 3, 4]
+    with engine.connect() as connection:
+        archived = connection.execute(
+            sa.select(duplicate_applications_table()).order_by(sa.text('id'))
+        ).mappings().all()
+    assert [(row['id'], row['job_id'], row['applicant_id'], row['cover_letter']) for row in archived] == [
+        (2, 10, 100, 'double click'), (5, 10, 100, 'triple click')
+    ]
+    assert all(row['archived_at'] is not None for row in archived)
+
+    log = capsys.readouterr().out
+    assert 'Archived duplicate application 2 of user 100 to job 10' in log
+    assert 'keeping application 1' in log
+
+    assert 'uq_job_applications_job_applicant' in index_names(engine)
+    assert 'ix_job_applications_job_applicant' not in index_names(engine)
+    assert 'model' in {column['name'] for column in sa.inspect(engine).get_columns('match_score_jobs')}
+
+def test_migrations_run_once(tmp_path):
+    engine = old_database(tmp_path)
+    assert run_migrations(engine) == [version for version, _, _ in MIGRATIONS]
+    assert run_migrations(engine) == []
+
+def test_migrations_are_idempotent(tmp_path):
+    engine = old_database(tmp_path)
+    with engine.begin() as connection:
+        connection.execute(applications.insert(), [
+            {'id': 1, 'job_id': 10, 'applicant_id': 100},
+            {'id': 2, 'job_id': 10, 'applicant_id': 100},
+        ])
+    run_migrations(engine)
+
+    # As if another worker ran them at the same time, before either recorded them
+    with engine.begin() as connection:
+        connection.execute(SchemaMigration.__table__.delete())
+    assert run_migrations(engine) == [version for version, _, _ in MIGRATIONS]
+    assert application_ids(engine) == [1]
+
+def test_migrations_of_a_fresh_database(tmp_path):
+    engine = sa.create_engine(f'sqlite:///{tmp_path / "fresh.db"}')
+    db.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(applications.insert(), [{'id': 1, 'job_id': 10, 'applicant_id': 100}])
+
+    assert run_migrations(engine) == [version for version, _, _ in MIGRATIONS]
+    assert application_ids(engine) == [1]
+    assert not sa.inspect(engine).has_table('job_application_duplicates')
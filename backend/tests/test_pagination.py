@@ -0,0 +1,95 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import orm
+
+from utils.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_page, page_by_score
+
+class Base(orm.DeclarativeBase):
+    pass
+
+class Row(Base):
+    __tablename__ = 'rows'
+    id = sa.Column(sa.Integer, primary_key=True)
+    created_at = sa.Column(sa.DateTime)
+
+@pytest.fixture
+def session():
+    engine = sa.create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    rng = random.Random(2)
+    start = datetime(2024, 1, 1, 12, 0, 0, 123456)
+    with orm.Session(engine) as session:
+        # Few distinct timestamps, so pages split runs of ties
+        session.add_all([Row(id=i, created_at=start + timedelta(microseconds=rng.randrange(5))) for i in range(1, 41)])
+        session.commit()
+        yield session
+
+def walk(page, limit):
+    """Every page of a listing, following its cursors"""
+    items, cursor = page(limit, None)
+    pages = [items]
+    while cursor is not None:
+        items, cursor = page(limit, cursor)
+        pages.append(items)
+    return pages
+
+def test_keyset_pages_cover_every_row_once(session):
+    keys = [(Row.created_at, True), (Row.id, True)]
+    expected = [row.id for row in session.query(Row).order_by(Row.created_at.desc(), Row.id.desc())]
+
+    for limit in (1, 3, 7, 40, 50):
+        pages = walk(lambda limit, cursor: keyset_page(session.query(Row.id), 'recent', keys, limit, cursor), limit)
+        ids = [row[0] for page in pages for row in page]
+        assert ids == expected
+        assert all(len(page) == limit for page in pages[:-1])
+
+def test_keyset_page_ignores_rows_added_before_the_cursor(session):
+    keys = [(Row.created_at, True), (Row.id, True)]
+    first, cursor = keyset_page(session.query(Row.id), 'recent', keys, 5, None)
+
+    session.add(Row(id=100, created_at=datetime(2030, 1, 1)))
+    session.commit()
+
+    second, _ = keyset_page(session.query(Row.id), 'recent', keys, 5, cursor)
+    assert 100 not in [row[0] for row in second]
+    assert not {row[0] for row in first} & {row[0] for row in second}
+
+def test_cursor_round_trip_keeps_datetimes():
+    values = [datetime(2024, 1, 1, 12, 0, 0, 123456), 42]
+    assert decode_cursor(encode_cursor('recent', values), 'recent', 2) == [values[0].isoformat(), 42]
+
+@pytest.mark.parametrize('cursor', ['not base64!', encode_cursor('score', [1.0, 2]), encode_cursor('recent', [1])])
+def test_foreign_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, 'recent', 2)
+
+def test_score_pages_cover_every_item_once():
+    rng = random.Random(4)
+    items = [(item_id, float(rng.choice([10, 20, 20.5, 30]))) for item_id in range(50)]
+    expected = sorted(items, key=lambda item: (-item[1], item[0]))
+
+    for limit in (1, 4, 50):
+        pages = walk(lambda limit, cursor: page_by_score(items, limit, cursor), limit)
+        assert [item for page in pages for item in page] == expected
+
+def test_employer_job_pages(employer, post_job):
+    job_ids = [post_job(employer, title=f'Job {i}') for i in range(5)]
+
+    pages, cursor = [], None
+    while True:
+        response = employer.get('/api/jobs/employer', query_string={'limit': 2, **({'cursor': cursor} if cursor else {})})
+        assert response.status_code == 200
+        pages.append([job['id'] for job in response.json['jobs']])
+        cursor = response.json['nextCursor']
+        if cursor is None:
+            break
+
+    assert [job_id for page in pages for job_id in page] == job_ids[::-1]
+    assert [len(page) for page in pages] == [2, 2, 1]
+
+def test_invalid_cursor_is_a_bad_request(app):
+    response = app.test_client().get('/api/jobs', query_string={'limit': 2, 'cursor': encode_cursor('relevance', [1, 2])})
+    assert response.status_code == 400
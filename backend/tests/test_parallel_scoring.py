@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from utils.job_index import JobIndex
+from utils.matching import calculate_seeker_to_jobs_scores, find_top_job_matches, preprocess_text
+from utils.parallel_scoring import ShardedScorer
+
+SKILLS = ['Python', 'SQL', 'Docker', 'Go']
+
+class Job:
+    def __init__(self, id, description):
+        self.id = id
+        self.description = description
+
+@pytest.fixture(scope='module')
+def scorer():
+    scorer = ShardedScorer(processes=2, min_jobs=1)
+    yield scorer
+    scorer.close()
+
+@pytest.fixture
+def index():
+    rng = random.Random(11)
+    words = ['python', 'django', 'sql', 'react', 'docker', 'go', 'java', 'c++', 'excel'] + [f'word{i}' for i in range(300)]
+    index = JobIndex(refit_ratio=10, new_term_refit_max_jobs=0)
+    index.build([(job_id, ' '.join(rng.choices(words, k=30))) for job_id in range(1, 601)], 'test')
+    return index
+
+def live_jobs(index):
+    return [Job(job_id, text) for job_id, text in index.texts.items()]
+
+def assert_same_scores(index, scorer):
+    jobs = live_jobs(index)
+    assert calculate_seeker_to_jobs_scores(index, SKILLS, jobs, scorer) == calculate_seeker_to_jobs_scores(index, SKILLS, jobs)
+    for min_score in (None, 30):
+        sharded = find_top_job_matches(index, SKILLS, 25, min_score, scorer=scorer)
+        assert sharded == find_top_job_matches(index, SKILLS, 25, min_score)
+
+def test_sharded_scores_match_in_process_scores(index, scorer):
+    assert scorer.scores(index, 'python sql', SKILLS) is not None
+    assert_same_scores(index, scorer)
+
+def test_jobs_written_since_the_export_are_scored(index, scorer):
+    assert_same_scores(index, scorer)
+
+    # Removed, replaced and added jobs, without a refit of the index
+    generation = index.generation
+    for job_id in range(1, 200, 3):
+        index.remove(job_id)
+    for job_id in range(2, 200, 5):
+        index.upsert(job_id, preprocess_text('python sql docker go expert ' * 3))
+    for job_id in range(1000, 1030):
+        index.upsert(job_id, preprocess_text('go python'))
+    assert index.generation == generation
+    assert_same_scores(index, scorer)
+
+    index.refit()
+    assert_same_scores(index, scorer)
@@ -0,0 +1,105 @@
+import threading
+
+import pytest
+import sqlalchemy as sa
+
+from models import db
+
+@pytest.fixture
+def count_queries(app):
+    """Issue a GET with a client, returns (response, number of SQL statements it ran)"""
+    statements = []
+    request_thread = threading.get_ident()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # Match scores are recomputed in background threads meanwhile
+        if threading.get_ident() == request_thread:
+            statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    sa.event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+
+    def count_queries(client, path):
+        statements.clear()
+        response = client.get(path)
+        assert response.status_code == 200, response.data
+        return response, len(statements)
+
+    yield count_queries
+    sa.event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+def test_job_list(app, employer, post_job, count_queries):
+    anonymous = app.test_client()
+    post_job(employer)
+    # Job writes invalidate the cached search results, so both requests read the database
+    _, few = count_queries(anonymous, '/api/jobs')
+    for _ in range(5):
+        post_job(employer)
+    response, many = count_queries(anonymous, '/api/jobs')
+    assert len(response.json) >= 6
+    assert many == few
+
+def test_job_list_page(app, employer, post_job, count_queries):
+    anonymous = app.test_client()
+    post_job(employer)
+    _, few = count_queries(anonymous, '/api/jobs?limit=50')
+    for _ in range(5):
+        post_job(employer)
+    _, many = count_queries(anonymous, '/api/jobs?limit=50')
+    assert many == few
+
+def test_employer_jobs(employer, post_job, new_seeker, count_queries):
+    job_id = post_job(employer)
+    new_seeker().post(f'/api/jobs/{job_id}/apply', data={'coverLetter': 'Hello'})
+    _, few = count_queries(employer, '/api/jobs/employer')
+    for _ in range(5):
+        job_id = post_job(employer)
+        new_seeker().post(f'/api/jobs/{job_id}/apply', data={'coverLetter': 'Hello'})
+    response, many = count_queries(employer, '/api/jobs/employer')
+    assert len(response.json) == 6
+    assert many == few
+
+def test_seeker_applications(new_seeker, new_employer, post_job, count_queries):
+    seeker = new_seeker()
+
+    def apply_to_new_job():
+        employer = new_employer()
+        job_id = post_job(employer)
+        assert seeker.post(f'/api/jobs/{job_id}/apply', data={'coverLetter': 'Hello'}).status_code == 201
+
+    apply_to_new_job()
+    _, few = count_queries(seeker, '/api/applications')
+    for _ in range(5):
+        apply_to_new_job()
+    response, many = count_queries(seeker, '/api/applications')
+    assert len(response.json) == 6
+    assert many == few
+
+def test_job_applications(employer, post_job, new_seeker, count_queries):
+    job_id = post_job(employer)
+    new_seeker().post(f'/api/jobs/{job_id}/apply', data={'coverLetter': 'Hello'})
+    _, few = count_queries(employer, f'/api/jobs/{job_id}/applications')
+    for _ in range(5):
+        new_seeker().post(f'/api/jobs/{job_id}/apply', data={'coverLetter': 'Hello'})
+    response, many = count_queries(employer, f'/api/jobs/{job_id}/applications')
+    assert len(response.json) == 6
+    assert many == few
+
+def test_employer_profile(employer, post_job, new_seeker, count_queries):
+    job_id = post_job(employer)
+    new_seeker().post(f'/api/jobs/{job_id}/apply', data={'coverLetter': 'Hello'})
+    _, few = count_queries(employer, '/api/profile')
+    for _ in range(5):
+        job_id = post_job(employer)
+        new_seeker().post(f'/api/jobs/{job_id}/apply', data={'coverLetter': 'Hello'})
+    _, many = count_queries(employer, '/api/profile')
+    assert many == few
+
+def test_seeker_profile(new_seeker, count_queries):
+    seeker = new_seeker()
+    _, few = count_queries(seeker, '/api/profile')
+    assert seeker.post('/api/profile', data={'skills': '["Python", "SQL", "Django", "Docker", "React", "AWS"]'}).status_code == 200
+    response, many = count_queries(seeker, '/api/profile')
+    assert len(response.json['skills']) == 6
+    assert many == few
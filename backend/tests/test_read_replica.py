@@ -0,0 +1,44 @@
+import sqlalchemy as sa
+import pytest
+
+import app as careerconnect
+from models import Job, db
+from utils.db_tuning import READ_PRIMARY, REPLICA_BIND
+
+@pytest.fixture
+def lagging_replica(app, tmp_path, monkeypatch):
+    """A replica bind with the schema but none of the primary's rows, as if replication were far behind"""
+    replica = sa.create_engine(f'sqlite:///{tmp_path / "replica.db"}')
+    db.metadata.create_all(replica)
+    with app.app_context():
+        monkeypatch.setitem(db.engines, REPLICA_BIND, replica)
+    yield replica
+    replica.dispose()
+
+def test_get_requests_read_from_the_replica(app, lagging_replica, employer, post_job):
+    post_job(employer)
+    with app.test_request_context('/api/jobs', method='GET'):
+        assert db.session.get_bind(clause=sa.select(Job.id)) is lagging_replica
+        assert db.session.query(db.func.count(Job.id)).scalar() == 0
+
+def test_signatures_and_row_versions_read_from_the_primary(app, lagging_replica, employer, post_job):
+    post_job(employer)
+    with app.app_context():
+        primary = careerconnect.job_corpus_signature()
+        primary_skills = careerconnect.skill_dictionary_signature()
+    assert primary[0] > 0
+
+    with app.test_request_context('/api/jobs', method='GET'):
+        assert db.session.get_bind(clause=sa.select(Job.id).execution_options(**READ_PRIMARY)) is not lagging_replica
+        assert careerconnect.job_corpus_signature() == primary
+        assert careerconnect.skill_dictionary_signature() == primary_skills
+        assert careerconnect.row_versions(sa.select(db.func.count(Job.id)))[0] == primary[0]
+
+def test_index_rebuilds_read_from_the_primary(app, lagging_replica, employer, post_job):
+    job_id = post_job(employer, title='Replicated Beekeeper')
+    careerconnect.facet_index.signature = None
+
+    with app.test_request_context('/api/jobs', method='GET'):
+        index = careerconnect.get_facet_index()
+        assert job_id in index.slots
+        assert db.session.get_bind(clause=sa.select(Job.id)) is not lagging_replica
@@ -0,0 +1,17 @@
+def test_job_recommendations_are_scored(employer, seeker, post_job):
+    job_id = post_job(employer, title='Python Engineer', description='Python engineer writing SQL for our reporting')
+
+    recommendations = seeker.get('/api/recommendations/jobs', query_string={'limit': 100}).json
+    scores = {job['id']: job['matchScore'] for job in recommendations}
+    assert scores[job_id] == seeker.get(f'/api/jobs/{job_id}').json['matchScore']
+    # Both skills are in the description
+    assert scores[job_id] > 20
+
+def test_candidate_recommendations_are_scored(employer, new_seeker, post_job):
+    job_id = post_job(employer, title='Haskell Engineer', description='Haskell engineer for our compiler team')
+    new_seeker(skills=('Haskell', 'Compiler'))
+
+    candidates = employer.get(f'/api/recommendations/candidates/{job_id}').json
+    assert candidates
+    assert all(candidate['matchScore'] > 50 for candidate in candidates)
+    assert any(candidate['skills'] == ['Haskell', 'Compiler'] for candidate in candidates)
@@ -0,0 +1,44 @@
+import sys
+from datetime import datetime
+
+import pytest
+
+import app as careerconnect
+from models import Job, db
+from utils.result_cache import MemoryBackend, ResultCache
+
+def test_in_process_cache_sees_writes_of_other_workers(app, employer, post_job):
+    job_id = post_job(employer, title='Cached Lighthouse Keeper')
+    anonymous = app.test_client()
+    search = {'search': 'lighthouse'}
+
+    assert [job['title'] for job in anonymous.get('/api/jobs', query_string=search).json] == ['Cached Lighthouse Keeper']
+    hits = careerconnect.result_cache.hits
+    assert [job['title'] for job in anonymous.get('/api/jobs', query_string=search).json] == ['Cached Lighthouse Keeper']
+    assert careerconnect.result_cache.hits == hits + 1
+
+    # Another worker edits the job: nothing in this process bumps the cache
+    with app.app_context():
+        db.session.query(Job).filter(Job.id == job_id).update({
+            'title': 'Renamed Lighthouse Keeper', 'updated_at': datetime.utcnow()
+        })
+        db.session.commit()
+
+    assert [job['title'] for job in anonymous.get('/api/jobs', query_string=search).json] == ['Renamed Lighthouse Keeper']
+
+def test_check_keeps_entries_while_the_signature_holds():
+    cache = ResultCache(MemoryBackend())
+    cache.check((1, 1, 'a'))
+    _, key = cache.get('jobs', 'search=x')
+    cache.set(key, b'[]')
+
+    cache.check((1, 1, 'a'))
+    assert cache.get('jobs', 'search=x')[0] == b'[]'
+
+    cache.check((2, 2, 'b'))
+    assert cache.get('jobs', 'search=x')[0] is None
+
+def test_redis_url_without_the_redis_package(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'redis', None)
+    with pytest.raises(RuntimeError, match='pip install redis'):
+        ResultCache.from_url('redis://localhost:6379/0')
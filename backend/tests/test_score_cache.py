@@ -0,0 +1,80 @@
+import time
+
+import app as careerconnect
+from models import Job
+from utils.score_cache import ScoreCache, skills_hash
+
+def test_invalidate_job_drops_only_its_scores():
+    cache = ScoreCache()
+    python, java = skills_hash(['Python']), skills_hash(['Java'])
+    cache.set((python, 1, None), 50.0)
+    cache.set((java, 1, None), 40.0)
+    cache.set((python, 2, None), 30.0)
+
+    cache.invalidate_job(1)
+    assert cache.get((python, 1, None)) is None
+    assert cache.get((java, 1, None)) is None
+    assert cache.get((python, 2, None)) == 30.0
+    assert cache.invalidations == 2
+
+def test_invalidate_skills_drops_only_their_scores():
+    cache = ScoreCache()
+    python, java = skills_hash(['Python']), skills_hash(['Java'])
+    cache.set((python, 1, None), 50.0)
+    cache.set((java, 1, None), 40.0)
+
+    cache.invalidate_skills(skills_hash([' python ']))
+    assert cache.get((python, 1, None)) is None
+    assert cache.get((java, 1, None)) == 40.0
+
+def test_least_recently_used_is_evicted_and_forgotten():
+    cache = ScoreCache(max_entries=2)
+    key = skills_hash(['Python'])
+    cache.set((key, 1, None), 10.0)
+    cache.set((key, 2, None), 20.0)
+    cache.get((key, 1, None))
+    cache.set((key, 3, None), 30.0)
+
+    assert cache.get((key, 2, None)) is None
+    assert cache.get((key, 1, None)) == 10.0
+    assert cache.evictions == 1
+    # The evicted key left the job index too, invalidating it finds nothing
+    cache.invalidate_job(2)
+    assert cache.invalidations == 0
+
+def test_entries_expire():
+    cache = ScoreCache(ttl=0.01)
+    key = (skills_hash(['Python']), 1, None)
+    cache.set(key, 10.0)
+    time.sleep(0.02)
+    assert cache.get(key) is None
+    assert cache.expirations == 1
+    assert len(cache) == 0
+
+def test_edited_job_is_rescored(app, employer, post_job):
+    job_id = post_job(employer, title='Data Engineer', description='Data engineer writing Scala pipelines')
+    skills = ['Python', 'SQL']
+
+    with app.app_context():
+        before, = careerconnect.get_cached_match_scores(skills, [careerconnect.db.session.get(Job, job_id)])
+
+    response = employer.put(f'/api/jobs/{job_id}', json={'description': 'Data engineer writing Python and SQL pipelines'})
+    assert response.status_code == 200
+
+    with app.app_context():
+        after, = careerconnect.get_cached_match_scores(skills, [careerconnect.db.session.get(Job, job_id)])
+    assert after > before
+
+def test_refit_resets_the_cache(app, employer, post_job):
+    job_id = post_job(employer)
+
+    with app.app_context():
+        job = careerconnect.db.session.get(Job, job_id)
+        careerconnect.get_cached_match_scores(['Python'], [job])
+        key = (skills_hash(['Python']), job.id, job.updated_at)
+        assert careerconnect.score_cache.get(key) is not None
+
+        careerconnect.job_index.refit()
+        careerconnect.get_cached_match_scores(['Java'], [job])
+        assert careerconnect.score_cache.get(key) is None
+        assert careerconnect.score_cache.generation == careerconnect.job_index.generation
@@ -0,0 +1,78 @@
+import random
+
+import numpy as np
+import pytest
+
+from utils import seeker_index as seeker_index_module
+from utils.job_index import JobIndex
+from utils.matching import preprocess_text
+from utils.seeker_index import SeekerIndex
+
+SKILLS = ['Python', 'SQL', 'Django', 'Java', 'Spring', 'React', 'Docker', 'Go', 'C++', 'Excel']
+
+@pytest.fixture
+def job_index():
+    rng = random.Random(3)
+    index = JobIndex()
+    index.build([(job_id, preprocess_text(' '.join(rng.sample(SKILLS, 4)) + ' developer')) for job_id in range(30)], 'test')
+    return index
+
+def scores(index, job_index, seeker_ids=None):
+    ids, similarities, fractions = index.match(job_index, job_index.vector(0), job_index.job_text(0), seeker_ids)
+    return {seeker_id: (similarity, fraction) for seeker_id, similarity, fraction in zip(ids, similarities, fractions)}
+
+def test_updates_match_a_full_rebuild(job_index):
+    rng = random.Random(5)
+    index = SeekerIndex()
+    index.build([(seeker_id, rng.sample(SKILLS, 3)) for seeker_id in range(50)], 'test')
+    scores(index, job_index)
+
+    for step in range(200):
+        seeker_id = rng.randrange(60)
+        if rng.random() < 0.2:
+            index.remove(seeker_id)
+        else:
+            index.upsert(seeker_id, rng.sample(SKILLS, rng.randint(0, 4)) + ([f'Skill{step}'] if step % 10 == 0 else []))
+
+        if step % 9 == 0:
+            rebuilt = SeekerIndex()
+            rebuilt.build(index.skills.items(), 'test')
+            for seeker_ids in (None, [1, 2, 3, 99]):
+                actual, expected = scores(index, job_index, seeker_ids), scores(rebuilt, job_index, seeker_ids)
+                assert actual.keys() == expected.keys()
+                for seeker_id in actual:
+                    assert np.allclose(actual[seeker_id], expected[seeker_id])
+
+def test_update_only_vectorizes_the_seeker(job_index, monkeypatch):
+    index = SeekerIndex()
+    index.build([(seeker_id, ['Python', 'SQL']) for seeker_id in range(20)], 'test')
+    scores(index, job_index)
+
+    transformed = []
+    transform = job_index.transform
+    monkeypatch.setattr(job_index, 'transform', lambda texts: transformed.append(len(texts)) or transform(texts))
+    compiled = []
+    matcher = seeker_index_module.SkillMatcher
+    monkeypatch.setattr(seeker_index_module, 'SkillMatcher', lambda skills: compiled.append(len(skills)) or matcher(skills))
+
+    index.upsert(3, ['Java', 'SQL'])
+    assert scores(index, job_index)[3][1] > 0
+    assert transformed == [1]
+    assert compiled == [3]
+
+    # Known skills only, no new pattern for the automaton
+    index.upsert(4, ['Java'])
+    scores(index, job_index)
+    assert transformed == [1, 1]
+    assert compiled == [3]
+
+def test_refit_revectorizes_every_seeker(job_index):
+    index = SeekerIndex()
+    index.build([(seeker_id, ['Python', 'SQL']) for seeker_id in range(5)], 'test')
+    scores(index, job_index)
+
+    job_index.refit()
+    index.upsert(1, ['Java'])
+    assert set(scores(index, job_index)) == {0, 1, 2, 3, 4}
+    assert index.generation == job_index.generation
+    assert len(index.seeker_ids) == 5
@@ -0,0 +1,13 @@
+from utils.skill_dictionary import learnable_skill
+
+def test_learnable_skill_normalizes():
+    assert learnable_skill('Elixir') == 'elixir'
+    assert learnable_skill('Node.js') == 'node js'
+
+def test_learnable_skill_rejects_poor_terms():
+    # Normalize to a single letter or to nothing
+    assert learnable_skill('C++') is None
+    assert learnable_skill('R') is None
+    assert learnable_skill('++') is None
+    # No letters
+    assert learnable_skill('2024') is None
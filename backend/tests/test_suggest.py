@@ -0,0 +1,27 @@
+def suggest(client, q, **params):
+    response = client.get('/api/jobs/suggest', query_string={'q': q, **params})
+    assert response.status_code == 200
+    return response.json
+
+def test_suggestions_start_with_the_typed_prefix(employer, post_job, app):
+    post_job(employer, title='Zeppelin Pilot')
+    post_job(employer, title='Zeppelin Pilot')
+    post_job(employer, title='Zebra Keeper')
+    client = app.test_client()
+
+    titles = [item['text'] for item in suggest(client, 'zep') if item['type'] == 'title']
+    assert titles == ['Zeppelin Pilot']
+    assert [item['text'] for item in suggest(client, 'ze', type='title')][:2] == ['Zeppelin Pilot', 'Zebra Keeper']
+    assert suggest(client, '') == []
+
+def test_suggestions_follow_job_writes(employer, post_job, app):
+    job_id = post_job(employer, title='Quixotic Tiler')
+    client = app.test_client()
+    assert [item['text'] for item in suggest(client, 'quixotic')] == ['Quixotic Tiler']
+
+    assert employer.put(f'/api/jobs/{job_id}', json={'title': 'Quizzical Tiler'}).status_code == 200
+    assert suggest(client, 'quixotic') == []
+    assert [item['text'] for item in suggest(client, 'quizzical')] == ['Quizzical Tiler']
+
+    assert employer.delete(f'/api/jobs/{job_id}').status_code == 200
+    assert suggest(client, 'quizzical') == []
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from utils import topk
+from utils.job_index import JobIndex
+from utils.matching import calculate_seeker_to_jobs_scores, find_top_job_matches
+
+class Job:
+    def __init__(self, id, description):
+        self.id = id
+        self.description = description
+
+@pytest.fixture(scope='module')
+def corpus():
+    rng = random.Random(7)
+    words = [f'word{i}' for i in range(2000)]
+    skills = ['python', 'java', 'javascript', 'react', 'sql', 'docker']
+
+    def description():
+        # Filler words, and each skill in a fifth of the jobs
+        text = rng.choices(words, k=50) + [skill for skill in skills if rng.random() < 0.2]
+        rng.shuffle(text)
+        return ' '.join(text)
+
+    jobs = [Job(job_id, description()) for job_id in range(3000)]
+    index = JobIndex()
+    index.build([(job.id, job.description) for job in jobs], 'test')
+    return index, jobs
+
+@pytest.fixture
+def scored_postings(monkeypatch):
+    """Number of postings whose weight WAND read to score a job"""
+    counter = {'count': 0}
+    contribution = topk._Cursor.contribution
+
+    def counting(cursor):
+        counter['count'] += 1
+        return contribution(cursor)
+
+    monkeypatch.setattr(topk._Cursor, 'contribution', counting)
+    return counter
+
+def exhaustive_top_k(index, skills, jobs, k):
+    scores = calculate_seeker_to_jobs_scores(index, skills, jobs)
+    return sorted(scores, reverse=True)[:k]
+
+@pytest.mark.parametrize('skills', [['python', 'sql', 'word3'], ['java', 'react', 'word10', 'word11']])
+def test_top_k_matches_exhaustive_scoring(corpus, skills):
+    index, jobs = corpus
+    matches = find_top_job_matches(index, skills, 10)
+    assert [score for _, score in matches] == exhaustive_top_k(index, skills, jobs, 10)
+
+def test_top_k_skips_postings(corpus, scored_postings):
+    index, jobs = corpus
+    skills = ['python', 'sql', 'docker']
+    inverted = index.inverted_index()
+    query = index.vectorizer.transform([' '.join(skills)])
+    term_postings = sum(int(inverted.indptr[term + 1] - inverted.indptr[term]) for term in query.indices)
+    bonus_postings = sum(len(inverted.substring_postings(skill, index.texts)) for skill in skills)
+
+    matches = find_top_job_matches(index, skills, 5)
+
+    assert [score for _, score in matches] == exhaustive_top_k(index, skills, jobs, 5)
+    assert scored_postings['count'] < (term_postings + bonus_postings) / 2
+
+def test_top_k_fills_with_unmatched_jobs(corpus):
+    index, _ = corpus
+    # No job mentions it, every job scores 0
+    matches = find_top_job_matches(index, ['fortran'], 3)
+    assert matches == [(0, 0.0), (1, 0.0), (2, 0.0)]
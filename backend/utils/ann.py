@@ -0,0 +1,222 @@
+import os
+import tempfile
+import threading
+
+import numpy as np
+import scipy.sparse as sp
+
+# Rows scored per block when assigning vectors to centroids
+ASSIGN_BLOCK_SIZE = 65536
+
+def _normalize_rows(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+def _nearest_centroids(vectors, centroids):
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), ASSIGN_BLOCK_SIZE):
+        block = np.asarray(vectors[start:start + ASSIGN_BLOCK_SIZE], dtype=np.float32)
+        assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+def spherical_kmeans(vectors, clusters, iterations=10, max_samples_per_cluster=256, seed=0):
+    """K-means on the unit sphere (cosine distance), trained on a sample of the vectors"""
+    rng = np.random.default_rng(seed)
+
+    sample_size = min(len(vectors), clusters * max_samples_per_cluster)
+    sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))], dtype=np.float32)
+
+    centroids = sample[rng.choice(len(sample), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = _nearest_centroids(sample, centroids)
+
+        # Per-cluster sums as one sparse (clusters x samples) product
+        membership = sp.csr_matrix(
+            (np.ones(len(sample), dtype=np.float32), (assignments, np.arange(len(sample)))),
+            shape=(clusters, len(sample))
+        )
+        sums = np.asarray(membership @ sample)
+
+        # Re-seed empty clusters with random sample points
+        empty = np.flatnonzero(np.bincount(assignments, minlength=clusters) == 0)
+        if len(empty):
+            sums[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+
+        centroids = _normalize_rows(sums).astype(np.float32)
+
+    return centroids
+
+class IVFIndex:
+    """
+    Inverted-file (IVF-flat) approximate nearest neighbour index over unit vectors
+
+    Vectors are assigned to the closest of ``nlist`` k-means centroids and a
+    query only scans the lists of its ``nprobe`` closest centroids. nprobe is
+    the recall/latency knob: nprobe == nlist is an exact search. Below
+    ``min_train_size`` vectors the index stays untrained and searches
+    exhaustively. Items are keyed by integer ids (job or user ids) and can be
+    added, updated and removed in place.
+    """
+
+    def __init__(self, dimensions, nprobe=8, min_train_size=1024, seed=0):
+        self.dimensions = dimensions
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.seed = seed
+
+        self.ids = []                 # row -> id
+        self.rows = {}                # id -> row
+        self.vectors = np.zeros((0, dimensions), dtype=np.float32)
+        self.assignments = np.zeros(0, dtype=np.int64)
+        self.centroids = None
+        self.trained_size = 0
+
+        self._lists = None            # (rows ordered by list, list offsets), rebuilt lazily
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def nlist(self):
+        return 0 if self.centroids is None else len(self.centroids)
+
+    def build(self, ids, vectors):
+        """Replace the contents and (re)train the coarse quantizer"""
+        with self._lock:
+            self.ids = list(ids)
+            self.rows = {item_id: row for row, item_id in enumerate(self.ids)}
+            self.vectors = vectors if isinstance(vectors, np.memmap) else np.asarray(vectors, dtype=np.float32)
+            self.train()
+
+    def train(self):
+        with self._lock:
+            count = len(self.ids)
+            if count < self.min_train_size:
+                self.centroids = None
+                self.assignments = np.zeros(count, dtype=np.int64)
+            else:
+                clusters = max(1, min(int(4 * np.sqrt(count)), count // 32))
+                self.centroids = spherical_kmeans(self.vectors, clusters, seed=self.seed)
+                self.assignments = _nearest_centroids(self.vectors, self.centroids)
+            self.trained_size = count
+            self._lists = None
+
+    def upsert(self, item_id, vector):
+        """Add an item or replace its vector"""
+        with self._lock:
+            vector = np.asarray(vector, dtype=np.float32)
+            assignment = 0 if self.centroids is None else int(np.argmax(self.centroids @ vector))
+
+            row = self.rows.get(item_id)
+            if row is None:
+                self.rows[item_id] = len(self.ids)
+                self.ids.append(item_id)
+                self.vectors = np.vstack([self.vectors, vector[None, :]])
+                self.assignments = np.append(self.assignments, assignment)
+            else:
+                self.vectors[row] = vector
+                self.assignments[row] = assignment
+            self._lists = None
+
+            # Retrain once the index has doubled (or first reaches the training size)
+            if len(self.ids) >= max(self.min_train_size, 2 * self.trained_size):
+                self.train()
+
+    def remove(self, item_id):
+        with self._lock:
+            row = self.rows.pop(item_id, None)
+            if row is None:
+                return
+
+            # Move the last row into the gap
+            last = len(self.ids) - 1
+            if row != last:
+                self.vectors[row] = self.vectors[last]
+                self.assignments[row] = self.assignments[last]
+                self.ids[row] = self.ids[last]
+                self.rows[self.ids[row]] = row
+            self.ids.pop()
+            self.vectors = self.vectors[:last]
+            self.assignments = self.assignments[:last]
+            self._lists = None
+
+    def get(self, item_id):
+        row = self.rows.get(item_id)
+        return None if row is None else self.vectors[row]
+
+    def _inverted_lists(self):
+        if self._lists is None:
+            order = np.argsort(self.assignments, kind='stable')
+            offsets = np.searchsorted(self.assignments[order], np.arange(self.nlist + 1))
+            self._lists = (order, offsets)
+        return self._lists
+
+    def similarities(self, vector):
+        """Exact (ids, cosine similarities) of every item against a unit vector"""
+        with self._lock:
+            return list(self.ids), np.asarray(self.vectors @ np.asarray(vector, dtype=np.float32))
+
+    def search(self, vector, k, nprobe=None, ids=None):
+        """
+        Approximate k nearest items as (id, cosine similarity) tuples, best first
+
+        With ``ids`` only those items are scanned, exactly.
+        """
+        with self._lock:
+            if not self.ids or k <= 0:
+                return []
+
+            vector = np.asarray(vector, dtype=np.float32)
+
+            if ids is not None:
+                rows = np.array([self.rows[item_id] for item_id in ids if item_id in self.rows], dtype=np.int64)
+            elif self.centroids is None:
+                rows = np.arange(len(self.ids))
+            else:
+                nprobe = min(nprobe or self.nprobe, self.nlist)
+                probed = np.argpartition(-(self.centroids @ vector), nprobe - 1)[:nprobe]
+                order, offsets = self._inverted_lists()
+                rows = np.concatenate([order[offsets[c]:offsets[c + 1]] for c in probed])
+
+            if len(rows) == 0:
+                return []
+
+            similarities = np.asarray(self.vectors[rows] @ vector)
+            count = min(k, len(rows))
+            best = np.argpartition(-similarities, count - 1)[:count]
+            best = best[np.argsort(-similarities[best], kind='stable')]
+
+            return [(self.ids[rows[i]], float(similarities[i])) for i in best]
+
+    def save(self, path, **metadata):
+        """Write the index to ``path`` (.npz) atomically, with string metadata"""
+        with self._lock:
+            directory = os.path.dirname(path) or '.'
+            os.makedirs(directory, exist_ok=True)
+
+            with tempfile.NamedTemporaryFile(dir=directory, suffix='.npz', delete=False) as f:
+                np.savez(
+                    f,
+                    ids=np.array(self.ids, dtype=np.int64),
+                    vectors=np.asarray(self.vectors),
+                    assignments=self.assignments,
+                    centroids=self.centroids if self.centroids is not None else np.zeros((0, self.dimensions), dtype=np.float32),
+                    trained_size=np.array(self.trained_size),
+                    metadata=np.array([f"{key}={value}" for key, value in sorted(metadata.items())])
+                )
+            os.replace(f.name, path)
+
+    @classmethod
+    def load(cls, path, nprobe=8, min_train_size=1024):
+        """Read an index written by save(); returns (index, metadata dict)"""
+        with np.load(path) as data:
+            index = cls(data['vectors'].shape[1], nprobe=nprobe, min_train_size=min_train_size)
+            index.ids = data['ids'].tolist()
+            index.rows = {item_id: row for row, item_id in enumerate(index.ids)}
+            index.vectors = data['vectors']
+            index.assignments = data['assignments']
+            index.centroids = data['centroids'] if len(data['centroids']) else None
+            index.trained_size = int(data['trained_size'])
+            metadata = dict(entry.split('=', 1) for entry in data['metadata'].tolist())
+        return index, metadata
@@ -0,0 +1,48 @@
+import zlib
+
+# Supported content codings, preferred first, and their zlib window bits
+ENCODINGS = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS,  # HTTP "deflate" is the zlib format
+}
+
+def negotiate_encoding(accept_encoding):
+    """Content coding to use for an Accept-Encoding header, None for identity"""
+    accepted = {}
+    for item in (accept_encoding or '').split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    candidates = [
+        (accepted.get(encoding, accepted.get('*', 0.0)), -rank, encoding)
+        for rank, encoding in enumerate(ENCODINGS)
+    ]
+    quality, _, encoding = max(candidates)
+    return encoding if quality > 0 else None
+
+def compress(data, encoding, level=6):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, ENCODINGS[encoding])
+    return compressor.compress(data) + compressor.flush()
+
+def compress_chunks(chunks, encoding, level=6):
+    """
+    Compress a stream of byte chunks as they come
+
+    Every chunk is sync-flushed, so what has been produced so far reaches
+    the client instead of waiting in the compressor for the end of the
+    stream.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, ENCODINGS[encoding])
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
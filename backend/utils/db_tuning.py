@@ -0,0 +1,113 @@
+import sqlalchemy as sa
+from flask import has_request_context, request
+from flask_sqlalchemy.session import Session
+
+# Bind key of the optional read replica in SQLALCHEMY_BINDS
+REPLICA_BIND = 'replica'
+
+# Methods whose reads may be served by the replica
+READ_METHODS = ('GET', 'HEAD')
+
+# Execution options of a SELECT that must see the primary's latest writes
+READ_PRIMARY = {'read_primary': True}
+
+def engine_options(url, config, read_only=False):
+    """
+    SQLAlchemy engine options for a database URL, chosen by its scheme
+
+    Postgres engines get an explicitly sized pool whose connections are
+    pinged before use (a failover or an idle timeout on the server would
+    otherwise fail the next request) and a server-side statement timeout.
+    SQLite needs nothing here, its tuning is done per connection by
+    ``tune_engine``.
+    """
+    backend = sa.engine.make_url(url).get_backend_name()
+    if backend != 'postgresql':
+        return {}
+
+    settings = [f"statement_timeout={int(config['DB_STATEMENT_TIMEOUT_MS'])}"]
+    if read_only:
+        # A write routed to the replica by mistake fails here rather than on the replica's own check
+        settings.append('default_transaction_read_only=on')
+    return {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': True,
+        'connect_args': {'options': ' '.join(f'-c {setting}' for setting in settings)},
+    }
+
+def sqlite_pragmas(config):
+    """PRAGMA statements run on every new SQLite connection"""
+    return [
+        # Readers no longer wait for writers, and commits append to the log instead of rewriting pages
+        'PRAGMA journal_mode=WAL',
+        # Durable at each checkpoint rather than each commit, which is safe in WAL mode
+        'PRAGMA synchronous=NORMAL',
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+        # Negative sizes are in KiB rather than pages
+        f"PRAGMA cache_size={-int(config['SQLITE_CACHE_SIZE_KB'])}",
+    ]
+
+def tune_engine(engine, config):
+    """Apply the per-connection settings of the engine's database, call before it connects"""
+    if engine.dialect.name != 'sqlite':
+        return
+
+    pragmas = sqlite_pragmas(config)
+
+    @sa.event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+def without_statement_timeout(connection):
+    """Lift the statement timeout for the rest of the connection's transaction (DDL, backfills)"""
+    if connection.dialect.name == 'postgresql':
+        connection.execute(sa.text('SET LOCAL statement_timeout = 0'))
+
+class RoutingSession(Session):
+    """
+    Session sending the SELECTs of GET requests to the read replica, if one is configured
+
+    Everything else goes to the primary: writes, raw SQL (which may
+    write), work outside requests and, once a request's session has
+    flushed or run such a statement, the rest of that request, so it
+    reads its own writes. Reads of a GET that follows a write may still
+    lag behind it by the replication delay, except SELECTs given the
+    READ_PRIMARY execution options: signatures and row versions that decide
+    whether an in-process index or a client's copy is current.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._reads_from_replica(clause):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self, clause):
+        if self._flushing or self.info.get('wrote') or self.info.get('read_primary'):
+            return False
+        if not isinstance(clause, (sa.Select, sa.CompoundSelect)):
+            if clause is not None:
+                # Bulk DML and raw SQL may write
+                self.info['wrote'] = True
+            return False
+        if clause.get_execution_options().get('read_primary'):
+            return False
+        return has_request_context() and request.method in READ_METHODS
+
+def read_primary(session):
+    """Send the rest of a session's reads to the primary, e.g. to rebuild what a READ_PRIMARY signature describes"""
+    session.info['read_primary'] = True
+
+@sa.event.listens_for(RoutingSession, 'after_flush')
+def pin_to_primary(session, flush_context):
+    session.info['wrote'] = True
@@ -0,0 +1,195 @@
+import json
+import os
+import pickle
+import tempfile
+
+import numpy as np
+
+from utils.ann import IVFIndex
+from utils.matching import MODEL_PATH, preprocess_text
+
+class _Attributes:
+    """Stand-in for gensim classes when reading a pickled model without gensim"""
+
+class _ModelUnpickler(pickle.Unpickler):
+    # Only numpy and plain containers are reconstructed, gensim objects become bare attribute holders
+    ALLOWED_MODULES = ('numpy', 'builtins', 'collections', 'copyreg')
+
+    def find_class(self, module, name):
+        if module.startswith('gensim'):
+            return type(name, (_Attributes,), {})
+        if module.split('.')[0] in self.ALLOWED_MODULES:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"Unexpected class {module}.{name} in model file")
+
+def _sidecar_paths(model_path):
+    return model_path + '.vectors.npy', model_path + '.vocab.json'
+
+def export_word2vec(model_path):
+    """
+    Extract the word vectors of a saved gensim Word2Vec model into sidecar files
+
+    Writes ``<model>.vectors.npy`` (unit-normalized float32 rows) and
+    ``<model>.vocab.json`` (row -> word). Files are written atomically, so
+    several workers can race to export without reading a partial file.
+    """
+    with open(model_path, 'rb') as f:
+        model = _ModelUnpickler(f).load()
+
+    keyed_vectors = getattr(model, 'wv', model)
+    vectors = getattr(keyed_vectors, 'vectors', None)
+    if vectors is None:
+        # Large arrays are saved by gensim next to the model file
+        vectors = np.load(model_path + '.wv.vectors.npy', mmap_mode='r')
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.where(norms > 0, norms, 1)
+
+    vectors_path, vocab_path = _sidecar_paths(model_path)
+    directory = os.path.dirname(model_path)
+
+    with tempfile.NamedTemporaryFile(dir=directory, suffix='.npy', delete=False) as f:
+        np.save(f, vectors)
+    os.replace(f.name, vectors_path)
+
+    with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.json', delete=False) as f:
+        json.dump(list(keyed_vectors.index_to_key), f)
+    os.replace(f.name, vocab_path)
+
+class EmbeddingTable:
+    """
+    Unit-normalized embeddings keyed by id (job id or user id)
+
+    Stored in an IVF index so nearest neighbours can be found without
+    scanning every row.
+    """
+
+    def __init__(self, dimensions, nprobe=8, min_train_size=1024):
+        self.index = IVFIndex(dimensions, nprobe=nprobe, min_train_size=min_train_size)
+        self.signature = None         # database state the table was built from
+
+    @property
+    def ids(self):
+        return self.index.ids
+
+    @property
+    def vectors(self):
+        return self.index.vectors
+
+    def build(self, ids, vectors, signature=None):
+        """Replace the table; rows with a zero vector (no known words) are left out"""
+        keep = np.flatnonzero(np.any(vectors != 0, axis=1))
+        self.index.build([ids[i] for i in keep], np.ascontiguousarray(vectors[keep], dtype=np.float32))
+        self.signature = signature
+
+    def upsert(self, item_id, vector):
+        if vector is None:
+            self.index.remove(item_id)
+        else:
+            self.index.upsert(item_id, vector)
+
+    def remove(self, item_id):
+        self.index.remove(item_id)
+
+    def get(self, item_id):
+        return self.index.get(item_id)
+
+    def similarities(self, vector):
+        """(ids, cosine similarities) of every row against a unit vector"""
+        return self.index.similarities(vector)
+
+    def search(self, vector, k, nprobe=None, ids=None):
+        """Approximate k most similar rows (exact among ``ids`` if given) as (id, cosine similarity) tuples"""
+        return self.index.search(vector, k, nprobe, ids)
+
+    def save(self, path):
+        self.index.save(path, signature=repr(self.signature))
+
+    def load(self, path, signature):
+        """Load a saved table if it was built from ``signature``; returns whether it was"""
+        if not os.path.exists(path):
+            return False
+        try:
+            index, metadata = IVFIndex.load(path, self.index.nprobe, self.index.min_train_size)
+        except Exception as e:
+            print(f"Error loading embedding index {path}: {e}")
+            return False
+        if metadata.get('signature') != repr(signature):
+            return False
+        self.index = index
+        self.signature = signature
+        return True
+
+class EmbeddingStore:
+    """
+    Word2Vec vectors memory-mapped read-only from the exported sidecar file
+
+    Every worker process maps the same file, so the operating system keeps a
+    single copy of the vector table in the page cache instead of one per
+    worker. Document vectors are the normalized mean of their word vectors;
+    precomputed job and seeker embeddings live in ``jobs`` and ``seekers``.
+    """
+
+    def __init__(self, vectors, vocabulary, nprobe=8, min_train_size=1024):
+        self.vectors = vectors
+        self.vocabulary = vocabulary
+        self.key_to_index = {word: i for i, word in enumerate(vocabulary)}
+        self.dimensions = vectors.shape[1]
+        self.nprobe = nprobe
+
+        self.jobs = EmbeddingTable(self.dimensions, nprobe, min_train_size)
+        self.seekers = EmbeddingTable(self.dimensions, nprobe, min_train_size)
+
+    @classmethod
+    def load(cls, model_path=MODEL_PATH, **kwargs):
+        """Map the exported vectors, exporting them first if missing or outdated"""
+        vectors_path, vocab_path = _sidecar_paths(model_path)
+
+        outdated = not os.path.exists(vectors_path) or not os.path.exists(vocab_path)
+        if not outdated and os.path.exists(model_path):
+            outdated = os.path.getmtime(vectors_path) < os.path.getmtime(model_path)
+        if outdated:
+            export_word2vec(model_path)
+
+        with open(vocab_path) as f:
+            vocabulary = json.load(f)
+
+        return cls(np.load(vectors_path, mmap_mode='r'), vocabulary, **kwargs)
+
+    def token_ids(self, text):
+        """Vocabulary rows of the tokens of a document, skipping unknown words"""
+        key_to_index = self.key_to_index
+        return [key_to_index[token] for token in preprocess_text(text).split() if token in key_to_index]
+
+    def document_vector(self, text):
+        """Unit-normalized mean word vector of a document, or None if no word is known"""
+        ids = self.token_ids(text)
+        if not ids:
+            return None
+        return self._normalize(np.take(self.vectors, ids, axis=0).mean(axis=0))
+
+    def document_vectors(self, texts):
+        """Document vectors for many texts, zero rows for texts without known words"""
+        token_ids = [self.token_ids(text) for text in texts]
+        counts = np.array([len(ids) for ids in token_ids])
+        result = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+
+        non_empty = np.flatnonzero(counts)
+        if len(non_empty) == 0:
+            return result
+
+        # One gather for every token, then a segmented sum per document
+        flat_ids = np.fromiter((i for ids in token_ids for i in ids), dtype=np.int64, count=counts.sum())
+        offsets = np.concatenate(([0], np.cumsum(counts[non_empty])[:-1]))
+        sums = np.add.reduceat(np.take(self.vectors, flat_ids, axis=0), offsets, axis=0)
+
+        means = sums / counts[non_empty, None]
+        norms = np.linalg.norm(means, axis=1, keepdims=True)
+        result[non_empty] = means / np.where(norms > 0, norms, 1)
+        return result
+
+    @staticmethod
+    def _normalize(vector):
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
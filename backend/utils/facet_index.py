@@ -0,0 +1,173 @@
+import threading
+import time
+
+import numpy as np
+
+# Facets with one value per job, in the order of the rows given to the index
+VALUE_FACETS = ('jobType', 'location', 'experienceLevel')
+
+class FacetIndex:
+    """
+    In-memory facet counts over the active jobs
+
+    Every job gets a slot holding one integer code per value facet (job
+    type, location, experience level) and its remote flag. A query is a
+    boolean mask over the slots, so the counts of a facet are a bincount of
+    its codes under the mask of every *other* filter (a facet's own filter
+    does not narrow its own counts). Jobs are added, replaced and removed
+    in place; the arrays are rebuilt lazily on the first query after a write.
+
+    ``labels`` optionally maps a facet to a function giving the label a
+    value is counted under (None keeps the value), e.g. the place a location
+    text resolves to. Filters still apply to the values themselves.
+    """
+
+    def __init__(self, labels=None):
+        self.labels = labels or {}
+        self._reset()
+        self.signature = None    # database state the index was built from
+        self.built_at = 0.0
+        self._lock = threading.RLock()
+
+    def _reset(self):
+        self.slot_job_ids = []   # slot -> job id (None for removed rows)
+        self.slots = {}          # job id -> slot
+        self.codes = {facet: [] for facet in VALUE_FACETS}
+        self.remote = []
+
+        self.values = {facet: [] for facet in VALUE_FACETS}   # code -> value
+        self.value_codes = {facet: {} for facet in VALUE_FACETS}
+        self.value_labels = {facet: [] for facet in VALUE_FACETS}   # code -> label
+
+        self._arrays = None      # (live, codes, remote, job id -> slot) arrays, built on the next query
+
+    def build(self, jobs, signature=None):
+        """Rebuild from (job_id, type, location, experience level, is_remote) rows"""
+        with self._lock:
+            self._reset()
+            for job in jobs:
+                self._append(*job)
+            self.signature = signature
+            self.built_at = time.time()
+
+    def is_stale(self, max_age):
+        return time.time() - self.built_at > max_age
+
+    def upsert(self, job_id, job_type, location, experience_level, is_remote):
+        with self._lock:
+            self._tombstone(job_id)
+            self._append(job_id, job_type, location, experience_level, is_remote)
+            self._arrays = None
+
+    def remove(self, job_id):
+        with self._lock:
+            if self._tombstone(job_id):
+                self._arrays = None
+
+    def _append(self, job_id, *fields):
+        self.slots[job_id] = len(self.slot_job_ids)
+        self.slot_job_ids.append(job_id)
+        for facet, value in zip(VALUE_FACETS, fields):
+            self.codes[facet].append(self._code(facet, value))
+        self.remote.append(bool(fields[-1]))
+
+    def _code(self, facet, value):
+        code = self.value_codes[facet].get(value)
+        if code is None:
+            code = len(self.values[facet])
+            self.value_codes[facet][value] = code
+            self.values[facet].append(value)
+            label = self.labels[facet](value) if facet in self.labels else None
+            self.value_labels[facet].append(value if label is None else label)
+        return code
+
+    def _tombstone(self, job_id):
+        # The slot is reclaimed on the next build
+        slot = self.slots.pop(job_id, None)
+        if slot is None:
+            return False
+        self.slot_job_ids[slot] = None
+        return True
+
+    def _get_arrays(self):
+        if self._arrays is None:
+            job_ids = np.array(list(self.slots), dtype=np.int64)
+            slot_of = np.full(int(job_ids.max()) + 1 if len(job_ids) else 0, -1, dtype=np.int64)
+            slot_of[job_ids] = list(self.slots.values())
+            self._arrays = (
+                np.array([job_id is not None for job_id in self.slot_job_ids], dtype=bool),
+                {facet: np.array(codes, dtype=np.int64) for facet, codes in self.codes.items()},
+                np.array(self.remote, dtype=bool),
+                slot_of
+            )
+        return self._arrays
+
+    def counts(self, filters, job_ids=None):
+        """
+        Facet counts of the jobs matching ``filters``, optionally among ``job_ids``
+
+        ``filters`` maps 'jobType' and 'experienceLevel' to lists of exact
+        values, 'location' to a list of case-insensitive substrings or to a
+        predicate on the location text, and 'remote' to True when only
+        remote jobs are wanted. Returns
+        {facet: [{'value', 'count'}]} keyed by label, most frequent first.
+        """
+        with self._lock:
+            live, codes, remote, slot_of = self._get_arrays()
+            values = {facet: list(self.values[facet]) for facet in VALUE_FACETS}
+            labels = {facet: list(self.value_labels[facet]) for facet in VALUE_FACETS}
+
+        base = live
+        if job_ids is not None:
+            job_ids = np.asarray(job_ids, dtype=np.int64)
+            slots = slot_of[job_ids[(job_ids >= 0) & (job_ids < len(slot_of))]]
+            base = np.zeros(len(live), dtype=bool)
+            base[slots[slots >= 0]] = True
+
+        # Mask of every filter given, by facet
+        masks = {}
+        for facet in VALUE_FACETS:
+            wanted = filters.get(facet)
+            if not wanted:
+                continue
+            if callable(wanted):
+                allowed = np.array([wanted(value) for value in values[facet]], dtype=bool)
+            elif facet == 'location':
+                needles = [needle.lower() for needle in wanted]
+                allowed = np.array([
+                    value is not None and any(needle in value.lower() for needle in needles)
+                    for value in values[facet]
+                ], dtype=bool)
+            else:
+                allowed = np.array([value in wanted for value in values[facet]], dtype=bool)
+            masks[facet] = allowed[codes[facet]] if len(allowed) else np.zeros(len(live), dtype=bool)
+        if filters.get('remote'):
+            masks['remote'] = remote
+
+        def others(facet):
+            mask = base
+            for other, other_mask in masks.items():
+                if other != facet:
+                    mask = mask & other_mask
+            return mask
+
+        result = {}
+        for facet in VALUE_FACETS:
+            counts = np.bincount(codes[facet][others(facet)], minlength=len(values[facet]))
+            totals = {}
+            for code, count in enumerate(counts):
+                label = labels[facet][code]
+                if count and label not in (None, ''):
+                    totals[label] = totals.get(label, 0) + int(count)
+            result[facet] = sorted(
+                [{'value': label, 'count': count} for label, count in totals.items()],
+                key=lambda item: (-item['count'], item['value'])
+            )
+
+        mask = others('remote')
+        remote_count = int(np.count_nonzero(remote[mask]))
+        result['remote'] = [
+            {'value': True, 'count': remote_count},
+            {'value': False, 'count': int(np.count_nonzero(mask)) - remote_count}
+        ]
+        return result
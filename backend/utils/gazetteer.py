@@ -0,0 +1,112 @@
+import csv
+import threading
+from collections import namedtuple
+
+from utils.geo import geohash
+from utils.matching import preprocess_text
+
+Place = namedtuple('Place', ['name', 'city', 'region', 'country', 'latitude', 'longitude', 'geohash'])
+
+# Location texts that name no place
+NON_PLACES = {'', 'remote', 'anywhere', 'worldwide', 'hybrid', 'on site', 'onsite'}
+
+# Aliases this short are too ambiguous to be searched for inside a longer text
+MIN_EMBEDDED_ALIAS_LENGTH = 4
+
+# Resolved texts kept in memory, location texts repeat a lot
+MAX_CACHED_TEXTS = 100000
+
+class UnknownLocation(ValueError):
+    pass
+
+class Gazetteer:
+    """
+    Offline list of places with coordinates, loaded from a bundled CSV
+
+    ``resolve`` maps free-text locations such as "NYC", "New York, NY" or
+    "Greater Boston Area" to one canonical Place: the text before the first
+    comma is looked up by name or alias (the rest of the text breaks ties
+    between places of the same name), then the longest known name found
+    anywhere in the text.
+    """
+
+    def __init__(self, places, aliases=()):
+        self.places = list(places)
+
+        # Normalized name or alias -> places, most populous first (file order)
+        self.by_name = {}
+        for place in self.places:
+            self._add(place.city, place)
+        for alias, place in aliases:
+            self._add(alias, place)
+        self.max_words = max((len(name.split()) for name in self.by_name), default=0)
+
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _add(self, name, place):
+        name = preprocess_text(name)
+        if name:
+            candidates = self.by_name.setdefault(name, [])
+            if place not in candidates:
+                candidates.append(place)
+
+    @classmethod
+    def load(cls, path):
+        places, aliases = [], []
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                latitude, longitude = float(row['latitude']), float(row['longitude'])
+                name = ', '.join(part for part in (row['name'], row['region'], row['country']) if part)
+                place = Place(name, row['name'], row['region'], row['country'], latitude, longitude, geohash(latitude, longitude))
+                places.append(place)
+                aliases.extend((alias, place) for alias in row['aliases'].split('|') if alias)
+        return cls(places, aliases)
+
+    def resolve(self, text):
+        """Canonical Place of a free-text location, or None"""
+        if not text:
+            return None
+        with self._lock:
+            if text in self._cache:
+                return self._cache[text]
+
+        place = self._resolve(text)
+        with self._lock:
+            if len(self._cache) >= MAX_CACHED_TEXTS:
+                self._cache.clear()
+            self._cache[text] = place
+        return place
+
+    def place_name(self, text):
+        """Canonical name of the place a free-text location refers to, or None"""
+        place = self.resolve(text)
+        return place.name if place is not None else None
+
+    def _resolve(self, text):
+        parts = [preprocess_text(part) for part in text.split(',')]
+        if ' '.join(parts).strip() in NON_PLACES:
+            return None
+
+        qualifiers = {part for part in parts[1:] if part}
+        candidates = self.by_name.get(parts[0])
+        if candidates:
+            return self._pick(candidates, qualifiers)
+
+        # Longest known name inside the text, e.g. "greater boston area"
+        words = ' '.join(parts).split()
+        for length in range(min(self.max_words, len(words)), 0, -1):
+            for start in range(len(words) - length + 1):
+                name = ' '.join(words[start:start + length])
+                if len(name) < MIN_EMBEDDED_ALIAS_LENGTH:
+                    continue
+                candidates = self.by_name.get(name)
+                if candidates:
+                    return self._pick(candidates, qualifiers | set(words))
+        return None
+
+    def _pick(self, candidates, qualifiers):
+        for place in candidates:
+            if preprocess_text(place.region) in qualifiers or preprocess_text(place.country) in qualifiers:
+                return place
+        return candidates[0]
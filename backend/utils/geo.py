@@ -0,0 +1,77 @@
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Most geohash cells a radius query is expanded into before using coarser cells
+MAX_COVER_CELLS = 16
+
+def geohash(latitude, longitude, precision=8):
+    """Geohash of a point; points sharing a prefix lie in the same grid cell"""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, value, even = 0, 0, True
+    while len(chars) < precision:
+        # Bits alternate between longitude and latitude, longitude first
+        bounds, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+def cell_size(precision):
+    """(height, width) in degrees of a geohash cell"""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+def distance_km(latitude1, longitude1, latitude2, longitude2):
+    """Great-circle (haversine) distance between two points"""
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(longitude2 - longitude1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def geohash_cover(latitude, longitude, radius_km):
+    """
+    Geohash prefixes whose cells together cover a circle
+
+    Uses the finest precision for which the circle's bounding box spans at
+    most MAX_COVER_CELLS cells, so a radius query is a handful of prefix
+    range scans. The cells overshoot the circle; callers filter the
+    candidates by exact distance.
+    """
+    dlat = radius_km / KM_PER_DEGREE
+    cos_lat = math.cos(math.radians(min(89.0, abs(latitude) + dlat)))
+    dlon = min(180.0, radius_km / (KM_PER_DEGREE * cos_lat))
+
+    south, north = max(-90.0, latitude - dlat), min(90.0, latitude + dlat)
+
+    for precision in range(8, 0, -1):
+        height, width = cell_size(precision)
+        rows = int((north - south) / height) + 2
+        columns = int(2 * dlon / width) + 2
+        if rows * columns <= MAX_COVER_CELLS or precision == 1:
+            break
+
+    cells = set()
+    for row in range(rows):
+        cell_latitude = min(north, south + row * height)
+        for column in range(columns):
+            cell_longitude = min(longitude + dlon, longitude - dlon + column * width)
+            # Wrap around the antimeridian
+            cell_longitude = (cell_longitude + 180.0) % 360.0 - 180.0
+            cells.add(geohash(cell_latitude, cell_longitude, precision))
+    return sorted(cells)
@@ -0,0 +1,257 @@
+import hashlib
+import threading
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from utils.matching import load_model
+from utils.topk import InvertedIndex, top_k
+
+def fit_fingerprint(vectorizer):
+    """Hash of a fitted vectorizer's vocabulary and IDF weights, the same in every process fitting the same corpus"""
+    if vectorizer is None:
+        return None
+    digest = hashlib.sha1('\n'.join(vectorizer.get_feature_names_out()).encode('utf-8'))
+    digest.update(np.round(vectorizer.idf_, 9).tobytes())
+    return digest.hexdigest()
+
+class JobIndex:
+    """
+    Long-lived TF-IDF index over the active job corpus
+
+    Holds one fitted vectorizer (vocabulary + IDF) and a CSR matrix with one
+    L2-normalized row per job. Jobs are added, replaced and removed in place
+    using the fitted vocabulary; once enough of the corpus has changed since
+    the last fit, the vectorizer is refitted from the stored texts so the IDF
+    weights do not drift too far from the real corpus. A job bringing words
+    the vocabulary lacks is refitted at once in corpora of up to
+    ``new_term_refit_max_jobs`` jobs, otherwise its row would drop them and
+    overstate its similarity on the words it kept.
+
+    Texts are expected already normalized with preprocess_text (they are
+    stored that way in the job_texts table).
+    """
+
+    def __init__(self, refit_ratio=0.2, new_term_refit_max_jobs=2000):
+        self.refit_ratio = refit_ratio
+        self.new_term_refit_max_jobs = new_term_refit_max_jobs
+
+        self.vectorizer = None
+        self.matrix = None       # CSR matrix, one row per slot
+        self.slot_job_ids = []   # slot -> job id (None for removed rows)
+        self.slots = {}          # job id -> slot
+        self.texts = {}          # job id -> preprocessed description
+
+        self.changes = 0         # upserts/removals since the last fit
+        self.generation = 0      # bumped on every refit (vocabulary change)
+        self.fingerprint = None  # hash of the fitted vocabulary and IDF weights
+        self.version = 0         # bumped on every change to the matrix
+        self.signature = None    # database state the index was built from
+        self.built_at = 0.0
+
+        self._inverted = None
+        self._inverted_version = None
+
+        self._lock = threading.RLock()
+
+    def build(self, jobs, signature=None):
+        """Rebuild the index from (job_id, normalized text) pairs"""
+        with self._lock:
+            self.texts = dict(jobs)
+            self.signature = signature
+            self.built_at = time.time()
+            self.refit()
+
+    def refit(self):
+        """Refit vocabulary/IDF on the stored texts and rebuild the matrix"""
+        with self._lock:
+            job_ids = list(self.texts)
+            vectorizer = load_model()
+
+            try:
+                matrix = vectorizer.fit_transform([self.texts[job_id] for job_id in job_ids]).tocsr()
+            except ValueError:
+                # Empty corpus or nothing but stop words
+                vectorizer, matrix = None, None
+
+            self.vectorizer = vectorizer
+            self.matrix = matrix
+            self.fingerprint = fit_fingerprint(vectorizer)
+            self.slot_job_ids = job_ids if matrix is not None else []
+            self.slots = {job_id: slot for slot, job_id in enumerate(self.slot_job_ids)}
+            self.changes = 0
+            self.generation += 1
+            self.version += 1
+
+    def needs_refit(self):
+        """Whether enough of the corpus changed since the last fit"""
+        return self.changes >= self.refit_ratio * len(self.texts) or (self.vectorizer is None and bool(self.texts))
+
+    def has_new_terms(self, text):
+        """Whether a preprocessed text has words a refit would add to the vocabulary"""
+        if self.vectorizer is None or len(self.texts) > self.new_term_refit_max_jobs:
+            return False
+        vocabulary = self.vectorizer.vocabulary_
+        if self.vectorizer.max_features is not None and len(vocabulary) >= self.vectorizer.max_features:
+            # Capped vocabulary, a refit keeps only the most frequent words anyway
+            return False
+        stop_words = self.vectorizer.get_stop_words() or ()
+        words = self.vectorizer.build_tokenizer()(text)
+        return any(word not in vocabulary and word not in stop_words for word in words)
+
+    def is_stale(self, max_age):
+        return time.time() - self.built_at > max_age
+
+    def transform(self, texts):
+        """Vectorize preprocessed texts with the fitted vocabulary"""
+        if self.vectorizer is None:
+            return None
+        return self.vectorizer.transform(texts)
+
+    def upsert(self, job_id, text):
+        """Add a job or replace its vector after an edit, from its normalized text"""
+        with self._lock:
+            self.texts[job_id] = text
+            self._tombstone(job_id)
+
+            row = self.transform([text])
+            if row is not None:
+                self.slots[job_id] = len(self.slot_job_ids)
+                self.slot_job_ids.append(job_id)
+                self.matrix = sp.vstack([self.matrix, row], format='csr')
+
+            self.changes += 1
+            self.version += 1
+            if self.needs_refit() or self.has_new_terms(text):
+                self.refit()
+
+    def remove(self, job_id):
+        """Drop a deleted or deactivated job"""
+        with self._lock:
+            if self.texts.pop(job_id, None) is None:
+                return
+            self._tombstone(job_id)
+            self.changes += 1
+            self.version += 1
+            if self.needs_refit():
+                self.refit()
+
+    def _tombstone(self, job_id):
+        # Zero the old row in place; the slot is reclaimed on the next refit
+        slot = self.slots.pop(job_id, None)
+        if slot is None:
+            return
+        start, end = self.matrix.indptr[slot], self.matrix.indptr[slot + 1]
+        self.matrix.data[start:end] = 0.0
+        self.slot_job_ids[slot] = None
+
+    def similarities(self, query_text, job_ids, texts=None):
+        """
+        Cosine similarity between a preprocessed query and the given jobs
+
+        Jobs that are not in the index (e.g. inactive postings) are scored
+        against their entry in ``texts`` when given. Returns an array aligned
+        with ``job_ids``.
+        """
+        with self._lock:
+            similarities = np.zeros(len(job_ids))
+            if self.vectorizer is None or not job_ids:
+                return similarities
+
+            query = self.vectorizer.transform([query_text])
+
+            positions = [i for i, job_id in enumerate(job_ids) if job_id in self.slots]
+            if positions:
+                rows = self.matrix[[self.slots[job_ids[i]] for i in positions]]
+                similarities[positions] = (rows @ query.T).toarray().ravel()
+
+            if texts is not None:
+                missing = [i for i, job_id in enumerate(job_ids) if job_id not in self.slots]
+                if missing:
+                    rows = self.vectorizer.transform([texts[i] for i in missing])
+                    similarities[missing] = (rows @ query.T).toarray().ravel()
+
+            return similarities
+
+    def inverted_index(self):
+        """Posting lists over the current matrix, rebuilt lazily after changes"""
+        with self._lock:
+            if self.matrix is None:
+                return None
+            if self._inverted_version != self.version:
+                self._inverted = InvertedIndex(self.matrix, self.slot_job_ids)
+                self._inverted_version = self.version
+            return self._inverted
+
+    def top_k(self, query_text, k, threshold=None, bonus=None, bonus_patterns=None, job_ids=None):
+        """
+        Best k indexed jobs for a preprocessed query
+
+        ``bonus`` receives a job's preprocessed text and returns an additive
+        score; ``bonus_patterns`` bounds it, mapping substrings to the most
+        points a job whose text contains them can get for them (a job
+        containing none gets no bonus). ``job_ids`` optionally restricts the
+        candidates. Returns (job_id, unrounded score) tuples, best first.
+        """
+        with self._lock:
+            inverted = self.inverted_index()
+            if inverted is None:
+                return []
+
+            query = self.vectorizer.transform([query_text])
+            allowed = None
+            if job_ids is not None:
+                allowed = {self.slots[job_id] for job_id in job_ids if job_id in self.slots}
+
+            slot_bonus = None
+            bonus_postings = []
+            if bonus is not None:
+                slot_bonus = lambda slot: bonus(self.texts[inverted.slot_job_ids[slot]])
+                bonus_postings = [
+                    (inverted.substring_postings(pattern, self.texts), points)
+                    for pattern, points in (bonus_patterns or {}).items()
+                ]
+
+            results = top_k(inverted, query, k, threshold, slot_bonus, bonus_postings, allowed)
+            return [(inverted.slot_job_ids[slot], score) for slot, score in results]
+
+    def vector(self, job_id, text=None):
+        """TF-IDF row of an indexed job, or of ``text`` if the job is not indexed"""
+        with self._lock:
+            if self.vectorizer is None:
+                return None
+            slot = self.slots.get(job_id)
+            if slot is not None:
+                return self.matrix[slot]
+            if text is None:
+                return None
+            return self.vectorizer.transform([text])
+
+    def text_similarity(self, query_text, text):
+        """Cosine similarity between two preprocessed texts outside the corpus"""
+        with self._lock:
+            vectorizer = self.vectorizer
+        if vectorizer is None:
+            # No corpus to borrow IDF weights from, fit on the pair itself
+            vectorizer = load_model()
+            vectors = vectorizer.fit_transform([query_text, text])
+        else:
+            vectors = vectorizer.transform([query_text, text])
+        return float((vectors[0] @ vectors[1].T).toarray()[0][0])
+
+    def state(self):
+        """
+        Consistent view for scoring outside the lock
+
+        Returns (generation, vectorizer, matrix, slot job ids, slot texts);
+        rows are only ever appended or zeroed, so the view stays valid for
+        its slots while later writes go on.
+        """
+        with self._lock:
+            slot_job_ids = list(self.slot_job_ids)
+            texts = [self.texts.get(job_id) if job_id is not None else None for job_id in slot_job_ids]
+            return self.generation, self.vectorizer, self.matrix, slot_job_ids, texts
+
+    def job_text(self, job_id):
+        return self.texts.get(job_id)
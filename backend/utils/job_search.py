@@ -0,0 +1,117 @@
+import re
+
+import sqlalchemy as sa
+
+from utils.db_tuning import without_statement_timeout
+
+# Relative weight of the title, company and description in the relevance score
+TITLE_WEIGHT = 10.0
+COMPANY_WEIGHT = 5.0
+DESCRIPTION_WEIGHT = 1.0
+
+SQLITE_DDL = [
+    # External-content table, the text itself stays in jobs
+    """CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        title, company, description, content='jobs', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, title, company, description) VALUES (new.id, new.title, new.company, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description) VALUES ('delete', old.id, old.title, old.company, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, company, description ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description) VALUES ('delete', old.id, old.title, old.company, old.description);
+        INSERT INTO jobs_fts(rowid, title, company, description) VALUES (new.id, new.title, new.company, new.description);
+    END"""
+]
+
+POSTGRES_DDL = [
+    """ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(company, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'D')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING GIN (search_vector)"
+]
+
+def search_terms(search):
+    """Lowercased words of a search box entry, without any query syntax"""
+    return re.findall(r'\w+', search.lower())
+
+class JobSearch:
+    """
+    Full-text search over job titles, companies and descriptions
+
+    On SQLite an FTS5 table mirrors the jobs table through triggers and hits
+    are ranked by bm25; on Postgres a generated tsvector column with a GIN
+    index is ranked by ts_rank. Either way the database keeps the index in
+    sync on every job write. Other databases, or SQLite builds without FTS5,
+    fall back to unranked substring matching.
+
+    The last word of a search is matched as a prefix, so results follow the
+    search box as it is typed.
+    """
+
+    def __init__(self):
+        self.backend = None  # 'fts5', 'tsvector' or None for substring matching
+
+    def setup(self, engine):
+        """Create the index for the engine's database if needed"""
+        try:
+            if engine.dialect.name == 'sqlite':
+                with engine.begin() as connection:
+                    existed = connection.execute(sa.text(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'"
+                    )).first() is not None
+                    for statement in SQLITE_DDL:
+                        connection.execute(sa.text(statement))
+                    if not existed:
+                        # Index the jobs posted before the table existed
+                        connection.execute(sa.text("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')"))
+                self.backend = 'fts5'
+            elif engine.dialect.name == 'postgresql':
+                with engine.begin() as connection:
+                    # Adding the generated column rewrites the jobs table
+                    without_statement_timeout(connection)
+                    for statement in POSTGRES_DDL:
+                        connection.execute(sa.text(statement))
+                self.backend = 'tsvector'
+        except Exception as e:
+            print(f"Error setting up full-text job search, using substring search: {e}")
+            self.backend = None
+
+    def apply(self, query, job_model, search):
+        """
+        Restrict a Job query to the jobs matching ``search``
+
+        Returns (query, rank) where rank is an (expression, descending) pair
+        ordering the most relevant jobs first, or None without ranking.
+        """
+        terms = search_terms(search)
+        if not terms and self.backend is not None:
+            # Only punctuation, which the index cannot match
+            return (query.filter(sa.false()) if search.strip() else query), None
+
+        if self.backend == 'fts5':
+            # Quoted terms cannot be read as FTS5 operators
+            expression = ' '.join(f'"{term}"' for term in terms) + '*'
+            fts = sa.table('jobs_fts', sa.column('rowid'))
+            match = sa.literal_column('jobs_fts')
+            query = query.join(fts, fts.c.rowid == job_model.id).filter(match.op('MATCH')(expression))
+            # bm25 is lower for better matches
+            return query, (sa.func.bm25(match, TITLE_WEIGHT, COMPANY_WEIGHT, DESCRIPTION_WEIGHT), False)
+
+        if self.backend == 'tsvector':
+            tsquery = sa.func.to_tsquery('english', ' & '.join(terms[:-1] + [terms[-1] + ':*']))
+            vector = sa.literal_column('jobs.search_vector')
+            # ts_rank takes the weights of labels D, C, B, A in [0, 1]
+            weights = [DESCRIPTION_WEIGHT, 0.0, COMPANY_WEIGHT, TITLE_WEIGHT]
+            weights = sa.literal_column(f"'{{{', '.join(str(weight / TITLE_WEIGHT) for weight in weights)}}}'::float4[]")
+            return query.filter(vector.op('@@')(tsquery)), (sa.func.ts_rank(weights, vector, tsquery), True)
+
+        return query.filter(
+            (job_model.title.ilike(f'%{search}%')) |
+            (job_model.company.ilike(f'%{search}%')) |
+            (job_model.description.ilike(f'%{search}%'))
+        ), None
@@ -0,0 +1,114 @@
+import json
+import threading
+from collections import OrderedDict
+
+# JSON array columns of a job, spliced into its payload as stored
+ARRAY_FIELDS = (
+    ('requirements', 'requirements'),
+    ('responsibilities', 'responsibilities'),
+    ('benefits', 'benefits'),
+)
+
+def job_fragment(job):
+    """
+    Encoded Job.to_dict() without its closing brace and per-request fields
+
+    The JSON array columns are spliced in as stored instead of being decoded
+    and encoded again, so only the scalar fields go through json.dumps.
+    """
+    head = json.dumps({
+        'id': job.id,
+        'title': job.title,
+        'company': job.company,
+        'location': job.location,
+        'type': job.type,
+        'salary': job.salary,
+        'description': job.description,
+        'isRemote': job.is_remote,
+        'experienceLevel': job.experience_level,
+        'applicationDeadline': job.application_deadline.isoformat() if job.application_deadline else None,
+        'applicationEmail': job.application_email,
+        'applicationUrl': job.application_url,
+        'isActive': job.is_active,
+        'isDraft': job.is_draft,
+        'postedDate': job.created_at.isoformat()
+    }, separators=(',', ':'))
+    arrays = ''.join(f',"{key}":{getattr(job, column) or "[]"}' for key, column in ARRAY_FIELDS)
+    return head[:-1] + arrays
+
+class JobFragmentCache:
+    """
+    Bounded LRU of encoded job payloads keyed by (job id, updated_at)
+
+    An edited job gets a new key, so entries never need invalidating; stale
+    ones age out of the LRU. Fields that change without a job write
+    (applications count, match score) are appended per request by ``encode``.
+    """
+
+    def __init__(self, max_entries=50000):
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()  # (job id, updated_at) -> fragment
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def fragment(self, job):
+        key = (job.id, job.updated_at)
+        with self._lock:
+            fragment = self._entries.get(key)
+            if fragment is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return fragment
+            self.misses += 1
+
+        fragment = job_fragment(job)
+        with self._lock:
+            self._entries[key] = fragment
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return fragment
+
+    def encode(self, job, **fields):
+        """JSON of Job.to_dict() updated with ``fields``"""
+        extra = json.dumps({'applicationsCount': job.applications_count, **fields}, separators=(',', ':'))
+        return self.fragment(job) + ',' + extra[1:]
+
+    def encode_list(self, jobs, scores=None):
+        """JSON array of jobs, each with a 'matchScore' from ``scores`` when given"""
+        return ''.join(self.encode_chunks(jobs, scores))
+
+    def encode_chunks(self, jobs, scores=None, batch_size=500):
+        """encode_list() in pieces of ``batch_size`` jobs, reading ``jobs`` (and ``scores``) lazily"""
+        encoded = (
+            (self.encode(job) for job in jobs) if scores is None
+            else (self.encode(job, matchScore=score) for job, score in zip(jobs, scores))
+        )
+        batch = ['[']
+        for i, job_json in enumerate(encoded):
+            batch.append(job_json if i == 0 else ',' + job_json)
+            if len(batch) >= batch_size:
+                yield ''.join(batch)
+                batch = []
+        batch.append(']')
+        yield ''.join(batch)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'maxEntries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': round(self.hits / lookups, 4) if lookups else None
+            }
+
+def encode_object(fields):
+    """JSON object of already-encoded ``fields`` values"""
+    return '{' + ','.join(f'{json.dumps(key)}:{value}' for key, value in fields.items()) + '}'
@@ -1,8 +1,7 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-import re
 import os
+from utils.skill_matcher import get_skill_matcher
 
 # Path to the Word2Vec model
 MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'w2vmodel', 'job_word2vec_large.model')
@@ -15,151 +14,234 @@ def load_model():
         ngram_range=(1, 2)  # Include both single words and word pairs
     )
 
+# Byte table for ASCII text: lowercases letters, keeps digits and blanks out everything else
+_ASCII_TABLE = bytearray(b' ' * 256)
+for _char in b'abcdefghijklmnopqrstuvwxyz0123456789':
+    _ASCII_TABLE[_char] = _char
+for _char in b'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
+    _ASCII_TABLE[_char] = _char + 32
+_ASCII_TABLE = bytes(_ASCII_TABLE)
+
+class _UnicodeTable(dict):
+    """str.translate table for lowercased non-ASCII text, filled in as characters are seen"""
+
+    KEEP = frozenset('abcdefghijklmnopqrstuvwxyz0123456789')
+
+    def __missing__(self, code):
+        value = code if chr(code) in self.KEEP else 32
+        self[code] = value
+        return value
+
+_UNICODE_TABLE = _UnicodeTable()
+
 def preprocess_text(text):
-    """Clean and tokenize text"""
+    """Clean and tokenize text: lowercase, keep only a-z0-9 and collapse whitespace"""
     if not text:
         return ""
     
-    # Convert to lowercase
-    text = text.lower()
-    
-    # Remove special characters but keep spaces
-    text = re.sub(r'[^a-zA-Z0-9\s]', ' ', text)
+    # One translate pass replaces the lowercase/regex substitution
+    if text.isascii():
+        text = text.encode('ascii').translate(_ASCII_TABLE).decode('ascii')
+    else:
+        text = text.lower().translate(_UNICODE_TABLE)
     
     # Remove extra whitespace
-    text = ' '.join(text.split())
-    
-    return text
+    return ' '.join(text.split())
 
-def get_document_vector(model, document):
-    """Convert document to vector by averaging word vectors"""
-    tokens = preprocess_text(document)
-    
-    # Filter tokens that are in the model's vocabulary
-    tokens = [token for token in tokens if token in model.wv]
-    
-    if not tokens:
-        return None
-    
-    # Get the word vectors for each token
-    word_vectors = [model.wv[token] for token in tokens]
-    
-    # Return the average of the word vectors
-    return np.mean(word_vectors, axis=0)
+def adjust_scores(similarities, skills, job_texts):
+    """
+    Convert cosine similarities into 0-100 match scores
 
-def extract_skills_from_job(model, job_description):
-    """Extract skills from job description using the Word2Vec model"""
-    # This is a placeholder - in a real implementation, you'd use the model to
-    # identify skills in the description or query a skills database
-    job_vector = get_document_vector(model, job_description)
-    
-    if job_vector is None:
-        return []
+    ``job_texts`` must already be preprocessed (lowercase, no punctuation).
+    """
+    # Exact skill matches for every job text in one pass
+    all_skill_matches = get_skill_matcher(skills).count_all(job_texts)
     
-    # Get most similar words to the job description
-    # These would be the skills most relevant to the job
-    similar_words = model.wv.most_similar(positive=[job_vector], topn=20)
+    scores = []
+    for similarity, skill_matches in zip(similarities, all_skill_matches):
+        score = float(similarity) * 100
+        
+        # Add bonus for exact skill matches
+        if skill_matches > 0:
+            score += (skill_matches / len(skills)) * 20  # Add up to 20% bonus for exact matches
+        
+        # Ensure score is between 0 and 100
+        score = min(100, max(0, score))
+        scores.append(round(score, 1))
     
-    # Return the skill words
-    return [word for word, _ in similar_words]
+    return scores
 
-def calculate_match_score(vectorizer, skills, job_description):
+def calculate_match_score(job_index, skills, job_description, job_id=None):
     """
-    Calculate match score between skills and job description using TF-IDF and cosine similarity
+    Calculate match score between skills and a job description using the
+    fitted TF-IDF job index and cosine similarity
     """
     if not skills or not job_description:
         return 0.0
     
-    # Preprocess the texts
+    # Preprocess the skills
     skills_text = preprocess_text(' '.join(skills))
-    job_text = preprocess_text(job_description)
     
-    # Create TF-IDF vectors
     try:
-        # Fit and transform the texts
-        vectors = vectorizer.fit_transform([skills_text, job_text])
-        
-        # Calculate cosine similarity
-        similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
-        
-        # Convert to percentage and add some adjustments
-        score = float(similarity) * 100
-        
-        # Add bonus for exact skill matches
-        skill_matches = sum(1 for skill in skills if skill.lower() in job_text.lower())
-        if skill_matches > 0:
-            score += (skill_matches / len(skills)) * 20  # Add up to 20% bonus for exact matches
+        job_text = job_index.job_text(job_id) if job_id is not None else None
         
-        # Ensure score is between 0 and 100
-        score = min(100, max(0, score))
+        if job_text is not None:
+            # Indexed job, reuse its stored vector
+            similarity = job_index.similarities(skills_text, [job_id])[0]
+        else:
+            job_text = preprocess_text(job_description)
+            similarity = job_index.text_similarity(skills_text, job_text)
         
-        return round(score, 1)
+        return adjust_scores([similarity], skills, [job_text])[0]
     except Exception as e:
         print(f"Error calculating match score: {e}")
         return 0.0
 
-def calculate_seeker_to_jobs_scores(vectorizer, skills, job_descriptions):
+def calculate_seeker_to_jobs_scores(job_index, skills, jobs, scorer=None):
     """
-    Calculate match scores between skills and multiple job descriptions
+    Calculate match scores between skills and multiple jobs
+
+    Parameters:
+    - job_index: JobIndex holding the fitted vocabulary and job vectors
+    - skills: List of skill names
+    - jobs: List of job objects (``id`` and ``description``)
+    - scorer: Optional ShardedScorer used for large batches
+
+    Returns:
+    - List of scores aligned with ``jobs``
     """
-    if not skills or not job_descriptions:
+    if not skills or not jobs:
         return []
     
-    # Preprocess the texts
+    # Preprocess the skills
     skills_text = preprocess_text(' '.join(skills))
-    job_texts = [preprocess_text(desc) for desc in job_descriptions]
     
-    # Create TF-IDF vectors
+    # Large batches are scored across worker processes
+    if scorer is not None and scorer.enabled(len(jobs)):
+        sharded = scorer.scores(job_index, skills_text, skills)
+        if sharded is not None:
+            missing = [job for job in jobs if job.id not in sharded]
+            scores = dict(zip([job.id for job in missing], calculate_seeker_to_jobs_scores(job_index, skills, missing)))
+            return [
+                scores[job.id] if job.id in scores else round(min(100, max(0, sharded[job.id])), 1)
+                for job in jobs
+            ]
+    
     try:
-        # Fit and transform the texts
-        texts = [skills_text] + job_texts
-        vectors = vectorizer.fit_transform(texts)
+        # Jobs outside the index (e.g. inactive ones) fall back to their raw description
+        job_ids = [job.id for job in jobs]
+        job_texts = [job_index.job_text(job.id) or preprocess_text(job.description) for job in jobs]
         
-        # Calculate cosine similarities
-        similarities = cosine_similarity(vectors[0:1], vectors[1:])[0]
+        # One transform of the skills and one sparse product against the job rows
+        similarities = job_index.similarities(skills_text, job_ids, job_texts)
         
-        # Convert to percentages and add adjustments
-        scores = []
-        for i, similarity in enumerate(similarities):
-            score = float(similarity) * 100
-            
-            # Add bonus for exact skill matches
-            skill_matches = sum(1 for skill in skills if skill.lower() in job_texts[i].lower())
-            if skill_matches > 0:
-                score += (skill_matches / len(skills)) * 20  # Add up to 20% bonus for exact matches
-            
-            # Ensure score is between 0 and 100
-            score = min(100, max(0, score))
-            scores.append(round(score, 1))
-        
-        return scores
+        return adjust_scores(similarities, skills, job_texts)
     except Exception as e:
         print(f"Error calculating job scores: {e}")
-        return [0.0] * len(job_descriptions)
+        return [0.0] * len(jobs)
 
-def calculate_job_to_seekers_scores(model, job_description, job_seekers):
+def find_top_job_matches(job_index, skills, k, min_score=None, job_ids=None, scorer=None):
     """
-    Calculate match scores between a job and multiple job seekers
+    Find the k best matching active jobs for a set of skills
     
-    Parameters:
-    - model: Word2Vec model
-    - job_description: Job description text
-    - job_seekers: List of job seeker objects with skills
+    Uses WAND over the job index posting lists, so only jobs that can still
+    reach the top k (and ``min_score``) are fully scored. Over a large
+    corpus the whole index is scored across ``scorer``'s worker processes
+    instead, merging each shard's top k.
     
     Returns:
-    - List of (job_seeker, score) tuples sorted by score
+    - List of (job_id, score) tuples sorted by score
     """
-    seeker_scores = []
+    if not skills or k <= 0:
+        return []
+    
+    skills_text = preprocess_text(' '.join(skills))
+    matcher = get_skill_matcher(skills)
+    
+    def exact_match_bonus(job_text):
+        return (matcher.count(job_text) / len(skills)) * 20
+    
+    # Each skill is worth its share of the 20 points, only in the jobs containing it
+    bonus_bounds = {}
+    for skill in skills:
+        pattern = skill.lower()
+        bonus_bounds[pattern] = bonus_bounds.get(pattern, 0.0) + 20 / len(skills)
+    
+    # Keep scores that round up to min_score
+    threshold = min_score - 0.05 if min_score is not None else None
     
-    for seeker in job_seekers:
-        # Get skills for this seeker
-        skills = [skill.name for skill in seeker.skills]
+    try:
+        matches = None
+        if scorer is not None and job_ids is None and scorer.enabled(len(job_index.texts)):
+            matches = scorer.top_k(job_index, skills_text, skills, k, threshold)
         
-        score = calculate_match_score(model, skills, job_description)
-        seeker_scores.append((seeker, score))
+        if matches is None:
+            matches = job_index.top_k(
+                skills_text, k,
+                threshold=threshold,
+                bonus=exact_match_bonus,
+                bonus_patterns=bonus_bounds,
+                job_ids=job_ids
+            )
+        scores = [(job_id, round(min(100, max(0, score)), 1)) for job_id, score in matches]
+        return [(job_id, score) for job_id, score in scores if min_score is None or score >= min_score]
+    except Exception as e:
+        print(f"Error finding top job matches: {e}")
+        return []
+
+def find_similar_items(embeddings_table, vector, k, min_score=None, nprobe=None, ids=None):
+    """
+    Find the k items of an embedding table closest to a vector
     
-    # Sort by score (highest first)
-    seeker_scores.sort(key=lambda x: x[1], reverse=True)
+    Uses the table's approximate nearest neighbour index, or an exact scan
+    of ``ids`` when candidates are given; scores are cosine similarities as
+    percentages.
+    
+    Returns:
+    - List of (id, score) tuples sorted by score
+    """
+    if vector is None or k <= 0:
+        return []
     
-    return seeker_scores
+    try:
+        neighbours = embeddings_table.search(vector, k, nprobe, ids)
+        scores = [(item_id, round(min(100, max(0, similarity * 100)), 1)) for item_id, similarity in neighbours]
+        return [(item_id, score) for item_id, score in scores if min_score is None or score >= min_score]
+    except Exception as e:
+        print(f"Error finding similar items: {e}")
+        return []
 
+def calculate_job_to_seekers_scores(job_index, seeker_index, job_description, job_id=None, seeker_ids=None):
+    """
+    Calculate match scores between a job and every job seeker at once
+    
+    Parameters:
+    - job_index: JobIndex holding the fitted vocabulary and job vectors
+    - seeker_index: SeekerIndex holding the seeker skill matrices
+    - job_description: Job description text
+    - job_id: Id of the job, to reuse its indexed vector
+    - seeker_ids: Optional subset of seekers to score
+    
+    Returns:
+    - List of (seeker_id, score) tuples sorted by score
+    """
+    if not job_description:
+        return []
+    
+    try:
+        job_text = job_index.job_text(job_id) if job_id is not None else None
+        if job_text is None:
+            job_text = preprocess_text(job_description)
+        job_vector = job_index.vector(job_id, job_text)
+        
+        seeker_ids, similarities, match_fractions = seeker_index.match(job_index, job_vector, job_text, seeker_ids)
+        
+        # Same adjustments as adjust_scores, applied to all seekers at once
+        scores = np.clip(similarities * 100 + match_fractions * 20, 0, 100).round(1)
+        
+        # Sort by score (highest first)
+        order = np.argsort(-scores, kind='stable')
+        return [(seeker_ids[i], float(scores[i])) for i in order]
+    except Exception as e:
+        print(f"Error calculating candidate scores: {e}")
+        return []
@@ -0,0 +1,83 @@
+import base64
+import heapq
+import json
+from datetime import datetime
+
+import sqlalchemy as sa
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(sort, values):
+    """Opaque cursor for the row with sort key ``values`` under the ``sort`` ordering"""
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    payload = json.dumps({'sort': sort, 'values': values}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor, sort, count):
+    """Sort key values of a cursor made by encode_cursor for the same ordering"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        values = payload['values']
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor('Invalid cursor')
+    if payload.get('sort') != sort or not isinstance(values, list) or len(values) != count:
+        raise InvalidCursor('Cursor does not match the requested ordering')
+    return values
+
+def keyset_after(keys, values):
+    """Rows ordered strictly after ``values`` by ``keys``, a list of (expression, descending) pairs"""
+    values = [
+        datetime.fromisoformat(value) if isinstance(expression.type, sa.DateTime) and value is not None else value
+        for (expression, _), value in zip(keys, values)
+    ]
+
+    # (a, b) after (x, y) is a after x, or a equal to x and b after y
+    conditions = []
+    for i, (expression, descending) in enumerate(keys):
+        ahead = expression < values[i] if descending else expression > values[i]
+        conditions.append(sa.and_(*[keys[j][0] == values[j] for j in range(i)], ahead))
+    return sa.or_(*conditions)
+
+def keyset_page(query, sort, keys, limit, cursor=None):
+    """
+    One page of a query ordered by ``keys``
+
+    ``keys`` are (expression, descending) pairs whose last expression is
+    unique per row, so the order is total. Only ``limit`` + 1 rows are read
+    whatever the page. Returns (rows, next cursor or None); each row is the
+    query's row with the key values appended.
+    """
+    if cursor is not None:
+        try:
+            query = query.filter(keyset_after(keys, decode_cursor(cursor, sort, len(keys))))
+        except (ValueError, TypeError) as e:
+            raise InvalidCursor(str(e))
+
+    rows = query.add_columns(*[expression for expression, _ in keys]).order_by(
+        *[expression.desc() if descending else expression for expression, descending in keys]
+    ).limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(sort, list(rows[-1][-len(keys):]))
+
+def page_by_score(items, limit, cursor=None, sort='score'):
+    """
+    One page of (id, score) items, highest score first and ties by id
+
+    For scores computed in Python; picks the page with a bounded heap
+    instead of sorting every item. Returns (items, next cursor or None).
+    """
+    if cursor is not None:
+        last_score, last_id = decode_cursor(cursor, sort, 2)
+        if not isinstance(last_score, (int, float)) or not isinstance(last_id, int):
+            raise InvalidCursor('Invalid cursor')
+        items = [(item_id, score) for item_id, score in items if (-score, item_id) > (-last_score, last_id)]
+
+    page = heapq.nsmallest(limit + 1, items, key=lambda item: (-item[1], item[0]))
+    if len(page) <= limit:
+        return page, None
+    page = page[:limit]
+    return page, encode_cursor(sort, [page[-1][1], page[-1][0]])
@@ -0,0 +1,223 @@
+import atexit
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+
+from utils.skill_matcher import get_skill_matcher
+
+SNAPSHOT_ARRAYS = ('data', 'indices', 'indptr', 'live', 'text', 'text_offsets')
+
+def raw_scores(rows, query, texts, skills):
+    """
+    Unclamped, unrounded match scores of TF-IDF rows against a query row
+
+    Same arithmetic as adjust_scores: similarity * 100 plus up to 20 points
+    for the fraction of skills found verbatim in each text.
+    """
+    similarities = (rows @ query.T).toarray().ravel()
+    matches = get_skill_matcher(skills).count_all(texts)
+    return similarities * 100 + (matches / len(skills)) * 20
+
+def best_slots(slots, scores, k):
+    """The k best (slots, scores), highest score first and ties to the lower slot"""
+    if len(scores) > k:
+        # Everything tied with the k-th score survives the partition
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        keep = scores >= kth
+        slots, scores = slots[keep], scores[keep]
+    order = np.lexsort((slots, -scores))[:k]
+    return slots[order], scores[order]
+
+# Snapshots memory-mapped by this worker process, most recent last
+_snapshots = {}
+
+def _open_snapshot(directory):
+    arrays = _snapshots.get(directory)
+    if arrays is None:
+        while len(_snapshots) >= 2:
+            _snapshots.pop(next(iter(_snapshots)))
+        arrays = {name: np.load(os.path.join(directory, name + '.npy'), mmap_mode='r') for name in SNAPSHOT_ARRAYS}
+        _snapshots[directory] = arrays
+    return arrays
+
+def _score_shard(directory, terms, start, end, query_indices, query_data, skills, k=None, threshold=None):
+    # Runs in a worker process against the memory-mapped snapshot
+    arrays = _open_snapshot(directory)
+
+    indptr = np.asarray(arrays['indptr'][start:end + 1])
+    first, last = indptr[0], indptr[-1]
+    rows = sp.csr_matrix(
+        (arrays['data'][first:last], arrays['indices'][first:last], indptr - first),
+        shape=(end - start, terms)
+    )
+    query = sp.csr_matrix((query_data, query_indices, [0, len(query_indices)]), shape=(1, terms))
+
+    offsets = np.asarray(arrays['text_offsets'][start:end + 1]) - arrays['text_offsets'][start]
+    blob = arrays['text'][arrays['text_offsets'][start]:arrays['text_offsets'][end]].tobytes()
+    texts = [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(end - start)]
+
+    scores = np.where(arrays['live'][start:end], raw_scores(rows, query, texts, skills), -np.inf)
+    if k is None:
+        return scores
+
+    candidates = np.flatnonzero(scores > -np.inf if threshold is None else scores >= threshold)
+    slots, best = best_slots(candidates, scores[candidates], k)
+    return slots + start, best
+
+class _Snapshot:
+    def __init__(self, generation, directory, slots, terms, live):
+        self.generation = generation
+        self.directory = directory
+        self.slots = slots
+        self.terms = terms
+        self.live = live
+
+class ShardedScorer:
+    """
+    Scores a skill query against the whole job index on a pool of processes
+
+    The job matrix rows and preprocessed texts are exported once per index
+    generation as .npy files that every worker memory-maps, so only the
+    query and the shard bounds are sent per call. Jobs added since the
+    export are scored in-process and removed ones are masked out. Below
+    ``min_jobs`` jobs, with a single process, or once the pool has failed,
+    callers get None and score in-process instead.
+    """
+
+    def __init__(self, processes=None, min_jobs=50000):
+        self.processes = processes or os.cpu_count() or 1
+        self.min_jobs = min_jobs
+        self.available = self.processes > 1
+
+        self._pool = None
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+        atexit.register(self.close)
+
+    def enabled(self, count):
+        """Whether a batch of ``count`` jobs is worth sharding"""
+        return self.available and count >= self.min_jobs
+
+    def scores(self, job_index, query_text, skills):
+        """Unrounded, unclamped scores of every indexed job as a {job_id: score} dict, or None"""
+        result = self._run(job_index, query_text, skills)
+        if result is None:
+            return None
+        slot_job_ids, scores = result
+        return {job_id: float(score) for job_id, score in zip(slot_job_ids, scores) if job_id is not None}
+
+    def top_k(self, job_index, query_text, skills, k, threshold=None):
+        """Best k indexed jobs as (job_id, unrounded score) tuples, best first, or None"""
+        result = self._run(job_index, query_text, skills, k, threshold)
+        if result is None:
+            return None
+        slot_job_ids, (slots, scores) = result
+        return [(slot_job_ids[slot], float(score)) for slot, score in zip(slots, scores)]
+
+    def _run(self, job_index, query_text, skills, k=None, threshold=None):
+        if not skills:
+            return None
+
+        with self._lock:
+            if not self.available:
+                return None
+            try:
+                generation, vectorizer, matrix, slot_job_ids, texts = job_index.state()
+                if vectorizer is None:
+                    return None
+                snapshot = self._export(generation, matrix, slot_job_ids, texts)
+                query = vectorizer.transform([query_text]).tocsr()
+
+                # Slots removed since the export still hold their old rows there
+                dead = np.array([job_id is None for job_id in slot_job_ids[:snapshot.slots]], dtype=bool)
+                dead_since_export = int(np.count_nonzero(dead & snapshot.live))
+
+                bounds = np.linspace(0, snapshot.slots, self.processes + 1).astype(int)
+                futures = [
+                    self._get_pool().submit(
+                        _score_shard, snapshot.directory, snapshot.terms, int(start), int(end),
+                        query.indices, query.data, list(skills),
+                        None if k is None else k + dead_since_export, threshold
+                    )
+                    for start, end in zip(bounds[:-1], bounds[1:]) if end > start
+                ]
+                shards = [future.result() for future in futures]
+            except Exception as e:
+                print(f"Error in parallel scoring, falling back to in-process scoring: {e}")
+                self._shutdown()
+                self.available = False
+                return None
+
+        # Jobs added since the export are scored here
+        added = range(snapshot.slots, len(slot_job_ids))
+        added_scores = np.full(len(added), -np.inf)
+        added_live = [i for i, slot in enumerate(added) if slot_job_ids[slot] is not None]
+        if added_live:
+            rows = matrix[[added[i] for i in added_live]]
+            added_scores[added_live] = raw_scores(rows, query, [texts[added[i]] for i in added_live], skills)
+
+        if k is None:
+            scores = np.concatenate(shards + [added_scores]) if shards else added_scores
+            return slot_job_ids, scores
+
+        slots = np.concatenate([shard[0] for shard in shards] + [np.arange(snapshot.slots, len(slot_job_ids))])
+        scores = np.concatenate([shard[1] for shard in shards] + [added_scores])
+
+        alive = np.array([slot_job_ids[slot] is not None for slot in slots], dtype=bool)
+        if threshold is not None:
+            alive &= scores >= threshold
+        return slot_job_ids, best_slots(slots[alive], scores[alive], k)
+
+    def _get_pool(self):
+        if self._pool is None:
+            # Spawned workers do not inherit the web process's threads and locks
+            self._pool = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context('spawn'))
+        return self._pool
+
+    def _export(self, generation, matrix, slot_job_ids, texts):
+        if self._snapshot is not None and self._snapshot.generation == generation:
+            return self._snapshot
+
+        count = len(slot_job_ids)
+        encoded = [(text or '').encode('utf-8') for text in texts]
+        text_offsets = np.zeros(count + 1, dtype=np.int64)
+        text_offsets[1:] = np.cumsum([len(text) for text in encoded])
+        live = np.array([job_id is not None for job_id in slot_job_ids], dtype=bool)
+
+        end = matrix.indptr[count]
+        arrays = {
+            'data': matrix.data[:end],
+            'indices': matrix.indices[:end],
+            'indptr': matrix.indptr[:count + 1],
+            'live': live,
+            'text': np.frombuffer(b''.join(encoded), dtype=np.uint8),
+            'text_offsets': text_offsets
+        }
+
+        directory = tempfile.mkdtemp(prefix='careerconnect-jobs-')
+        for name, array in arrays.items():
+            np.save(os.path.join(directory, name + '.npy'), array)
+
+        # Workers that still map the previous files keep their pages until they move on
+        if self._snapshot is not None:
+            shutil.rmtree(self._snapshot.directory, ignore_errors=True)
+        self._snapshot = _Snapshot(generation, directory, count, matrix.shape[1], live)
+        return self._snapshot
+
+    def _shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def close(self):
+        self._shutdown()
+        if self._snapshot is not None:
+            shutil.rmtree(self._snapshot.directory, ignore_errors=True)
+            self._snapshot = None
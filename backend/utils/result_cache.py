@@ -0,0 +1,221 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+def canonical_params(params, names):
+    """
+    Stable text of the query parameters a response depends on
+
+    Only ``names`` are kept (cache busters and unknown parameters would
+    split the cache), empty values are dropped and repeated values are
+    sorted, so "?jobType=A&jobType=B" and "?jobType=B&jobType=A" share a
+    key. Searches are compared case- and whitespace-insensitively.
+    """
+    parts = []
+    for name in sorted(names):
+        values = params.getlist(name)
+        if name == 'search':
+            values = [' '.join(value.lower().split()) for value in values]
+        values = sorted(value for value in values if value != '')
+        if values:
+            parts.append(name + '=' + '\x1f'.join(values))
+    return '\x1e'.join(parts)
+
+class MemoryBackend:
+    """
+    Per-process LRU of serialized payloads, bounded by their total size
+
+    Other workers' writes cannot bump this process's generation, so
+    ResultCache.check() compares a signature of the data behind the
+    responses before lookups, the same way the job index notices writes it
+    did not apply itself.
+    """
+
+    shared = False
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.generation = 0
+
+        self._entries = OrderedDict()  # key -> (payload, expires_at)
+        self._lock = threading.Lock()
+
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_generation(self):
+        return self.generation
+
+    def bump_generation(self):
+        with self._lock:
+            self.generation += 1
+            # Entries of older generations can never be hit again
+            self._entries.clear()
+            self.size = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if expires_at < time.monotonic():
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def set(self, key, payload, ttl):
+        # A payload taking most of the budget would just flush everything else
+        if len(payload) > self.max_bytes // 4:
+            return
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (payload, time.monotonic() + ttl)
+            self.size += len(payload)
+            while self.size > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[0])
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'entries': len(self._entries),
+                'bytes': self.size,
+                'maxBytes': self.max_bytes,
+                'evictions': self.evictions
+            }
+
+class RedisBackend:
+    """
+    Payloads shared by every worker in Redis
+
+    The generation is a Redis counter, so a write in any worker invalidates
+    the entries of all of them; Redis' own maxmemory policy bounds memory.
+    Needs the optional redis package.
+    """
+
+    shared = True
+
+    def __init__(self, url, prefix='careerconnect:results'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError(f'{url} needs the redis package (pip install redis)')
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get_generation(self):
+        return int(self.client.get(f'{self.prefix}:generation') or 0)
+
+    def bump_generation(self):
+        self.client.incr(f'{self.prefix}:generation')
+
+    def get(self, key):
+        return self.client.get(f'{self.prefix}:{key}')
+
+    def set(self, key, payload, ttl):
+        self.client.set(f'{self.prefix}:{key}', payload, ex=max(1, int(ttl)))
+
+    def stats(self):
+        return {'backend': 'redis'}
+
+class ResultCache:
+    """
+    Serialized responses keyed by canonical query parameters
+
+    Keys embed a generation counter that is bumped on every write to the
+    data behind the responses, so a write invalidates all entries at once
+    without tracking which responses contained what. Backend errors are
+    counted and treated as misses; the cache never fails a request.
+    """
+
+    def __init__(self, backend, ttl=60, max_payload=None):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_payload = max_payload   # larger payloads are not stored
+
+        self.signature = None   # data signature the in-process entries were stored at
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @classmethod
+    def from_url(cls, url=None, max_bytes=64 * 1024 * 1024, ttl=60):
+        """Redis-backed for a redis:// URL, in-process otherwise"""
+        if url and url.startswith(('redis://', 'rediss://', 'unix://')):
+            return cls(RedisBackend(url), ttl, max_bytes // 4)
+        return cls(MemoryBackend(max_bytes), ttl, max_bytes // 4)
+
+    def key(self, namespace, canonical):
+        digest = hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+        return f'{namespace}:{self.backend.get_generation()}:{digest}'
+
+    @property
+    def shared(self):
+        """Whether every worker's writes invalidate this cache (otherwise see check())"""
+        return self.backend.shared
+
+    def check(self, signature):
+        """Invalidate an in-process cache if the data changed since its entries were stored"""
+        if signature != self.signature:
+            if self.signature is not None:
+                self.bump()
+            self.signature = signature
+
+    def get(self, namespace, canonical):
+        """(payload or None, key to store a fresh payload under or None)"""
+        try:
+            key = self.key(namespace, canonical)
+            payload = self.backend.get(key)
+        except Exception:
+            self.errors += 1
+            return None, None
+
+        if payload is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return payload, key
+
+    def set(self, key, payload):
+        if key is None or (self.max_payload is not None and len(payload) > self.max_payload):
+            return
+        try:
+            self.backend.set(key, payload, self.ttl)
+        except Exception:
+            self.errors += 1
+
+    def bump(self):
+        """Invalidate every entry after a write"""
+        try:
+            self.backend.bump_generation()
+        except Exception:
+            self.errors += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        try:
+            stats = self.backend.stats()
+        except Exception:
+            stats = {}
+        stats.update({
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRate': round(self.hits / lookups, 4) if lookups else None,
+            'errors': self.errors
+        })
+        return stats
@@ -0,0 +1,120 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+def skills_hash(skills):
+    """Stable hash of a skill list, ignoring case and surrounding whitespace"""
+    normalized = '\n'.join(' '.join(skill.lower().split()) for skill in skills)
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+class ScoreCache:
+    """
+    Bounded LRU cache of match scores with a time-to-live
+
+    Keys are (skills hash, job id, job updated_at) tuples, so an edited job
+    or a changed skill list naturally misses. Entries can also be dropped
+    precisely by job id or by skills hash, and the whole cache is reset when
+    the scoring model changes (``generation``, e.g. a TF-IDF refit).
+    """
+
+    def __init__(self, max_entries=100000, ttl=600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = None
+
+        self._entries = OrderedDict()  # key -> (score, expires_at)
+        self._by_job = {}              # job id -> set of keys
+        self._by_skills = {}           # skills hash -> set of keys
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            score, expires_at = entry
+            if expires_at < time.monotonic():
+                self._discard(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return score
+
+    def set(self, key, score):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            else:
+                skills_key, job_id = key[0], key[1]
+                self._by_job.setdefault(job_id, set()).add(key)
+                self._by_skills.setdefault(skills_key, set()).add(key)
+
+            self._entries[key] = (score, time.monotonic() + self.ttl)
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def invalidate_job(self, job_id):
+        """Drop every score of a job (description changed or job deleted)"""
+        with self._lock:
+            for key in list(self._by_job.get(job_id, ())):
+                self._discard(key)
+                self.invalidations += 1
+
+    def invalidate_skills(self, key):
+        """Drop every score of a skill set (a seeker rewrote their skills)"""
+        with self._lock:
+            for cache_key in list(self._by_skills.get(key, ())):
+                self._discard(cache_key)
+                self.invalidations += 1
+
+    def reset(self, generation=None):
+        """Drop everything, e.g. after the scoring model was refitted"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._by_job.clear()
+            self._by_skills.clear()
+            self.generation = generation
+
+    def _discard(self, key):
+        self._entries.pop(key, None)
+
+        for index, index_key in ((self._by_job, key[1]), (self._by_skills, key[0])):
+            keys = index.get(index_key)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[index_key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'maxEntries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
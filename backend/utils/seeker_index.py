@@ -0,0 +1,183 @@
+import threading
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from utils.matching import preprocess_text
+from utils.skill_matcher import SkillMatcher
+
+class SeekerIndex:
+    """
+    Sparse matrices over every job seeker's skills
+
+    ``matrix`` holds one TF-IDF row per seeker, vectorized with the job
+    index vocabulary so a job vector can be scored against all seekers with a
+    single sparse product. ``skill_matrix`` is a seeker x distinct-skill
+    incidence matrix whose rows are scaled by 1/len(skills), which turns the
+    exact-match bonus into a second sparse product.
+
+    A profile update only vectorizes that seeker's row, appended after
+    zeroing the old one; the matrices are rebuilt when the job index is
+    refitted, or once removed rows outnumber live ones.
+    """
+
+    def __init__(self):
+        self.skills = {}            # user id -> list of skill names
+        self.seeker_ids = []        # row -> user id (None for removed rows)
+        self.rows = {}              # user id -> row
+        self.matrix = None
+        self.skill_matrix = None
+        self.skill_vocabulary = []  # column -> lowercased skill name
+        self.skill_columns = {}     # lowercased skill name -> column
+        self.skill_matcher = None   # automaton over skill_vocabulary
+
+        self.generation = None      # job index generation the rows were vectorized with
+        self.signature = None       # database state the index was built from
+        self.built_at = 0.0
+        self.dirty = True
+        self.pending = set()        # user ids whose rows are out of date
+
+        self._lock = threading.RLock()
+
+    def build(self, seekers, signature=None):
+        """Rebuild from (user_id, [skill names]) pairs"""
+        with self._lock:
+            self.skills = {user_id: list(skills) for user_id, skills in seekers if skills}
+            self.signature = signature
+            self.built_at = time.time()
+            self.dirty = True
+
+    def is_stale(self, max_age):
+        return time.time() - self.built_at > max_age
+
+    def upsert(self, user_id, skills):
+        """Replace a seeker's skills after a profile update"""
+        with self._lock:
+            if skills:
+                self.skills[user_id] = list(skills)
+            else:
+                self.skills.pop(user_id, None)
+            self.pending.add(user_id)
+
+    def remove(self, user_id):
+        with self._lock:
+            if self.skills.pop(user_id, None) is not None:
+                self.pending.add(user_id)
+
+    def _vectorize(self, job_index):
+        # Rows are only valid for the vocabulary they were transformed with
+        if self.dirty or self.generation != job_index.generation:
+            self._rebuild(job_index)
+            return
+        if not self.pending:
+            return
+
+        pending, self.pending = self.pending, set()
+        for user_id in pending:
+            self._tombstone(user_id)
+        if len(self.seeker_ids) - len(self.rows) > len(self.skills):
+            self._rebuild(job_index)
+            return
+
+        added = [user_id for user_id in pending if user_id in self.skills]
+        if not added:
+            return
+
+        patterns = len(self.skill_vocabulary)
+        rows = self._skill_rows(added)
+        skill_rows = sp.csr_matrix(rows, shape=(len(added), len(self.skill_columns)))
+        if len(self.skill_vocabulary) > patterns:
+            # Only a skill no seeker had before needs the automaton recompiled
+            self.skill_matrix.resize((self.skill_matrix.shape[0], len(self.skill_columns)))
+            self.skill_matcher = SkillMatcher(self.skill_vocabulary)
+        self.skill_matrix = sp.vstack([self.skill_matrix, skill_rows], format='csr')
+
+        vectors = job_index.transform([preprocess_text(' '.join(self.skills[user_id])) for user_id in added])
+        if vectors is not None:
+            self.matrix = vectors if self.matrix is None else sp.vstack([self.matrix, vectors], format='csr')
+
+        for user_id in added:
+            self.rows[user_id] = len(self.seeker_ids)
+            self.seeker_ids.append(user_id)
+
+    def _rebuild(self, job_index):
+        self.seeker_ids = list(self.skills)
+        self.rows = {user_id: row for row, user_id in enumerate(self.seeker_ids)}
+        texts = [preprocess_text(' '.join(self.skills[user_id])) for user_id in self.seeker_ids]
+        self.matrix = job_index.transform(texts) if self.seeker_ids else None
+
+        self.skill_vocabulary = []
+        self.skill_columns = {}
+        self.skill_matrix = sp.csr_matrix(
+            self._skill_rows(self.seeker_ids),
+            shape=(len(self.seeker_ids), len(self.skill_columns))
+        )
+        self.skill_matcher = SkillMatcher(self.skill_vocabulary)
+
+        self.generation = job_index.generation
+        self.dirty = False
+        self.pending = set()
+
+    def _skill_rows(self, user_ids):
+        # (values, (rows, cols)) of the seekers' incidence rows, adding columns for new skills
+        rows, cols, values = [], [], []
+        for row, user_id in enumerate(user_ids):
+            skills = self.skills[user_id]
+            for skill in skills:
+                name = skill.lower()
+                if name not in self.skill_columns:
+                    self.skill_columns[name] = len(self.skill_vocabulary)
+                    self.skill_vocabulary.append(name)
+                rows.append(row)
+                cols.append(self.skill_columns[name])
+                values.append(1.0 / len(skills))
+
+        # Duplicate (row, col) entries are summed, matching a per-skill count
+        return values, (rows, cols)
+
+    def _tombstone(self, user_id):
+        # Zero the old rows in place; they are dropped on the next rebuild
+        row = self.rows.pop(user_id, None)
+        if row is None:
+            return
+        for matrix in (self.matrix, self.skill_matrix):
+            if matrix is not None and row < matrix.shape[0]:
+                matrix.data[matrix.indptr[row]:matrix.indptr[row + 1]] = 0.0
+        self.seeker_ids[row] = None
+
+    def match(self, job_index, job_vector, job_text, seeker_ids=None):
+        """
+        Score one job against every seeker, or only against ``seeker_ids``
+
+        Returns (seeker ids, cosine similarities, fraction of each seeker's
+        skills found verbatim in ``job_text``) as aligned arrays.
+        """
+        with self._lock:
+            self._vectorize(job_index)
+
+            matrix, skill_matrix, ids = self.matrix, self.skill_matrix, list(self.seeker_ids)
+            if seeker_ids is not None or len(self.rows) < len(self.seeker_ids):
+                if seeker_ids is None:
+                    rows = [row for row, user_id in enumerate(self.seeker_ids) if user_id is not None]
+                else:
+                    rows = [self.rows[user_id] for user_id in seeker_ids if user_id in self.rows]
+                ids = [self.seeker_ids[row] for row in rows]
+                skill_matrix = skill_matrix[rows]
+                if matrix is not None:
+                    matrix = matrix[rows]
+
+            count = len(ids)
+            if count == 0:
+                return [], np.zeros(0), np.zeros(0)
+
+            if matrix is None or job_vector is None:
+                similarities = np.zeros(count)
+            else:
+                similarities = (matrix @ job_vector.T).toarray().ravel()
+
+            # One pass over the job text finds every distinct seeker skill in it
+            present = self.skill_matcher.presence(job_text).astype(float)
+            match_fractions = skill_matrix @ present
+
+            return ids, similarities, match_fractions
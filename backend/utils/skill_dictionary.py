@@ -0,0 +1,234 @@
+import threading
+
+import numpy as np
+
+from utils.matching import preprocess_text
+from utils.skill_matcher import SkillMatcher
+
+# Canonical skill names (already in normalized form) and the aliases they are also written as;
+# aliases that are common words or that normalize to a single letter are left out
+DEFAULT_SKILLS = {
+    'javascript': ['js', 'ecmascript', 'es6'],
+    'typescript': [],
+    'python': ['py', 'python3'],
+    'java': [],
+    'cpp': ['c plus plus', 'cplusplus'],
+    'csharp': ['c sharp', 'dotnet', 'net core'],
+    'go': ['golang'],
+    'rust': [],
+    'ruby': [],
+    'php': [],
+    'kotlin': [],
+    'swift': [],
+    'scala': [],
+    'sql': [],
+    'postgresql': ['postgres', 'psql'],
+    'mysql': [],
+    'mongodb': ['mongo'],
+    'redis': [],
+    'react': ['reactjs', 'react js'],
+    'angular': ['angularjs', 'angular js'],
+    'vue': ['vuejs', 'vue js'],
+    'nodejs': ['node', 'node js'],
+    'django': [],
+    'flask': [],
+    'spring': ['spring boot', 'springboot'],
+    'html': ['html5'],
+    'css': ['css3'],
+    'docker': [],
+    'kubernetes': ['k8s'],
+    'terraform': [],
+    'aws': ['amazon web services'],
+    'azure': ['microsoft azure'],
+    'gcp': ['google cloud', 'google cloud platform'],
+    'linux': [],
+    'git': [],
+    'ci cd': ['continuous integration', 'continuous delivery'],
+    'machine learning': ['ml'],
+    'deep learning': [],
+    'natural language processing': ['nlp'],
+    'computer vision': [],
+    'pytorch': [],
+    'tensorflow': [],
+    'pandas': [],
+    'numpy': [],
+    'spark': ['apache spark', 'pyspark'],
+    'excel': ['microsoft excel', 'ms excel'],
+    'tableau': [],
+    'power bi': ['powerbi'],
+    'data analysis': ['data analytics'],
+    'rest api': ['restful', 'rest apis'],
+    'graphql': [],
+    'agile': ['scrum'],
+    'project management': [],
+    'ui ux': ['ux', 'ui design', 'ux design'],
+    'figma': []
+}
+
+# Weight of a job's skill by where it is mentioned
+REQUIREMENT_WEIGHT = 1.0
+DESCRIPTION_WEIGHT = 0.5
+
+# Shortest normalized name learned as a new term
+MIN_LEARNED_SKILL_LENGTH = 2
+
+def normalize_skill(name):
+    """Normalized form used to look a skill name up (same as job text normalization)"""
+    return preprocess_text(name)
+
+def learnable_skill(name):
+    """
+    Normalized form of a free-text skill to add to the dictionary, or None
+
+    Names that normalize to a single character or to no letters at all
+    ("C++" becomes "c") would tag every job using that token in an
+    unrelated sense, so they are never learned.
+    """
+    normalized = normalize_skill(name)
+    if len(normalized) < MIN_LEARNED_SKILL_LENGTH or not any(char.isalpha() for char in normalized):
+        return None
+    return normalized
+
+class SkillDictionary:
+    """
+    Canonical skill names with integer ids and aliases
+
+    ``lookup`` resolves a free-text skill name (or alias) to its id, and
+    ``extract`` finds every known skill occurring as a run of whole words in
+    a normalized text by looking its word n-grams up. ``extract_all`` does
+    the same for many texts with one Aho-Corasick pass over the space-padded
+    aliases.
+    """
+
+    def __init__(self, terms, aliases=(), signature=None):
+        self.names = dict(terms)             # id -> canonical name
+        self.signature = signature           # database state the dictionary was loaded from
+
+        self.ids_by_alias = {}               # normalized name or alias -> id
+        for term_id, name in self.names.items():
+            self.ids_by_alias.setdefault(normalize_skill(name), term_id)
+        for alias, term_id in aliases:
+            self.ids_by_alias.setdefault(normalize_skill(alias), term_id)
+        self.ids_by_alias.pop('', None)
+        self.max_words = max((len(alias.split()) for alias in self.ids_by_alias), default=0)
+
+        # Padding with spaces restricts substring matches to whole words of normalized text
+        self.matcher = SkillMatcher([f' {alias} ' for alias in self.ids_by_alias])
+        self.pattern_ids = np.array(
+            [self.ids_by_alias[pattern.strip()] for pattern in self.matcher.patterns],
+            dtype=np.int64
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, name):
+        return self.ids_by_alias.get(normalize_skill(name))
+
+    def ids(self, names):
+        """Sorted distinct ids of the known skills among ``names``"""
+        found = {self.ids_by_alias.get(normalize_skill(name)) for name in names}
+        found.discard(None)
+        return np.array(sorted(found), dtype=np.int64)
+
+    def extract(self, text):
+        """Sorted distinct ids of the skills mentioned in a normalized text"""
+        words = text.split()
+        found = set()
+        for start in range(len(words)):
+            for end in range(start + 1, min(start + self.max_words, len(words)) + 1):
+                term_id = self.ids_by_alias.get(' '.join(words[start:end]))
+                if term_id is not None:
+                    found.add(term_id)
+        return np.array(sorted(found), dtype=np.int64)
+
+    def extract_weighted(self, description, requirements):
+        """{id: weight} of the skills in a job's normalized description and requirements"""
+        weights = {int(term_id): DESCRIPTION_WEIGHT for term_id in self.extract(description)}
+        weights.update((int(term_id), REQUIREMENT_WEIGHT) for term_id in self.extract(requirements))
+        return weights
+
+    def extract_all(self, texts):
+        """extract() for many texts at once"""
+        if not len(self.pattern_ids):
+            return [np.zeros(0, dtype=np.int64) for _ in texts]
+        found = self.matcher.presence_all([f' {text} ' for text in texts])
+        return [np.unique(self.pattern_ids[row]) for row in found]
+
+    def extract_weighted_all(self, descriptions, requirements):
+        """extract_weighted() for many jobs at once"""
+        results = []
+        for in_description, in_requirements in zip(self.extract_all(descriptions), self.extract_all(requirements)):
+            weights = {int(term_id): DESCRIPTION_WEIGHT for term_id in in_description}
+            weights.update((int(term_id), REQUIREMENT_WEIGHT) for term_id in in_requirements)
+            results.append(weights)
+        return results
+
+class SkillSetIndex:
+    """
+    Sorted skill-id arrays of many jobs or seekers
+
+    The arrays are flattened into one CSR-like layout so the overlap of a
+    query skill set with every entity is a single gather through a bitmap
+    of the query ids plus a segmented sum, without a Python loop over
+    entities. Used to drop candidates sharing too few skills with the
+    query before they are scored.
+    """
+
+    def __init__(self):
+        self.sets = {}         # entity id -> sorted skill ids
+        self.key = None        # state the sets were built from
+        self._flat = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.sets)
+
+    def build(self, sets, key=None):
+        with self._lock:
+            self.sets = dict(sets)
+            self.key = key
+            self._flat = None
+
+    def set(self, entity_id, ids):
+        with self._lock:
+            self.sets[entity_id] = np.array(sorted(ids), dtype=np.int64)
+            self._flat = None
+
+    def remove(self, entity_id):
+        with self._lock:
+            if self.sets.pop(entity_id, None) is not None:
+                self._flat = None
+
+    def _flatten(self):
+        if self._flat is None:
+            entity_ids = np.array(list(self.sets), dtype=np.int64)
+            sizes = np.array([len(ids) for ids in self.sets.values()], dtype=np.int64)
+            indptr = np.zeros(len(sizes) + 1, dtype=np.int64)
+            np.cumsum(sizes, out=indptr[1:])
+            flat = np.concatenate(list(self.sets.values())) if self.sets else np.zeros(0, dtype=np.int64)
+            self._flat = (entity_ids, indptr, flat.astype(np.int64))
+        return self._flat
+
+    def overlap(self, query_ids):
+        """(entity ids, shared skill counts, set sizes) as aligned arrays"""
+        with self._lock:
+            entity_ids, indptr, flat = self._flatten()
+
+        query_ids = np.asarray(query_ids, dtype=np.int64)
+        size = max(int(flat.max()) + 1 if len(flat) else 0, int(query_ids.max()) + 1 if len(query_ids) else 0)
+        bitmap = np.zeros(size, dtype=bool)
+        bitmap[query_ids] = True
+
+        # Running count of hits, differenced at the set boundaries
+        hits = np.zeros(len(flat) + 1, dtype=np.int64)
+        np.cumsum(bitmap[flat], out=hits[1:])
+        return entity_ids, hits[indptr[1:]] - hits[indptr[:-1]], np.diff(indptr)
+
+    def candidates(self, query_ids, min_overlap=1, min_jaccard=0.0):
+        """Ids of the entities sharing at least ``min_overlap`` skills and ``min_jaccard`` similarity"""
+        entity_ids, counts, sizes = self.overlap(query_ids)
+        keep = counts >= max(min_overlap, 1 if min_jaccard > 0 else 0)
+        if min_jaccard > 0:
+            keep &= counts >= min_jaccard * (sizes + len(query_ids) - counts)
+        return entity_ids[keep].tolist()
@@ -0,0 +1,185 @@
+from collections import Counter, deque
+from functools import lru_cache
+
+import numpy as np
+
+# Alphabet of preprocessed text (see preprocess_text); everything else maps
+# to one extra symbol that never occurs in the text
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz0123456789 '
+OTHER = len(ALPHABET)
+SYMBOLS = len(ALPHABET) + 1
+
+_BYTE_CODES = np.full(256, OTHER, dtype=np.int64)
+for _code, _char in enumerate(ALPHABET):
+    _BYTE_CODES[ord(_char)] = _code
+_BYTE_TABLE = bytes(_BYTE_CODES.tolist())
+
+# Below these many patterns CPython's substring search beats walking the
+# automaton, for a single text and for a batch of texts respectively
+SCAN_PATTERN_LIMIT = 100
+BATCH_SCAN_PATTERN_LIMIT = 32
+
+# Texts scanned together per NumPy batch
+BATCH_SIZE = 1024
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over a multiset of skill names
+
+    Counts which skills occur as substrings of preprocessed job texts, with
+    the same semantics as ``skill.lower() in job_text`` per skill. The
+    automaton is compiled into a dense (state x symbol) transition table and
+    per-state output bitmasks, so many texts can be scanned at once: one
+    NumPy step advances every text in a batch by one character.
+    """
+
+    def __init__(self, skills):
+        lowered = [skill.lower() for skill in skills]
+
+        # Distinct patterns weighted by how often they appear in the skill list
+        multiplicity = Counter(lowered)
+        self.patterns = list(multiplicity)
+        self.weights = np.array([multiplicity[pattern] for pattern in self.patterns], dtype=float)
+
+        # The empty string matches everything, patterns outside the alphabet never match
+        self.always = np.array([pattern == '' for pattern in self.patterns])
+        self.matchable = [
+            i for i, pattern in enumerate(self.patterns)
+            if pattern and all(char in ALPHABET for char in pattern)
+        ]
+
+        self._compile()
+
+    def _compile(self):
+        goto = [{}]
+        outputs = [set()]
+
+        for pattern_id in self.matchable:
+            state = 0
+            for char in self.patterns[pattern_id]:
+                code = ALPHABET.index(char)
+                if code not in goto[state]:
+                    goto.append({})
+                    outputs.append(set())
+                    goto[state][code] = len(goto) - 1
+                state = goto[state][code]
+            outputs[state].add(pattern_id)
+
+        # Breadth-first construction of failure links folded into a dense table
+        states = len(goto)
+        transitions = np.zeros((states, SYMBOLS), dtype=np.int64)
+        fail = [0] * states
+
+        queue = deque()
+        for code, state in goto[0].items():
+            transitions[0, code] = state
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            outputs[state] |= outputs[fail[state]]
+            for code in range(SYMBOLS):
+                target = goto[state].get(code)
+                if target is None:
+                    transitions[state, code] = transitions[fail[state], code]
+                else:
+                    fail[target] = transitions[fail[state], code]
+                    transitions[state, code] = target
+                    queue.append(target)
+
+        words = max(1, (len(self.patterns) + 63) // 64)
+        masks = np.zeros((states, words), dtype=np.uint64)
+        for state, pattern_ids in enumerate(outputs):
+            for pattern_id in pattern_ids:
+                masks[state, pattern_id // 64] |= np.uint64(1) << np.uint64(pattern_id % 64)
+
+        self.transitions = transitions.ravel()
+        self.masks = masks
+        self.rows = transitions.tolist()
+        self.outputs = [sorted(pattern_ids) for pattern_ids in outputs]
+
+    def presence(self, text):
+        """Boolean array of the patterns found in one text"""
+        if len(self.matchable) <= SCAN_PATTERN_LIMIT:
+            return self._find(text)
+
+        found = self.always.copy()
+        rows, outputs = self.rows, self.outputs
+        state = 0
+        for code in text.encode('ascii', 'replace').translate(_BYTE_TABLE):
+            state = rows[state][code]
+            if outputs[state]:
+                found[outputs[state]] = True
+        return found
+
+    def count(self, text):
+        """Number of skills (with repeats) found in one text"""
+        return float(self.weights @ self.presence(text))
+
+    def count_all(self, texts):
+        """Number of skills (with repeats) found in each text, as an array"""
+        counts = np.zeros(len(texts))
+        if not texts:
+            return counts
+
+        if len(self.matchable) <= BATCH_SCAN_PATTERN_LIMIT:
+            return np.array([self._find(text) @ self.weights for text in texts])
+
+        # Scan texts of similar length together to keep padding small
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), BATCH_SIZE):
+            batch = order[start:start + BATCH_SIZE]
+            counts[batch] = self._scan(texts[i] for i in batch) @ self.weights
+
+        return counts
+
+    def presence_all(self, texts):
+        """Boolean (texts x patterns) matrix of the patterns found in each text"""
+        found = np.zeros((len(texts), len(self.patterns)), dtype=bool)
+        if not texts:
+            return found
+
+        if len(self.matchable) <= BATCH_SCAN_PATTERN_LIMIT:
+            for row, text in enumerate(texts):
+                found[row] = self._find(text)
+            return found
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), BATCH_SIZE):
+            batch = order[start:start + BATCH_SIZE]
+            found[batch] = self._scan(texts[i] for i in batch)
+
+        return found
+
+    def _find(self, text):
+        found = self.always.copy()
+        for pattern_id in self.matchable:
+            if self.patterns[pattern_id] in text:
+                found[pattern_id] = True
+        return found
+
+    def _scan(self, texts):
+        # Column-major symbol matrix, padded with OTHER (which never extends a match)
+        encoded = [np.frombuffer(text.encode('ascii', 'replace'), dtype=np.uint8) for text in texts]
+        length = max((len(codes) for codes in encoded), default=0)
+        symbols = np.full((length, len(encoded)), OTHER, dtype=np.int64)
+        for column, codes in enumerate(encoded):
+            symbols[:len(codes), column] = _BYTE_CODES[codes]
+
+        state = np.zeros(len(encoded), dtype=np.int64)
+        seen = np.zeros((len(encoded), self.masks.shape[1]), dtype=np.uint64)
+        for row in symbols:
+            state = self.transitions[state * SYMBOLS + row]
+            seen |= self.masks[state]
+
+        # Unpack the output bitmasks into (texts x patterns)
+        bits = np.unpackbits(seen.astype('<u8').view(np.uint8), axis=1, bitorder='little')
+        return bits[:, :len(self.patterns)].astype(bool) | self.always
+
+@lru_cache(maxsize=256)
+def _compiled_matcher(skills):
+    return SkillMatcher(skills)
+
+def get_skill_matcher(skills):
+    """Compiled matcher for a skill list, cached by the (case-folded) skill multiset"""
+    return _compiled_matcher(tuple(sorted(skill.lower() for skill in skills)))
@@ -0,0 +1,150 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+
+from utils.matching import preprocess_text
+
+# Kinds of suggestions, in the order of the fields given for a job
+SUGGEST_KINDS = ('title', 'company', 'skill')
+
+# Most distinct prefixes whose answers are kept between writes
+MAX_CACHED_PREFIXES = 10000
+
+class SuggestIndex:
+    """
+    In-memory typeahead over the job titles, companies and skills of active jobs
+
+    Every distinct term is stored once with the number of active jobs it
+    appears in (its popularity). A sorted array holds one entry per word
+    of each term, keyed by the normalized term text from that word on, so
+    "dev" finds "Senior Developer" and a prefix lookup is a binary search
+    followed by a scan of the matching range. Jobs are added, replaced and
+    removed in place, keeping the array sorted.
+    """
+
+    def __init__(self):
+        self._reset()
+        self.signature = None    # database state the index was built from
+        self.checked_at = 0.0    # last time the signature was compared to the database
+        self._lock = threading.RLock()
+
+    def _reset(self):
+        self.job_terms = {}      # job id -> terms of the job
+        self.terms = {}          # (kind, normalized text) -> [display text, job count]
+        self.entries = []        # sorted (normalized text from a word on, kind, normalized text)
+        self._answers = {}       # (prefix, kinds, limit) -> top terms, dropped on every write
+
+    def __len__(self):
+        return len(self.terms)
+
+    def build(self, jobs, signature=None):
+        """Rebuild from (job_id, title, company, skill names) rows"""
+        with self._lock:
+            self._reset()
+            for job_id, title, company, skills in jobs:
+                terms = self._job_terms(title, company, skills)
+                self.job_terms[job_id] = terms
+                for term, display in terms:
+                    self._count(term, display, 1)
+            self.entries = sorted(
+                (suffix, kind, text)
+                for kind, text in self.terms
+                for suffix in self._suffixes(text)
+            )
+            self.signature = signature
+            self.checked_at = time.time()
+
+    def upsert(self, job_id, title, company, skills=None):
+        """Index a job's terms, keeping its previous skills when ``skills`` is None"""
+        with self._lock:
+            if skills is None:
+                skills = [display for (kind, _), display in self.job_terms.get(job_id, ()) if kind == 'skill']
+            self._remove(job_id)
+            terms = self._job_terms(title, company, skills)
+            self.job_terms[job_id] = terms
+            for term, display in terms:
+                if self._count(term, display, 1):
+                    for suffix in self._suffixes(term[1]):
+                        insort(self.entries, (suffix, term[0], term[1]))
+            self._answers.clear()
+
+    def remove(self, job_id):
+        with self._lock:
+            self._remove(job_id)
+            self._answers.clear()
+
+    def _remove(self, job_id):
+        for term, display in self.job_terms.pop(job_id, ()):
+            if self._count(term, display, -1):
+                for suffix in self._suffixes(term[1]):
+                    entry = (suffix, term[0], term[1])
+                    i = bisect_left(self.entries, entry)
+                    if i < len(self.entries) and self.entries[i] == entry:
+                        del self.entries[i]
+
+    def _count(self, term, display, delta):
+        """Add ``delta`` jobs to a term, True if the term appeared or disappeared"""
+        counted = self.terms.get(term)
+        if counted is None:
+            self.terms[term] = [display, delta]
+            return True
+        counted[1] += delta
+        if counted[1] <= 0:
+            del self.terms[term]
+            return True
+        return False
+
+    @staticmethod
+    def _job_terms(*fields):
+        terms = {}
+        for kind, values in zip(SUGGEST_KINDS, fields):
+            for value in ([values] if isinstance(values, str) or values is None else values):
+                display = ' '.join((value or '').split())
+                text = preprocess_text(display)
+                if text:
+                    terms.setdefault((kind, text), display)
+        return tuple(terms.items())
+
+    @staticmethod
+    def _suffixes(text):
+        words = text.split()
+        return {' '.join(words[i:]) for i in range(len(words))}
+
+    def suggest(self, prefix, limit=10, kinds=None):
+        """
+        Most popular terms with a word starting with ``prefix``
+
+        Returns [{'text', 'type', 'count'}], most jobs first; terms starting
+        with the prefix win ties over terms only containing it later on.
+        """
+        prefix = preprocess_text(prefix)
+        if not prefix:
+            return []
+        kinds = tuple(sorted(kinds)) if kinds else SUGGEST_KINDS
+        key = (prefix, kinds, limit)
+
+        with self._lock:
+            answer = self._answers.get(key)
+            if answer is not None:
+                return answer
+
+            lo = bisect_left(self.entries, (prefix,))
+            hi = bisect_left(self.entries, (prefix + '\uffff',), lo)
+            found = {}
+            for _, kind, text in self.entries[lo:hi]:
+                if kind in kinds:
+                    found[(kind, text)] = text.startswith(prefix)
+            top = heapq.nsmallest(
+                limit, found.items(),
+                key=lambda item: (-self.terms[item[0]][1], not item[1], item[0][1], item[0][0])
+            )
+            answer = [
+                {'text': self.terms[term][0], 'type': term[0], 'count': self.terms[term][1]}
+                for term, _ in top
+            ]
+
+            if len(self._answers) >= MAX_CACHED_PREFIXES:
+                self._answers.clear()
+            self._answers[key] = answer
+            return answer
@@ -0,0 +1,182 @@
+import heapq
+
+import numpy as np
+
+# Substring posting lists kept per index view, oldest dropped first
+MAX_SUBSTRING_POSTINGS = 1024
+
+class InvertedIndex:
+    """
+    Term -> posting list view of the job index matrix
+
+    Posting lists hold the slots of the jobs containing each term in
+    increasing order together with their precomputed TF-IDF weights, plus the
+    largest weight of every term for WAND upper bounds.
+    """
+
+    def __init__(self, matrix, slot_job_ids):
+        csc = matrix.tocsc()
+        csc.eliminate_zeros()  # drop rows of removed jobs
+        csc.sort_indices()
+
+        self.indptr = csc.indptr
+        self.postings = csc.indices
+        self.weights = csc.data
+
+        self.max_weights = np.zeros(csc.shape[1])
+        non_empty = np.diff(self.indptr) > 0
+        if non_empty.any():
+            self.max_weights[non_empty] = np.maximum.reduceat(self.weights, self.indptr[:-1][non_empty])
+
+        self.slot_job_ids = list(slot_job_ids)
+
+        self._substring_postings = {}  # pattern -> slots of the texts containing it
+
+    def live_slots(self):
+        return [slot for slot, job_id in enumerate(self.slot_job_ids) if job_id is not None]
+
+    def substring_postings(self, pattern, texts):
+        """
+        Slots of the live jobs whose text contains ``pattern``, in increasing order
+
+        ``texts`` maps job ids to their preprocessed text. Skill names recur
+        across queries, so the slots are kept until the index changes and
+        this view is rebuilt.
+        """
+        postings = self._substring_postings.get(pattern)
+        if postings is None:
+            postings = np.array([
+                slot for slot, job_id in enumerate(self.slot_job_ids)
+                if job_id is not None and pattern in texts[job_id]
+            ], dtype=np.int64)
+            if len(self._substring_postings) >= MAX_SUBSTRING_POSTINGS:
+                del self._substring_postings[next(iter(self._substring_postings))]
+            self._substring_postings[pattern] = postings
+        return postings
+
+class _Cursor:
+    """Iterator over one query term's posting list"""
+
+    __slots__ = ('postings', 'weights', 'position', 'scale', 'upper_bound', 'doc')
+
+    def __init__(self, postings, weights, scale, max_weight):
+        self.postings = postings
+        self.weights = weights
+        self.position = 0
+        self.scale = scale
+        self.upper_bound = scale * max_weight
+        self.doc = int(postings[0])
+
+    def contribution(self):
+        return self.scale * self.weights[self.position]
+
+    def next(self):
+        self.position += 1
+        self._load()
+
+    def seek(self, doc):
+        """Advance to the first posting >= doc"""
+        self.position += int(np.searchsorted(self.postings[self.position:], doc))
+        self._load()
+
+    def _load(self):
+        self.doc = int(self.postings[self.position]) if self.position < len(self.postings) else None
+
+def top_k(inverted, query, k, threshold=None, bonus=None, bonus_postings=(), allowed=None):
+    """
+    WAND top-k retrieval over an inverted index
+
+    The score of a job is ``100 * dot(query, job) + bonus(slot)``, capped at
+    100. ``bonus_postings`` bound the bonus: a job's bonus never exceeds the
+    points of the (slots, points) entries listing its slot, and is 0 if none
+    does. They are walked like term postings, so a job's upper bound only
+    includes the bonus it can actually get. Jobs whose upper bound cannot
+    beat the current k-th best score (or ``threshold``) are skipped without
+    being scored. ``allowed`` optionally restricts the result to a set of
+    slots.
+
+    Returns a list of (slot, score) tuples, best first.
+    """
+    if k <= 0:
+        return []
+
+    heap = []  # min-heap of (score, -slot)
+
+    def can_enter(upper_bound):
+        if threshold is not None and upper_bound < threshold:
+            return False
+        return len(heap) < k or upper_bound > heap[0][0]
+
+    def offer(slot, score):
+        score = min(100.0, score)
+        if threshold is not None and score < threshold:
+            return
+        entry = (score, -slot)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    cursors = []
+    for term, weight in zip(query.indices, query.data):
+        start, end = inverted.indptr[term], inverted.indptr[term + 1]
+        if start < end and weight > 0:
+            cursors.append(_Cursor(
+                inverted.postings[start:end],
+                inverted.weights[start:end],
+                100.0 * weight,
+                inverted.max_weights[term]
+            ))
+    if bonus is not None:
+        # Bounded by their points, contributing nothing: the bonus itself is added once per job
+        for slots, points in bonus_postings:
+            if len(slots) and points > 0:
+                cursors.append(_Cursor(slots, np.zeros(len(slots)), points, 1.0))
+
+    evaluated = set()
+    while cursors:
+        cursors.sort(key=lambda cursor: cursor.doc)
+
+        # Find the pivot: the first term at which the accumulated upper bound could enter the heap
+        pivot = None
+        upper_bound = 0.0
+        for i, cursor in enumerate(cursors):
+            upper_bound += cursor.upper_bound
+            if can_enter(upper_bound):
+                pivot = i
+                break
+
+        if pivot is None:
+            break
+
+        pivot_doc = cursors[pivot].doc
+        if cursors[0].doc == pivot_doc:
+            # Every term up to the pivot sits on the pivot job, score it fully
+            score = 0.0
+            for cursor in cursors:
+                if cursor.doc != pivot_doc:
+                    break
+                score += cursor.contribution()
+                cursor.next()
+
+            if allowed is None or pivot_doc in allowed:
+                evaluated.add(pivot_doc)
+                offer(pivot_doc, score + (bonus(pivot_doc) if bonus else 0.0))
+        else:
+            # Jobs before the pivot cannot make it, skip straight to it
+            for cursor in cursors[:pivot]:
+                cursor.seek(pivot_doc)
+
+        cursors = [cursor for cursor in cursors if cursor.doc is not None]
+
+    # Jobs in no posting list score 0, which only matters while fewer than k
+    # jobs were found (and then nothing was skipped above)
+    if len(heap) < k and can_enter(0.0):
+        for slot in inverted.live_slots():
+            if len(heap) == k:
+                break
+            if slot in evaluated or (allowed is not None and slot not in allowed):
+                continue
+            offer(slot, 0.0)
+
+    return [(-negative_slot, score) for score, negative_slot in sorted(heap, reverse=True)]